@@ -0,0 +1,133 @@
+"""
+이미지 후처리 마이크로 벤치마크
+기존 경로(항상 LANCZOS + PNG optimize)와 리사이즈 계획/인코딩 예산 적용 경로 비교
+
+실행:
+    python bench_resize.py [반복 횟수]
+"""
+
+import io
+import sys
+import time
+
+from PIL import Image, ImageFilter
+
+from config import config
+from utils.image_processing import (
+    ENCODE_EFFORTS,
+    ENCODE_EFFORT_OPTIONS,
+    plan_resize,
+    process_image,
+    resolve_output_quality,
+)
+
+TARGET_SIZE = (config.IMAGE_WIDTH, config.IMAGE_HEIGHT)
+
+# (이름, 원본 크기, 원본 형식)
+SCENARIOS = [
+    ("목표 크기와 동일", TARGET_SIZE, "PNG"),
+    ("Imagen 16:9 출력", (1408, 768), "PNG"),
+    ("정수배 (2x)", (TARGET_SIZE[0] * 2, TARGET_SIZE[1] * 2), "PNG"),
+    ("큰 축소 (3.2x)", (4096, 2304), "PNG"),
+    ("JPEG 원본 (2.2x)", (2816, 1536), "JPEG"),
+]
+
+# 비교할 출력 형식
+OUTPUT_FORMATS = ["png", "webp", "jpeg"]
+
+
+def make_source_image(size, image_format: str) -> bytes:
+    """일러스트와 비슷하게 압축되는 합성 이미지 생성 (노이즈 + 그라데이션)"""
+    noise = Image.effect_noise(size, 40).convert("RGB")
+    gradient = Image.linear_gradient("L").resize(size).convert("RGB")
+    img = Image.blend(noise, gradient, 0.6).filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    img.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def legacy_resize(image_bytes: bytes, target_width: int, target_height: int) -> bytes:
+    """기존 resize_image_to_target 경로 (항상 LANCZOS + PNG optimize=True)"""
+    img = Image.open(io.BytesIO(image_bytes))
+    img_resized = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
+    output_buffer = io.BytesIO()
+    img_resized.save(output_buffer, format='PNG', optimize=True)
+    return output_buffer.getvalue()
+
+
+def measure(func, repeat: int):
+    """최소 실행 시간(ms)과 결과 반환"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def print_encode_costs(repeat: int):
+    """형식/강도별 인코딩 비용 측정 (ENCODE_COST_MS_PER_MEGAPIXEL 보정용)"""
+    print(f"\n{'='*60}")
+    print(f"인코딩 비용 (ms / 메가픽셀, {TARGET_SIZE[0]}x{TARGET_SIZE[1]})")
+    print(f"{'='*60}")
+    img = Image.open(io.BytesIO(make_source_image(TARGET_SIZE, "PNG")))
+    img.load()
+    megapixels = TARGET_SIZE[0] * TARGET_SIZE[1] / 1_000_000
+
+    for image_format, efforts in ENCODE_EFFORT_OPTIONS.items():
+        for effort in ENCODE_EFFORTS:
+            options = dict(efforts[effort])
+            if image_format != "png":
+                options["quality"] = 80
+
+            def encode():
+                buffer = io.BytesIO()
+                img.save(buffer, format=image_format.upper(), **options)
+                return buffer.getvalue()
+
+            try:
+                elapsed, data = measure(encode, repeat)
+            except (KeyError, OSError) as e:
+                print(f"   {image_format:5} {effort:9} 사용 불가: {e}")
+                continue
+            print(f"   {image_format:5} {effort:9} {elapsed / megapixels:8.1f} ms/MP  {len(data):>9,} bytes")
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    budget_ms = config.IMAGE_ENCODE_LATENCY_BUDGET_MS
+
+    print("="*60)
+    print(f"이미지 후처리 벤치마크 (목표 {TARGET_SIZE[0]}x{TARGET_SIZE[1]}, 반복 {repeat}회, 인코딩 예산 {budget_ms}ms)")
+    print("="*60)
+
+    for name, size, source_format in SCENARIOS:
+        source = make_source_image(size, source_format)
+        plan = plan_resize(size, TARGET_SIZE)
+        print(f"\n[{name}] {size[0]}x{size[1]} {source_format}, 계획: {plan}")
+
+        legacy_ms, legacy_data = measure(lambda: legacy_resize(source, *TARGET_SIZE), repeat)
+        print(f"   기존 경로 (png/optimize) {legacy_ms:9.1f} ms  {len(legacy_data):>9,} bytes")
+
+        for image_format in OUTPUT_FORMATS:
+            elapsed, encoded = measure(
+                lambda: process_image(
+                    source,
+                    *TARGET_SIZE,
+                    image_format=image_format,
+                    quality=resolve_output_quality(image_format, None),
+                    encode_budget_ms=budget_ms
+                ),
+                repeat
+            )
+            print(
+                f"   계획 경로 ({image_format:4})        {elapsed:9.1f} ms  {len(encoded.data):>9,} bytes"
+                f"  (x{legacy_ms / elapsed:.1f})"
+            )
+
+    print_encode_costs(repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+민감 단어 필터 마이크로 벤치마크
+기존 방식(단어마다 정규식 컴파일 + 전체 재검색)과 단일 컴파일 정규식 방식의 프롬프트당 비용 비교
+
+실행:
+    python bench_sensitive_filter.py [반복 횟수]
+"""
+
+import logging
+import re
+import sys
+import time
+
+from utils.sensitive_filter import SENSITIVE_WORD_REPLACEMENTS, pre_filter_sensitive_words
+
+# 측정용 프롬프트 (민감 단어 없음 / 일부 / 다수 / 긴 컨텍스트)
+PROMPTS = {
+    "민감 단어 없음": "A quiet village at dawn, soft light over the rice fields, watercolor style",
+    "일부 포함": "A knight with a sword standing in the rain, 어두운 성 앞에서 검을 든 기사",
+    "다수 포함": "A bloody battle, soldiers fighting with weapons, 피투성이 전사가 총을 들고 공격하는 장면, murder and violence",
+    "긴 컨텍스트": ("그는 어둠 속에서 천천히 걸어갔다. 달빛이 구름 사이로 스며들었다. "
+                   "The wounded soldier held his gun and a dagger. ") * 40,
+}
+
+
+def legacy_pre_filter(text: str) -> str:
+    """기존 pre_filter_sensitive_words 구현 (단어마다 순차 치환)"""
+    result = text
+    for sensitive_word, safe_word in SENSITIVE_WORD_REPLACEMENTS.items():
+        if any(ord(c) > 127 for c in sensitive_word):
+            if sensitive_word in result:
+                result = result.replace(sensitive_word, safe_word)
+        else:
+            pattern = re.compile(re.escape(sensitive_word), re.IGNORECASE)
+            if pattern.search(result):
+                result = pattern.sub(safe_word, result)
+    return result
+
+
+def measure(func, text: str, repeat: int) -> float:
+    """프롬프트당 평균 실행 시간(µs)"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - started) / repeat * 1_000_000
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    # 치환 로그가 측정에 섞이지 않도록 로그 출력 끄기
+    logging.getLogger("ai-image").setLevel(logging.WARNING)
+
+    print("="*60)
+    print(f"민감 단어 필터 벤치마크 (단어 {len(SENSITIVE_WORD_REPLACEMENTS)}개, 반복 {repeat}회)")
+    print("="*60)
+
+    for name, text in PROMPTS.items():
+        legacy_us = measure(legacy_pre_filter, text, repeat)
+        compiled_us = measure(pre_filter_sensitive_words, text, repeat)
+        same = "같음" if legacy_pre_filter(text) == pre_filter_sensitive_words(text) else "다름 (긴 단어 우선 적용)"
+        print(f"\n[{name}] {len(text)}자")
+        print(f"   기존 방식      {legacy_us:9.1f} µs/프롬프트")
+        print(f"   단일 정규식    {compiled_us:9.1f} µs/프롬프트  (x{legacy_us / compiled_us:.1f})")
+        print(f"   결과: {same}")
+
+
+if __name__ == "__main__":
+    main()
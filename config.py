@@ -18,7 +18,24 @@ class Config:
     GCP_PROJECT_ID: str = os.getenv("GCP_PROJECT_ID", "")
     GCP_LOCATION: str = os.getenv("GCP_LOCATION", "us-central1")
     GEMINI_MODEL_NAME: str = os.getenv("GEMINI_MODEL_NAME", "gemini-2.0-flash-exp")
+    IMAGEN_MODEL_NAME: str = os.getenv("IMAGEN_MODEL_NAME", "imagen-4.0-fast-generate-001")
+    # 서버 시작 시 모델 핸들 생성 및 인증/채널 워밍업 여부
+    MODEL_WARMUP_ENABLED: bool = os.getenv("MODEL_WARMUP_ENABLED", "true").lower() == "true"
     GCP_SERVICE_ACCOUNT_KEY_PATH: str = os.getenv("GCP_SERVICE_ACCOUNT_KEY_PATH", "")
+
+    # Gemini 호출 설정 (모델별 동시 호출 수 제한 및 타임아웃)
+    GEMINI_MAX_CONCURRENCY: int = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+    GEMINI_TIMEOUT_SECONDS: float = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
+
+    # 모델별 호출 속도 제한 (분당 호출 수 = 할당량, 순간 허용 호출 수, 0이면 해당 모델 제한 없음)
+    # 할당량 초과(429) 오류가 나면 속도를 낮추고, 오류가 멈추면 설정값까지 단계적으로 회복
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    GEMINI_RATE_LIMIT_PER_MINUTE: float = float(os.getenv("GEMINI_RATE_LIMIT_PER_MINUTE", "60"))
+    GEMINI_RATE_LIMIT_BURST: int = int(os.getenv("GEMINI_RATE_LIMIT_BURST", "10"))
+    IMAGEN_RATE_LIMIT_PER_MINUTE: float = float(os.getenv("IMAGEN_RATE_LIMIT_PER_MINUTE", "20"))
+    IMAGEN_RATE_LIMIT_BURST: int = int(os.getenv("IMAGEN_RATE_LIMIT_BURST", "4"))
+    # 호출 차례를 기다리는 최대 시간 (초, 초과 예상 시 바로 실패 - 이미지 생성은 429 + Retry-After)
+    RATE_LIMIT_MAX_WAIT_SECONDS: float = float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "30"))
     
     # 서버 설정
     HOST: str = os.getenv("HOST", "0.0.0.0")
@@ -27,20 +44,115 @@ class Config:
     # 디렉토리 설정
     STYLES_DIR: Path = Path(os.getenv("STYLES_DIR", "styles"))
     IMAGES_DIR: Path = Path(os.getenv("IMAGES_DIR", "images"))
+
+    # 스타일 메모리 캐시 최대 항목 수 (파일 mtime 변경 시 자동 무효화)
+    STYLE_CACHE_MAX_ENTRIES: int = int(os.getenv("STYLE_CACHE_MAX_ENTRIES", "512"))
+
+    # 개선 프롬프트 캐시 설정 (빈 PROMPT_CACHE_DIR이면 디스크 계층 비활성화)
+    PROMPT_CACHE_ENABLED: bool = os.getenv("PROMPT_CACHE_ENABLED", "true").lower() == "true"
+    PROMPT_CACHE_MAX_ENTRIES: int = int(os.getenv("PROMPT_CACHE_MAX_ENTRIES", "1024"))
+    PROMPT_CACHE_TTL_SECONDS: float = float(os.getenv("PROMPT_CACHE_TTL_SECONDS", "86400"))
+    PROMPT_CACHE_DIR: str = os.getenv("PROMPT_CACHE_DIR", "cache/prompts")
+    # 디스크 계층에 보관할 최대 파일 수 (만료된 파일과 함께 주기적으로 정리)
+    PROMPT_CACHE_DISK_MAX_ENTRIES: int = int(os.getenv("PROMPT_CACHE_DISK_MAX_ENTRIES", "4096"))
+
+    # 생성 이미지 캐시 설정 (동일 프롬프트 재요청 시 S3 서버 측 복사로 대체)
+    IMAGE_CACHE_ENABLED: bool = os.getenv("IMAGE_CACHE_ENABLED", "true").lower() == "true"
+    IMAGE_CACHE_MAX_ENTRIES: int = int(os.getenv("IMAGE_CACHE_MAX_ENTRIES", "4096"))
+    IMAGE_CACHE_TTL_SECONDS: float = float(os.getenv("IMAGE_CACHE_TTL_SECONDS", "604800"))
+    IMAGE_CACHE_DIR: str = os.getenv("IMAGE_CACHE_DIR", "cache/images")
+    # 캐시 원본을 보관할 S3 키 접두사 (콘텐츠 주소 키라 덮어쓰이지 않음, 버킷 수명 주기 규칙으로 TTL 이후 정리 권장)
+    IMAGE_CACHE_S3_PREFIX: str = os.getenv("IMAGE_CACHE_S3_PREFIX", "cache/images/")
     
     # 이미지 생성 API 설정
     IMAGE_GENERATION_API: str = os.getenv("IMAGE_GENERATION_API", "imagen")  # "imagen", "dalle", "placeholder"
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
 
+    # 이미지 생성 워커 풀 설정 (동시 생성 수, 대기열 길이, 호출별 타임아웃)
+    IMAGEN_MAX_WORKERS: int = int(os.getenv("IMAGEN_MAX_WORKERS", "4"))
+    IMAGEN_QUEUE_SIZE: int = int(os.getenv("IMAGEN_QUEUE_SIZE", "16"))
+    IMAGEN_TIMEOUT_SECONDS: float = float(os.getenv("IMAGEN_TIMEOUT_SECONDS", "120"))
+
+    # 이미지 후처리(리사이즈/인코딩) 프로세스 풀 설정 (0이면 프로세스 풀 대신 스레드 사용)
+    IMAGE_POSTPROCESS_WORKERS: int = int(os.getenv("IMAGE_POSTPROCESS_WORKERS", "2"))
+    IMAGE_POSTPROCESS_QUEUE_SIZE: int = int(os.getenv("IMAGE_POSTPROCESS_QUEUE_SIZE", "8"))
+    IMAGE_POSTPROCESS_TIMEOUT_SECONDS: float = float(os.getenv("IMAGE_POSTPROCESS_TIMEOUT_SECONDS", "30"))
+    IMAGE_POSTPROCESS_START_METHOD: str = os.getenv("IMAGE_POSTPROCESS_START_METHOD", "spawn")
+
+    # 배치 이미지 생성 설정 (요청당 최대 항목 수, 동시 생성 수 상한)
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "200"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+    # 비동기 작업 모드 설정 (워커 수, 대기열 길이)
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))
+    JOB_QUEUE_SIZE: int = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+    # 스토리당 최대 대기 작업 수 (한 스토리가 대기열 전체를 차지하지 않도록, 0이면 제한 없음)
+    JOB_QUEUE_SIZE_PER_STORY: int = int(os.getenv("JOB_QUEUE_SIZE_PER_STORY", "25"))
+
     # 이미지 해상도 설정 (720p = 1280x720)
     IMAGE_WIDTH: int = int(os.getenv("IMAGE_WIDTH", "1280"))
     IMAGE_HEIGHT: int = int(os.getenv("IMAGE_HEIGHT", "720"))
+
+    # 이미지 출력 형식 설정 (png, jpeg, webp, avif / 품질 0이면 형식별 프리셋 사용)
+    IMAGE_OUTPUT_FORMAT: str = os.getenv("IMAGE_OUTPUT_FORMAT", "png")
+    IMAGE_OUTPUT_QUALITY: int = int(os.getenv("IMAGE_OUTPUT_QUALITY", "0"))
+    # 이미지당 인코딩 지연 예산 (ms, 예산 안에서 가장 높은 압축 강도 선택 / 0이면 기존과 같은 최대 압축)
+    # 예산을 지정하면 용량이 커질 수 있음 (예: PNG "balanced"는 기존 optimize 대비 약 20% 큼)
+    IMAGE_ENCODE_LATENCY_BUDGET_MS: float = float(os.getenv("IMAGE_ENCODE_LATENCY_BUDGET_MS", "0"))
+
+    # 요청에서 이름으로 선택할 수 있는 파생 이미지 규격 ("이름:너비x높이,..." 형식)
+    IMAGE_DERIVATIVES: str = os.getenv("IMAGE_DERIVATIVES", "preview:640x360,thumb:320x180")
     
     # AWS S3 설정
     AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID", "")
     AWS_SECRET_ACCESS_KEY: str = os.getenv("AWS_SECRET_ACCESS_KEY", "")
     AWS_REGION: str = os.getenv("AWS_REGION", "ap-northeast-2")
     S3_BUCKET_NAME: str = os.getenv("S3_BUCKET_NAME", "")
+    # S3 클라이언트 연결 풀 및 boto3 호출 워커 설정
+    S3_MAX_POOL_CONNECTIONS: int = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))
+    S3_IO_QUEUE_SIZE: int = int(os.getenv("S3_IO_QUEUE_SIZE", "256"))
+    S3_IO_TIMEOUT_SECONDS: float = float(os.getenv("S3_IO_TIMEOUT_SECONDS", "60"))
+
+    # presigned URL 전송용 공유 HTTP 클라이언트 설정 (연결 풀, 작업별 타임아웃)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "10"))
+    S3_DOWNLOAD_TIMEOUT_SECONDS: float = float(os.getenv("S3_DOWNLOAD_TIMEOUT_SECONDS", "30"))
+    S3_UPLOAD_TIMEOUT_SECONDS: float = float(os.getenv("S3_UPLOAD_TIMEOUT_SECONDS", "60"))
+
+    # 민감 단어 사전 위치 (로컬 JSON 파일 또는 S3 객체, 둘 다 없으면 내장 사전 사용)와 변경 확인 주기 (0이면 시작 시 한 번만 적재)
+    SENSITIVE_WORDS_PATH: str = os.getenv("SENSITIVE_WORDS_PATH", "")
+    SENSITIVE_WORDS_S3_BUCKET: str = os.getenv("SENSITIVE_WORDS_S3_BUCKET", "")
+    SENSITIVE_WORDS_S3_KEY: str = os.getenv("SENSITIVE_WORDS_S3_KEY", "")
+    SENSITIVE_WORDS_RELOAD_INTERVAL_SECONDS: float = float(os.getenv("SENSITIVE_WORDS_RELOAD_INTERVAL_SECONDS", "30"))
+
+    # 중복 요청 방지 임대 저장소 (memory: 프로세스 내, sqlite: 같은 호스트의 워커 간 공유, redis: 여러 파드 간 공유)
+    REQUEST_REGISTRY_BACKEND: str = os.getenv("REQUEST_REGISTRY_BACKEND", "memory")
+    REQUEST_REGISTRY_SQLITE_PATH: str = os.getenv("REQUEST_REGISTRY_SQLITE_PATH", "request_registry.db")
+    REQUEST_REGISTRY_REDIS_URL: str = os.getenv("REQUEST_REGISTRY_REDIS_URL", "redis://localhost:6379/0")
+    # 임대 유지 시간 (초, 워커가 비정상 종료되면 이 시간 후 다른 워커가 처리 가능)과 연장(하트비트) 주기 (초)
+    REQUEST_LEASE_TTL_SECONDS: float = float(os.getenv("REQUEST_LEASE_TTL_SECONDS", "60"))
+    REQUEST_LEASE_HEARTBEAT_SECONDS: float = float(os.getenv("REQUEST_LEASE_HEARTBEAT_SECONDS", "20"))
+
+    # 이미지 생성/스타일 학습 요청 수락 제어 (전체 동시 처리 수, 대기열 크기, 대기 시간 초과(초), 초과 시 429 + Retry-After)
+    ADMISSION_CONTROL_ENABLED: bool = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+    ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "8"))
+    ADMISSION_QUEUE_SIZE: int = int(os.getenv("ADMISSION_QUEUE_SIZE", "32"))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "30"))
+    # 대기 요청은 스토리별 대기열에서 가중 round-robin으로 처리 (스토리당 대기 수 제한, 가중치 예: "story_123:2,story_456:0.5")
+    ADMISSION_QUEUE_SIZE_PER_STORY: int = int(os.getenv("ADMISSION_QUEUE_SIZE_PER_STORY", "8"))
+    ADMISSION_STORY_WEIGHTS: str = os.getenv("ADMISSION_STORY_WEIGHTS", "")
+
+    # 중복 이미지 생성 요청을 409로 거부하는 대신 처리 중인 요청에 합류시킬지 여부 (요청별 coalesce 파라미터로 변경 가능)
+    REQUEST_COALESCING_ENABLED: bool = os.getenv("REQUEST_COALESCING_ENABLED", "false").lower() == "true"
+
+    # 완료된 요청 결과 보관 (같은 본문 또는 같은 Idempotency-Key로 재시도하면 재처리 없이 같은 응답 반환, 0이면 비활성화)
+    IDEMPOTENCY_TTL_SECONDS: float = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+    IDEMPOTENCY_MAX_ENTRIES: int = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "1024"))
+
+    # 소설 텍스트 S3 다운로드 시 분석에 필요한 앞부분만 Range 요청으로 받을지 여부
+    NOVEL_RANGED_DOWNLOAD_ENABLED: bool = os.getenv("NOVEL_RANGED_DOWNLOAD_ENABLED", "true").lower() == "true"
     
     # 로깅 설정
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")  # DEBUG, INFO, WARNING, ERROR, CRITICAL
@@ -67,6 +179,7 @@ class Config:
     GCP_PROJECT_ID={cls.GCP_PROJECT_ID},
     GCP_LOCATION={cls.GCP_LOCATION},
     GEMINI_MODEL_NAME={cls.GEMINI_MODEL_NAME},
+    IMAGEN_MODEL_NAME={cls.IMAGEN_MODEL_NAME},
     HOST={cls.HOST},
     PORT={cls.PORT},
     STYLES_DIR={cls.STYLES_DIR},
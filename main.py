@@ -7,6 +7,8 @@ GCP Vertex AI의 Gemini 2.5 Flash를 사용하여 소설 스타일을 학습하
 2. 이미지 생성: 노드별 프롬프트 + 소설 스타일을 결합하여 이미지 생성
 """
 
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 from fastapi import FastAPI
@@ -14,7 +16,22 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from config import config
 from logger import setup_logger
-from services.gemini_service import initialize_vertex_ai
+from services.gemini_service import (
+    initialize_vertex_ai,
+    warm_up_models,
+    warm_up_async_client,
+)
+from services.image_service import shutdown_generation_executor, start_postprocess_executor
+from services.job_service import start_job_workers, stop_job_workers
+from services.sensitive_word_service import start_sensitive_word_reloader, stop_sensitive_word_reloader
+from services.s3_service import (
+    init_s3_client,
+    shutdown_s3_executor,
+    init_http_client,
+    close_http_client,
+)
+from utils.request_registry import create_request_registry
+from utils.request_tracker import start_request_tracker, stop_request_tracker
 from routers import api_v1_router
 
 # 로거 초기화
@@ -33,11 +50,54 @@ logger.info(f"이미지 디렉토리: {config.IMAGES_DIR.absolute()}")
 # Vertex AI 초기화
 initialize_vertex_ai()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 시작/종료 시 공유 리소스 관리"""
+    # 시작: 모델 핸들 생성 및 인증/채널 워밍업 (첫 요청 지연 방지)
+    if config.MODEL_WARMUP_ENABLED:
+        await asyncio.to_thread(warm_up_models)
+        await warm_up_async_client()
+    # 시작: 공유 S3 클라이언트 생성 (자격 증명 확인, 연결 풀 준비)
+    await asyncio.to_thread(init_s3_client)
+    # 시작: presigned URL 전송용 공유 HTTP 클라이언트 (keep-alive 연결 재사용)
+    await init_http_client()
+    # 시작: 민감 단어 사전 적재 및 백그라운드 재적재 (사전 위치가 설정된 경우)
+    await start_sensitive_word_reloader()
+    # 시작: 이미지 후처리 프로세스 풀 (워커 프로세스 미리 생성)
+    await start_postprocess_executor()
+    # 시작: 중복 요청 임대 저장소 및 요청/작업 추적 만료 처리, 임대 하트비트
+    request_registry = await asyncio.to_thread(
+        create_request_registry,
+        config.REQUEST_REGISTRY_BACKEND,
+        sqlite_path=config.REQUEST_REGISTRY_SQLITE_PATH,
+        redis_url=config.REQUEST_REGISTRY_REDIS_URL
+    )
+    await start_request_tracker(
+        request_registry,
+        lease_ttl=config.REQUEST_LEASE_TTL_SECONDS,
+        heartbeat_interval=config.REQUEST_LEASE_HEARTBEAT_SECONDS,
+        result_ttl=config.IDEMPOTENCY_TTL_SECONDS,
+        result_max_entries=config.IDEMPOTENCY_MAX_ENTRIES
+    )
+    # 시작: 비동기 작업 워커 풀
+    await start_job_workers()
+    yield
+    # 종료: 비동기 작업 워커, 이미지 생성/후처리 및 S3 워커 풀 정리
+    await stop_job_workers()
+    await stop_request_tracker()
+    await stop_sensitive_word_reloader()
+    shutdown_generation_executor(wait=False)
+    shutdown_s3_executor(wait=False)
+    await close_http_client()
+
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="AI-IMAGE Server",
     description="GCP Vertex AI Gemini 2.5 Flash 기반 이미지 생성 서버",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
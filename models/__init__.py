@@ -5,6 +5,12 @@ from .schemas import (
     NovelStyleRequest,
     ImageGenerationRequest,
     ImageGenerationResponse,
+    BatchImageItem,
+    BatchImageGenerationRequest,
+    BatchImageItemResult,
+    BatchImageGenerationResponse,
+    JobSubmitResponse,
+    JobStatusResponse,
     StyleAnalysisResponse,
 )
 
@@ -12,5 +18,11 @@ __all__ = [
     "NovelStyleRequest",
     "ImageGenerationRequest",
     "ImageGenerationResponse",
+    "BatchImageItem",
+    "BatchImageGenerationRequest",
+    "BatchImageItemResult",
+    "BatchImageGenerationResponse",
+    "JobSubmitResponse",
+    "JobStatusResponse",
     "StyleAnalysisResponse",
 ]
@@ -3,7 +3,7 @@ Pydantic 스키마 모델
 API 요청/응답에 사용되는 데이터 모델 정의
 """
 
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -31,6 +31,11 @@ class ImageGenerationRequest(BaseModel):
     s3_url: Optional[str] = Field(None, description="S3 presigned URL (업로드용)")
     s3_bucket: Optional[str] = Field(None, description="S3 버킷 (s3_url이 없을 경우)")
     s3_key: Optional[str] = Field(None, description="S3 키/경로 (s3_url이 없을 경우)")
+    # 출력 형식 (미지정 시 서버 설정 사용)
+    image_format: Optional[str] = Field(None, description="출력 형식 (png, jpeg, webp, avif - s3_url 업로드는 png만 지원)")
+    image_quality: Optional[int] = Field(None, ge=1, le=100, description="손실 압축 품질 (1-100, 미지정 시 형식별 프리셋)")
+    derivatives: Optional[List[str]] = Field(None, description="함께 생성할 파생 이미지 이름 (예: [\"preview\", \"thumb\"])")
+    use_cache: bool = Field(True, description="생성 이미지 캐시 사용 여부 (false면 항상 새로 생성)")
 
 
 class ImageGenerationResponse(BaseModel):
@@ -38,7 +43,78 @@ class ImageGenerationResponse(BaseModel):
     image_url: str = Field(..., description="S3에 업로드된 이미지 URL")
     enhanced_prompt: str = Field(..., description="소설 스타일이 반영된 최종 프롬프트")
     story_id: str
-    s3_key: Optional[str] = Field(None, description="S3에 업로드된 파일 키")
+    s3_key: Optional[str] = Field(None, description="S3에 업로드된 파일 키 (출력 형식에 맞게 확장자 조정)")
+    image_format: Optional[str] = Field(None, description="실제 적용된 출력 형식")
+    content_type: Optional[str] = Field(None, description="업로드된 이미지 Content-Type")
+    image_size_bytes: Optional[int] = Field(None, description="인코딩된 이미지 용량 (캐시 히트 시 기록된 값)")
+    derivative_urls: Optional[Dict[str, str]] = Field(None, description="파생 이미지 이름별 S3 URL")
+
+
+class BatchImageItem(BaseModel):
+    """배치 이미지 생성 항목 (노드 하나)"""
+    user_prompt: str = Field(..., description="사용자가 입력한 이미지 프롬프트")
+    context_text: Optional[str] = Field(None, description="추가 컨텍스트 텍스트 (선택사항)")
+    s3_url: Optional[str] = Field(None, description="S3 presigned URL (업로드용)")
+    s3_bucket: Optional[str] = Field(None, description="S3 버킷 (s3_url이 없을 경우)")
+    s3_key: Optional[str] = Field(None, description="S3 키/경로 (s3_url이 없을 경우)")
+
+
+class BatchImageGenerationRequest(BaseModel):
+    """스토리 단위 배치 이미지 생성 요청"""
+    story_id: str = Field(..., description="소설 ID (스타일 정보는 한 번만 로드)")
+    items: List[BatchImageItem] = Field(..., description="생성할 노드 이미지 목록")
+    max_concurrency: Optional[int] = Field(None, description="동시 생성 수 (config.BATCH_MAX_CONCURRENCY 이하로 제한)")
+    image_format: Optional[str] = Field(None, description="출력 형식 (png, jpeg, webp, avif - s3_url 업로드는 png만 지원)")
+    image_quality: Optional[int] = Field(None, ge=1, le=100, description="손실 압축 품질 (1-100, 미지정 시 형식별 프리셋)")
+    derivatives: Optional[List[str]] = Field(None, description="함께 생성할 파생 이미지 이름 (예: [\"preview\", \"thumb\"])")
+    use_cache: bool = Field(True, description="생성 이미지 캐시 사용 여부 (false면 항상 새로 생성)")
+
+
+class BatchImageItemResult(BaseModel):
+    """배치 이미지 생성 항목별 결과"""
+    index: int = Field(..., description="요청 items 내 순서")
+    success: bool
+    s3_key: Optional[str] = None
+    image_url: Optional[str] = None
+    enhanced_prompt: Optional[str] = None
+    image_format: Optional[str] = None
+    content_type: Optional[str] = None
+    image_size_bytes: Optional[int] = None
+    derivative_urls: Optional[Dict[str, str]] = None
+    status_code: Optional[int] = Field(None, description="실패 시 HTTP 상태 코드")
+    error: Optional[Any] = Field(None, description="실패 시 오류 내용")
+
+
+class BatchImageGenerationResponse(BaseModel):
+    """배치 이미지 생성 응답"""
+    story_id: str
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchImageItemResult]
+
+
+class JobSubmitResponse(BaseModel):
+    """비동기 작업 접수 응답 (202)"""
+    job_id: str
+    request_id: str
+    status: str = Field(..., description="작업 상태 (queued)")
+    status_url: str = Field(..., description="상태 조회 URL")
+
+
+class JobStatusResponse(BaseModel):
+    """비동기 작업 상태 응답"""
+    job_id: str
+    request_id: str
+    story_id: str
+    s3_key: Optional[str] = None
+    status: str = Field(..., description="작업 상태 (queued, running, succeeded, failed)")
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[ImageGenerationResponse] = Field(None, description="성공 시 이미지 생성 결과")
+    status_code: Optional[int] = Field(None, description="완료 시 HTTP 상태 코드")
+    error: Optional[Any] = Field(None, description="실패 시 오류 내용")
 
 
 class StyleAnalysisResponse(BaseModel):
@@ -5,8 +5,11 @@ API v1 라우터
 
 import asyncio
 from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
 
 from config import config
 from logger import setup_logger
@@ -14,32 +17,72 @@ from models.schemas import (
     NovelStyleRequest,
     ImageGenerationRequest,
     ImageGenerationResponse,
+    BatchImageItem,
+    BatchImageGenerationRequest,
+    BatchImageItemResult,
+    BatchImageGenerationResponse,
+    JobSubmitResponse,
+    JobStatusResponse,
     StyleAnalysisResponse,
 )
-from services.s3_service import download_text_from_s3, upload_image_to_s3
+from services.s3_service import download_text_from_s3
 from services.style_service import (
     save_novel_style,
     load_novel_style,
     analyze_novel_style,
     generate_thumbnail_prompt,
     generate_enhanced_prompt,
-    get_style_file_path,
+    delete_novel_style as remove_novel_style,
+    get_enhanced_prompt_cache_stats,
+    get_style_cache_stats,
+    STYLE_ANALYSIS_SAMPLE_CHARS,
 )
-from services.image_service import generate_image_with_api, generate_and_upload_image
-from services.prompt_service import sanitize_prompt_for_imagen
+from services.image_service import (
+    generate_and_upload_image,
+    generate_image_for_upload,
+    upload_generated_image,
+    get_image_cache_stats,
+    get_image_encoding_stats,
+    get_postprocess_stats,
+)
+from services.job_service import submit_job, get_job_queue_stats, JobQueueFullError
+from services.admission_service import (
+    admit_generation,
+    attach_generation,
+    generation_slot,
+    get_admission_stats,
+)
+from services.gemini_service import get_rate_limiter_stats
+from services.sensitive_word_service import get_sensitive_word_stats
 from utils.request_tracker import (
     get_request_id,
     cleanup_old_requests,
-    get_processing_requests,
     register_request,
     unregister_request,
+    discard_finished_request,
     is_request_processing,
+    claim_request,
+    release_claim,
+    join_request,
+    get_request_fingerprint,
+    get_replay_key,
+    get_completed_result,
+    remember_completed_result,
+    JOB_SUCCEEDED,
+    create_job,
+    get_job,
+    mark_job_finished,
+    get_request_tracker_stats,
 )
+from utils.progress import ProgressCallback, emit_progress, format_sse_event
 
 logger = setup_logger()
 
 router = APIRouter()
 
+# 처리 중인 요청에 합류할 수 있는 요청 종류 (같은 종류 + 같은 본문일 때만 결과를 공유)
+GENERATE_IMAGE_KIND = "generate-image"
+
 
 @router.get("/health")
 async def health_check():
@@ -51,29 +94,118 @@ async def health_check():
     }
 
 
-@router.post("/learn-style", response_model=StyleAnalysisResponse)
-async def learn_novel_style(request: NovelStyleRequest, http_request: Request = None):
+@router.get("/metrics")
+async def get_metrics():
+    """캐시 등 내부 상태 지표 조회"""
+    return {
+        "caches": {
+            "novel_style": get_style_cache_stats(),
+            "enhanced_prompt": get_enhanced_prompt_cache_stats(),
+            "generated_image": get_image_cache_stats(),
+        },
+        "job_queue": get_job_queue_stats(),
+        "admission": get_admission_stats(),
+        "rate_limits": get_rate_limiter_stats(),
+        "request_tracker": get_request_tracker_stats(),
+        "image_postprocess": get_postprocess_stats(),
+        "image_encoding": get_image_encoding_stats(),
+        "sensitive_words": get_sensitive_word_stats(),
+    }
+
+
+def _prepare_replay(scope: str, request_id: str, request: BaseModel, idempotency_key: Optional[str]):
     """
-    소설 텍스트를 분석하여 스타일을 학습하고 저장
-    소설 썸네일 이미지를 생성하여 S3에 업로드
+    완료 결과 재사용 준비 (Idempotency-Key 헤더가 있을 때만 재사용)
 
-    소설 업로드 시 백엔드에서 호출할 엔드포인트
+    Returns:
+        (조회 키 또는 None, 요청 본문 해시, 재사용할 응답 또는 None)
 
-    novel_text를 직접 제공하거나, S3에서 다운로드할 수 있습니다:
-    - novel_text: 직접 제공
-    - novel_s3_url 또는 (novel_s3_bucket, novel_s3_key): S3에서 다운로드
+    Raises:
+        HTTPException: 같은 Idempotency-Key가 다른 요청 본문에 이미 사용된 경우 (422)
+    """
+    fingerprint = get_request_fingerprint(request.model_dump_json())
+    replay_key = get_replay_key(scope, request_id, idempotency_key)
+    completed = get_completed_result(replay_key)
+    if completed is None:
+        return replay_key, fingerprint, None
 
-    중복 요청 방지: 동일한 story_id로 이미 처리 중이면 거부합니다.
+    if completed["fingerprint"] != fingerprint:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Idempotency-Key가 다른 요청 본문에 이미 사용되었습니다: {idempotency_key}"
+        )
+    return replay_key, fingerprint, JSONResponse(
+        content=completed["response"],
+        headers={"Idempotent-Replayed": "true"}
+    )
+
+
+async def _admit_request(request_id: str, story_id: str, lease_owner: Optional[str]):
+    """전체 동시 처리 수 제한, 스토리별 공정 대기 (대기열 포화/대기 시간 초과 시 획득한 임대를 반납하고 429)"""
+    try:
+        await admit_generation(request_id, story_id)
+    except BaseException:
+        # 대기 중 클라이언트 연결이 끊긴 경우(취소)도 포함 (아직 등록 전이므로 이 요청의 임대만 반납)
+        release_claim(request_id, lease_owner)
+        raise
+
+
+def _start_event_stream(
+    request_id: str,
+    pipeline: Callable[[ProgressCallback], Awaitable[BaseModel]],
+    s3_key: Optional[str],
+    story_id: str,
+    lease_owner: Optional[str]
+) -> StreamingResponse:
     """
-    # 중복 요청 확인 (썸네일 생성 중복 방지)
-    learn_request_id = get_request_id(
-        story_id=request.story_id,
-        s3_key=request.thumbnail_s3_key,
-        user_prompt=None
+    파이프라인을 백그라운드 작업으로 시작하고 진행 이벤트를 SSE로 스트리밍
+
+    클라이언트 연결이 끊겨도 작업은 끝까지 진행됩니다 (중복 요청 추적 유지).
+    """
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def on_progress(stage: str, data: dict):
+        await events.put((stage, data))
+
+    task = asyncio.create_task(pipeline(on_progress))
+    attach_generation(task)
+    register_request(request_id, task, s3_key, story_id, lease_owner=lease_owner)
+
+    def on_done(finished_task: asyncio.Task):
+        if finished_task.cancelled() or finished_task.exception() is not None:
+            unregister_request(request_id)
+        events.put_nowait(None)
+
+    task.add_done_callback(on_done)
+
+    async def event_stream():
+        yield format_sse_event("started", {"request_id": request_id})
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            stage, data = event
+            yield format_sse_event(stage, data)
+
+        try:
+            result = task.result()
+            yield format_sse_event("completed", result.model_dump())
+        except HTTPException as e:
+            yield format_sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            yield format_sse_event("error", {"status_code": 500, "detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
+
+def _log_style_request(request: NovelStyleRequest, learn_request_id: str, http_request: Optional[Request], path: str):
+    """스타일 학습 요청 정보 로깅"""
     client_ip = http_request.client.host if http_request else "unknown"
-    logger.info(f"[요청 수신] POST /api/v1/learn-style")
+    logger.info(f"[요청 수신] POST {path}")
     logger.info(f"   Request ID: {learn_request_id}")
     logger.info(f"   Client IP: {client_ip}")
     logger.info(f"   Story ID: {request.story_id}")
@@ -87,16 +219,36 @@ async def learn_novel_style(request: NovelStyleRequest, http_request: Request =
     logger.info(f"   thumbnail_s3_key: {request.thumbnail_s3_key}")
     logger.info(f"   기본 S3 버킷 (config): {config.S3_BUCKET_NAME}")
 
-    # 중복 요청 확인
+
+async def _reject_duplicate_style_request(request: NovelStyleRequest, learn_request_id: str) -> str:
+    """
+    동일한 스타일 학습 요청이 처리 중이면 409 (다른 워커/파드에서 처리 중인 요청 포함)
+
+    Returns:
+        획득한 임대 소유자 토큰
+    """
     cleanup_old_requests()
-    if is_request_processing(learn_request_id):
+    lease_owner = None
+    if not is_request_processing(learn_request_id):
+        # 완료된 요청이 있으면 제거 후 처리 권한(임대) 획득
+        discard_finished_request(learn_request_id)
+        lease_owner = await claim_request(learn_request_id)
+
+    if lease_owner is None:
         logger.warning(f"[중복 요청 차단] learn-style Request ID: {learn_request_id}")
         logger.warning(f"   Story ID: {request.story_id} - 이미 처리 중인 요청입니다.")
         raise HTTPException(
             status_code=409,
             detail=f"동일한 스토리의 스타일 학습이 이미 처리 중입니다. Request ID: {learn_request_id}"
         )
+    return lease_owner
+
 
+async def _process_style_learning(
+    request: NovelStyleRequest,
+    on_progress: Optional[ProgressCallback] = None
+) -> StyleAnalysisResponse:
+    """실제 스타일 학습 처리 (일반 모드와 스트리밍 모드 공용)"""
     thumbnail_url = None
 
     try:
@@ -119,10 +271,12 @@ async def learn_novel_style(request: NovelStyleRequest, http_request: Request =
                 logger.debug(f"   S3 Bucket/Key: {request.novel_s3_bucket}/{request.novel_s3_key if request.novel_s3_key else 'None'}")
 
                 try:
+                    # 스타일 분석(앞 5000자)과 썸네일(앞 500자)에 필요한 앞부분만 다운로드
                     novel_text = await download_text_from_s3(
                         s3_url=request.novel_s3_url if has_s3_url else None,
                         s3_bucket=request.novel_s3_bucket if has_s3_bucket_key else None,
-                        s3_key=request.novel_s3_key if has_s3_bucket_key else None
+                        s3_key=request.novel_s3_key if has_s3_bucket_key else None,
+                        max_chars=STYLE_ANALYSIS_SAMPLE_CHARS if config.NOVEL_RANGED_DOWNLOAD_ENABLED else None
                     )
                     logger.info(f"소설 텍스트 다운로드 완료: {len(novel_text)} 문자")
                 except Exception as e:
@@ -141,11 +295,21 @@ async def learn_novel_style(request: NovelStyleRequest, http_request: Request =
             # 직접 제공 모드: novel_text를 그대로 사용
             logger.info(f"직접 제공 모드: novel_text 사용 (story_id={request.story_id}, 길이={len(novel_text)} 문자)")
 
+        await emit_progress(on_progress, "text_loaded", chars=len(novel_text))
+
         # 소설 스타일 분석
         style_data = await analyze_novel_style(novel_text, request.title)
+        await emit_progress(
+            on_progress,
+            "style_analyzed",
+            style_summary=style_data.get('style_summary', ''),
+            atmosphere=style_data.get('atmosphere', ''),
+            visual_style=style_data.get('visual_style', '')
+        )
 
         # 스타일 저장
         save_novel_style(request.story_id, style_data)
+        await emit_progress(on_progress, "style_saved", story_id=request.story_id)
 
         # 썸네일 이미지 생성 및 S3 업로드
         has_thumbnail_s3_info = request.thumbnail_s3_url or (request.thumbnail_s3_bucket and request.thumbnail_s3_key)
@@ -163,29 +327,26 @@ async def learn_novel_style(request: NovelStyleRequest, http_request: Request =
                 )
 
                 logger.debug(f"썸네일 프롬프트: {thumbnail_prompt[:100]}...")
+                await emit_progress(on_progress, "thumbnail_prompt_generated", thumbnail_prompt=thumbnail_prompt)
 
-                # 프롬프트 정제 (정책 우회 및 안전성 확보)
-                sanitized_thumbnail_prompt = await sanitize_prompt_for_imagen(thumbnail_prompt)
-                logger.info("정제된 썸네일 프롬프트로 이미지 생성 시도")
-
-                # 이미지 생성
-                image_data = await generate_image_with_api(sanitized_thumbnail_prompt)
-
-                # S3에 업로드 (제공된 정보 또는 기본 버킷 사용)
+                # 프롬프트 정제 -> 이미지 생성(설정된 출력 형식) -> S3 업로드 (제공된 정보 또는 기본 버킷 사용)
                 thumbnail_s3_bucket = request.thumbnail_s3_bucket or config.S3_BUCKET_NAME
                 thumbnail_s3_key = request.thumbnail_s3_key or f"thumbnails/{request.story_id}/thumbnail.png"
 
-                thumbnail_url = await upload_image_to_s3(
-                    image_data,
+                thumbnail = await generate_and_upload_image(
+                    thumbnail_prompt,
                     s3_url=request.thumbnail_s3_url,
                     s3_bucket=thumbnail_s3_bucket,
-                    s3_key=thumbnail_s3_key
+                    s3_key=thumbnail_s3_key,
+                    on_progress=on_progress
                 )
+                thumbnail_url = thumbnail.image_url
 
                 logger.info(f"썸네일 이미지 S3 업로드 완료: {thumbnail_url}")
             except Exception as e:
                 logger.warning(f"썸네일 이미지 생성/업로드 실패 (스타일 학습은 성공): {str(e)}", exc_info=True)
                 # 썸네일 생성 실패해도 스타일 학습은 성공으로 처리
+                await emit_progress(on_progress, "thumbnail_failed", error=str(e))
         else:
             logger.warning("썸네일 S3 정보가 제공되지 않고 기본 버킷도 설정되지 않아 썸네일 생성을 건너뜁니다.")
 
@@ -197,10 +358,92 @@ async def learn_novel_style(request: NovelStyleRequest, http_request: Request =
             created_at=datetime.now().isoformat(),
             thumbnail_image_url=thumbnail_url
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"스타일 학습 실패: {str(e)}")
 
 
+@router.post("/learn-style", response_model=StyleAnalysisResponse)
+async def learn_novel_style(
+    request: NovelStyleRequest,
+    http_request: Request = None,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """
+    소설 텍스트를 분석하여 스타일을 학습하고 저장
+    소설 썸네일 이미지를 생성하여 S3에 업로드
+
+    소설 업로드 시 백엔드에서 호출할 엔드포인트
+
+    novel_text를 직접 제공하거나, S3에서 다운로드할 수 있습니다:
+    - novel_text: 직접 제공
+    - novel_s3_url 또는 (novel_s3_bucket, novel_s3_key): S3에서 다운로드
+
+    중복 요청 방지: 동일한 story_id로 이미 처리 중이면 거부합니다.
+    재시도: 같은 Idempotency-Key로 최근 완료된 같은 요청은 다시 처리하지 않고 같은 응답을 반환합니다.
+    """
+    # 중복 요청 확인 (썸네일 생성 중복 방지)
+    learn_request_id = get_request_id(
+        story_id=request.story_id,
+        s3_key=request.thumbnail_s3_key,
+        user_prompt=None
+    )
+
+    _log_style_request(request, learn_request_id, http_request, "/api/v1/learn-style")
+
+    replay_key, fingerprint, replayed = _prepare_replay("learn-style", learn_request_id, request, idempotency_key)
+    if replayed is not None:
+        logger.info(f"[완료 결과 재사용] learn-style Request ID: {learn_request_id}")
+        return replayed
+
+    # 중복 요청 확인
+    lease_owner = await _reject_duplicate_style_request(request, learn_request_id)
+    await _admit_request(learn_request_id, request.story_id, lease_owner)
+
+    # 처리 중인 요청으로 등록해야 동시에 들어온 동일 요청이 차단됨
+    task = asyncio.create_task(_process_style_learning(request))
+    attach_generation(task)
+    register_request(learn_request_id, task, request.thumbnail_s3_key, request.story_id, lease_owner=lease_owner)
+
+    try:
+        result = await task
+    except Exception:
+        unregister_request(learn_request_id)
+        raise
+
+    remember_completed_result(replay_key, fingerprint, result.model_dump(mode="json"))
+    return result
+
+
+@router.post("/learn-style/stream")
+async def learn_novel_style_stream(request: NovelStyleRequest, http_request: Request = None):
+    """
+    스타일 학습 (SSE 스트리밍)
+
+    /learn-style과 동일하게 처리하되, 단계가 끝날 때마다 SSE 이벤트를 전송합니다.
+    이벤트: started, text_loaded, style_analyzed, style_saved, thumbnail_prompt_generated,
+    sanitized, image_generated, resized, uploaded, completed (실패 시 error)
+    """
+    learn_request_id = get_request_id(
+        story_id=request.story_id,
+        s3_key=request.thumbnail_s3_key,
+        user_prompt=None
+    )
+
+    _log_style_request(request, learn_request_id, http_request, "/api/v1/learn-style/stream")
+    lease_owner = await _reject_duplicate_style_request(request, learn_request_id)
+    await _admit_request(learn_request_id, request.story_id, lease_owner)
+
+    return _start_event_stream(
+        learn_request_id,
+        lambda on_progress: _process_style_learning(request, on_progress=on_progress),
+        s3_key=request.thumbnail_s3_key,
+        story_id=request.story_id,
+        lease_owner=lease_owner
+    )
+
+
 @router.get("/style/{story_id}", response_model=StyleAnalysisResponse)
 async def get_novel_style(story_id: str):
     """저장된 소설 스타일 조회"""
@@ -217,15 +460,193 @@ async def get_novel_style(story_id: str):
     )
 
 
-@router.post("/generate-image", response_model=ImageGenerationResponse)
-async def generate_image(request: ImageGenerationRequest, http_request: Request = None):
+async def _process_image_generation(
+    request: ImageGenerationRequest,
+    request_id: str,
+    on_progress: Optional[ProgressCallback] = None
+) -> ImageGenerationResponse:
+    """실제 이미지 생성 처리 (동기 모드, 비동기 작업 모드, 스트리밍 모드 공용)"""
+    try:
+        # 소설 스타일 로드
+        logger.debug(f"[스타일 로드 시도] Story ID: {request.story_id}")
+        novel_style = load_novel_style(request.story_id)
+        if not novel_style:
+            logger.error(f"[스타일 정보 없음] Story ID: {request.story_id} - 먼저 /api/v1/learn-style 호출 필요")
+            raise HTTPException(
+                status_code=404,
+                detail=f"스토리 ID {request.story_id}의 스타일 정보가 없습니다. 먼저 스타일을 학습해주세요."
+            )
+
+        logger.info(f"[처리 시작] Request ID: {request_id}")
+        logger.debug(f"   스타일 정보 로드 완료: atmosphere={novel_style.get('atmosphere')}, visual_style={novel_style.get('visual_style')}")
+        await emit_progress(
+            on_progress,
+            "style_loaded",
+            atmosphere=novel_style.get('atmosphere'),
+            visual_style=novel_style.get('visual_style')
+        )
+
+        # 프롬프트 개선
+        enhanced_prompt = await generate_enhanced_prompt(
+            request.user_prompt,
+            novel_style,
+            request.context_text
+        )
+
+        logger.debug(f"   개선된 프롬프트: {enhanced_prompt[:100]}...")
+        await emit_progress(on_progress, "prompt_enhanced", enhanced_prompt=enhanced_prompt)
+
+        # 이미지 생성 및 S3 업로드
+        generated = await generate_and_upload_image(
+            enhanced_prompt,
+            s3_url=request.s3_url,
+            s3_bucket=request.s3_bucket,
+            s3_key=request.s3_key,
+            on_progress=on_progress,
+            image_format=request.image_format,
+            image_quality=request.image_quality,
+            derivatives=request.derivatives,
+            use_cache=request.use_cache
+        )
+
+        logger.info(f"[처리 완료] Request ID: {request_id} - 이미지 URL: {generated.image_url}")
+
+        return ImageGenerationResponse(
+            image_url=generated.image_url,
+            enhanced_prompt=enhanced_prompt,
+            story_id=request.story_id,
+            s3_key=generated.s3_key or request.s3_key,
+            image_format=generated.image_format,
+            content_type=generated.content_type,
+            image_size_bytes=generated.size_bytes,
+            derivative_urls=generated.derivative_urls or None
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"[처리 실패] Request ID: {request_id} - ValueError: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[처리 실패] Request ID: {request_id} - Exception: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"이미지 생성 실패: {str(e)}")
+
+
+async def _run_image_generation_job(request: ImageGenerationRequest, request_id: str) -> ImageGenerationResponse:
+    """비동기 작업 본문 (동기 요청과 같은 생성 슬롯을 받아 전체 동시 처리 수 제한 적용, 대기 초과 시 작업이 429로 실패)"""
+    async with generation_slot(request_id, request.story_id):
+        return await _process_image_generation(request, request_id)
+
+
+async def _reject_duplicate_image_request(request: ImageGenerationRequest, request_id: str) -> str:
+    """
+    동일한 이미지 생성 요청이 처리 중이면 409, 완료된 요청은 추적에서 제거
+
+    다른 워커/파드에서 처리 중인 요청은 공유 임대 저장소로 확인합니다.
+
+    Returns:
+        획득한 임대 소유자 토큰
+    """
+    # 오래된 요청 정리 (주기적으로)
+    cleanup_old_requests()
+
+    # 중복 요청 확인 (임대를 획득하고 수락 대기 중인 요청도 claim_request에서 차단됨)
+    lease_owner = None
+    if not is_request_processing(request_id):
+        # 완료된 요청이 있으면 제거 후 처리 권한(임대) 획득
+        discard_finished_request(request_id)
+        lease_owner = await claim_request(request_id)
+
+    if lease_owner is None:
+        logger.warning(f"[중복 요청 차단] Request ID: {request_id}")
+        logger.warning(f"   Story ID: {request.story_id}, S3 Key: {request.s3_key}")
+        logger.warning(f"   이미 처리 중인 동일한 요청입니다. (같은 story_id + s3_key 조합)")
+        raise HTTPException(
+            status_code=409,
+            detail=f"동일한 요청이 이미 처리 중입니다. Request ID: {request_id}. "
+                   f"노드별 이미지 생성 시에는 각 노드마다 다른 s3_key를 사용해야 합니다."
+        )
+    return lease_owner
+
+
+def _job_accepted_response(job: dict, request_id: str) -> JSONResponse:
+    """비동기 모드 작업 접수 응답 (202)"""
+    status_url = f"/api/v1/jobs/{job['job_id']}"
+    return JSONResponse(
+        status_code=202,
+        content=JobSubmitResponse(
+            job_id=job["job_id"],
+            request_id=request_id,
+            status=job["status"],
+            status_url=status_url
+        ).model_dump(),
+        headers={"Location": status_url}
+    )
+
+
+async def _join_in_flight_image_request(request_id: str, fingerprint: str, async_mode: bool):
+    """
+    처리 중인 동일 이미지 생성 요청에 합류 (single-flight)
+
+    같은 프로세스에서 처리 중인, 요청 본문까지 같은 /generate-image 요청만 합류할 수 있으며, 없으면 None을 반환합니다.
+    (같은 s3_key를 쓰는 배치 항목, 스타일 학습, 다른 프롬프트의 요청은 합류하지 않고 409)
+    기다리던 클라이언트가 끊겨도 asyncio.shield로 원래 작업은 취소되지 않습니다.
+    - 동기 요청: 원래 작업의 ImageGenerationResponse를 그대로 반환 (실패 시 같은 예외)
+    - async_mode: 처리 중인 비동기 작업의 job_id로 202 반환
+    """
+    record = join_request(request_id, GENERATE_IMAGE_KIND, fingerprint, require_job=async_mode)
+    if record is None:
+        return None
+
+    logger.info(f"[중복 요청 합류] Request ID: {request_id}" + (f", Job ID: {record.job_id}" if record.job_id else ""))
+    if async_mode:
+        job = get_job(record.job_id)
+        if job is not None:
+            return _job_accepted_response(job, request_id)
+        return None
+
+    result = await asyncio.shield(record.task)
+    if record.job_id is None:
+        return result
+
+    # 비동기 모드 작업에 합류한 경우 완료 Future에는 결과가 없으므로 작업 기록에서 조회
+    job = get_job(record.job_id)
+    if job is None:
+        raise HTTPException(status_code=500, detail="합류한 작업의 결과를 찾을 수 없습니다.")
+    if job["status"] != JOB_SUCCEEDED:
+        raise HTTPException(status_code=job["status_code"] or 500, detail=job["error"])
+    return ImageGenerationResponse(**job["result"])
+
+
+@router.post(
+    "/generate-image",
+    response_model=ImageGenerationResponse,
+    responses={202: {"model": JobSubmitResponse, "description": "비동기 모드: 작업 접수"}}
+)
+async def generate_image(
+    request: ImageGenerationRequest,
+    http_request: Request = None,
+    async_mode: bool = Query(False, description="true이면 202와 job_id를 즉시 반환하고 백그라운드에서 처리"),
+    coalesce: Optional[bool] = Query(
+        None,
+        description="true이면 처리 중인 동일 요청에 합류해 같은 결과를 반환 (기본값: REQUEST_COALESCING_ENABLED)"
+    ),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
     이미지 생성 및 S3 업로드
 
     사용자가 입력한 프롬프트와 소설 스타일을 결합하여 이미지 생성 후 S3에 업로드합니다.
     노드 정보는 백엔드에서 관리하므로, AI 서버는 이미지 생성과 S3 업로드만 담당합니다.
 
+    async_mode=true이면 작업을 대기열에 넣고 202와 job_id를 즉시 반환합니다.
+    결과는 GET /api/v1/jobs/{job_id}로 조회합니다.
+
     중복 요청 방지: 동일한 story_id + s3_key 조합의 요청이 이미 처리 중이면 거부합니다.
+    coalesce=true이면 거부하는 대신 처리 중인 요청에 합류해 같은 응답을 받습니다.
+    (async_mode에서는 처리 중인 작업의 job_id를 반환)
+
+    재시도: 같은 Idempotency-Key로 최근 완료된 같은 요청은 Gemini/Imagen/S3를 다시 호출하지 않고
+    같은 응답을 반환합니다. (동기 모드만 해당, 키 없이 다시 호출하면 새로 생성)
     """
     # 요청 ID 생성 (중복 방지용)
     request_id = get_request_id(
@@ -233,105 +654,294 @@ async def generate_image(request: ImageGenerationRequest, http_request: Request
         s3_key=request.s3_key,
         user_prompt=request.user_prompt
     )
+    if coalesce is None:
+        coalesce = config.REQUEST_COALESCING_ENABLED
 
     # 클라이언트 IP 및 요청 정보 로깅
     client_ip = http_request.client.host if http_request else "unknown"
-    logger.info(f"[요청 수신] POST /api/v1/generate-image")
+    logger.info(f"[요청 수신] POST /api/v1/generate-image{' (async)' if async_mode else ''}")
     logger.info(f"   Request ID: {request_id}")
     logger.info(f"   Client IP: {client_ip}")
     logger.info(f"   Story ID: {request.story_id}")
     logger.info(f"   S3 Key: {request.s3_key}")
     logger.info(f"   User Prompt: {request.user_prompt[:50]}..." if request.user_prompt else "   User Prompt: None")
 
-    # 오래된 요청 정리 (주기적으로)
-    cleanup_old_requests()
+    replay_key = fingerprint = None
+    if not async_mode:
+        replay_key, fingerprint, replayed = _prepare_replay("generate-image", request_id, request, idempotency_key)
+        if replayed is not None:
+            logger.info(f"[완료 결과 재사용] Request ID: {request_id}")
+            return replayed
 
-    # 중복 요청 확인
-    if is_request_processing(request_id):
-        logger.warning(f"[중복 요청 차단] Request ID: {request_id}")
-        logger.warning(f"   Story ID: {request.story_id}, S3 Key: {request.s3_key}")
-        logger.warning(f"   이미 처리 중인 동일한 요청입니다. (같은 story_id + s3_key 조합)")
-        raise HTTPException(
-            status_code=409,
-            detail=f"동일한 요청이 이미 처리 중입니다. Request ID: {request_id}. "
-                   f"노드별 이미지 생성 시에는 각 노드마다 다른 s3_key를 사용해야 합니다."
-        )
+    if fingerprint is None:
+        fingerprint = get_request_fingerprint(request.model_dump_json())
 
-    # 완료된 요청이 있으면 제거
-    processing_requests = get_processing_requests()
-    if request_id in processing_requests:
-        del processing_requests[request_id]
-        logger.debug(f"완료된 요청 제거: Request ID {request_id}")
+    if coalesce:
+        joined = await _join_in_flight_image_request(request_id, fingerprint, async_mode)
+        if joined is not None:
+            return joined
 
-    async def process_image_generation():
-        """실제 이미지 생성 처리"""
+    lease_owner = await _reject_duplicate_image_request(request, request_id)
+
+    if async_mode:
+        # 비동기 작업 모드: 대기열에 넣고 즉시 202 반환
+        job = create_job(request_id, request.story_id, request.s3_key)
         try:
-            # 소설 스타일 로드
-            logger.debug(f"[스타일 로드 시도] Story ID: {request.story_id}")
-            novel_style = load_novel_style(request.story_id)
-            if not novel_style:
-                logger.error(f"[스타일 정보 없음] Story ID: {request.story_id} - 먼저 /api/v1/learn-style 호출 필요")
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"스토리 ID {request.story_id}의 스타일 정보가 없습니다. 먼저 스타일을 학습해주세요."
-                )
+            done_future = submit_job(
+                job["job_id"], lambda: _run_image_generation_job(request, request_id), story_id=request.story_id
+            )
+        except JobQueueFullError as e:
+            mark_job_finished(job["job_id"], status_code=503, error=str(e))
+            release_claim(request_id, lease_owner)
+            logger.warning(f"[작업 대기열 포화] Request ID: {request_id}")
+            raise HTTPException(status_code=503, detail="작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+
+        # 대기 중인 작업도 중복 요청으로 차단되도록 완료 Future를 등록
+        register_request(
+            request_id, done_future, request.s3_key, request.story_id,
+            job_id=job["job_id"], lease_owner=lease_owner, kind=GENERATE_IMAGE_KIND, fingerprint=fingerprint
+        )
+        logger.info(f"[작업 접수] Request ID: {request_id}, Job ID: {job['job_id']}")
+        return _job_accepted_response(job, request_id)
+
+    # 전체 동시 처리 수 제한 (초과 시 대기, 대기열 포화 시 429)
+    await _admit_request(request_id, request.story_id, lease_owner)
+
+    # 비동기 작업 생성 및 추적
+    task = asyncio.create_task(_process_image_generation(request, request_id))
+    attach_generation(task)
+    register_request(
+        request_id, task, request.s3_key, request.story_id,
+        lease_owner=lease_owner, kind=GENERATE_IMAGE_KIND, fingerprint=fingerprint
+    )
+
+    try:
+        result = await task
+    except Exception:
+        # 에러 발생 시에도 요청 ID 제거
+        unregister_request(request_id)
+        raise
+
+    remember_completed_result(replay_key, fingerprint, result.model_dump(mode="json"))
+    return result
+
+
+@router.post("/generate-image/stream")
+async def generate_image_stream(request: ImageGenerationRequest, http_request: Request = None):
+    """
+    이미지 생성 및 S3 업로드 (SSE 스트리밍)
+
+    /generate-image와 동일하게 처리하되, 단계가 끝날 때마다 SSE 이벤트를 전송합니다.
+    개선된 프롬프트(prompt_enhanced)를 이미지 생성 전에 받아볼 수 있습니다.
+    이벤트: started, style_loaded, prompt_enhanced, sanitized, (cache_hit | image_generated, resized),
+    uploaded, completed (실패 시 error)
+    """
+    request_id = get_request_id(
+        story_id=request.story_id,
+        s3_key=request.s3_key,
+        user_prompt=request.user_prompt
+    )
+
+    client_ip = http_request.client.host if http_request else "unknown"
+    logger.info("[요청 수신] POST /api/v1/generate-image/stream")
+    logger.info(f"   Request ID: {request_id}")
+    logger.info(f"   Client IP: {client_ip}")
+    logger.info(f"   Story ID: {request.story_id}")
+    logger.info(f"   S3 Key: {request.s3_key}")
+
+    lease_owner = await _reject_duplicate_image_request(request, request_id)
+    await _admit_request(request_id, request.story_id, lease_owner)
+
+    return _start_event_stream(
+        request_id,
+        lambda on_progress: _process_image_generation(request, request_id, on_progress=on_progress),
+        s3_key=request.s3_key,
+        story_id=request.story_id,
+        lease_owner=lease_owner
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str):
+    """비동기 작업 상태/결과 조회"""
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"작업 ID {job_id}를 찾을 수 없습니다.")
+
+    return JobStatusResponse(
+        job_id=job["job_id"],
+        request_id=job["request_id"],
+        story_id=job["story_id"],
+        s3_key=job["s3_key"],
+        status=job["status"],
+        created_at=job["created_at"].isoformat(),
+        started_at=job["started_at"].isoformat() if job["started_at"] else None,
+        finished_at=job["finished_at"].isoformat() if job["finished_at"] else None,
+        result=job["result"],
+        status_code=job["status_code"],
+        error=job["error"]
+    )
+
 
-            logger.info(f"[처리 시작] Request ID: {request_id}")
-            logger.debug(f"   스타일 정보 로드 완료: atmosphere={novel_style.get('atmosphere')}, visual_style={novel_style.get('visual_style')}")
+async def _process_batch_item(
+    index: int,
+    item: BatchImageItem,
+    story_id: str,
+    novel_style: dict,
+    generation_slots: asyncio.Semaphore,
+    image_format: Optional[str] = None,
+    image_quality: Optional[int] = None,
+    derivatives: Optional[List[str]] = None,
+    use_cache: bool = True
+) -> BatchImageItemResult:
+    """배치 항목 하나 처리 (실패는 예외 대신 항목 결과로 반환)"""
+    request_id = get_request_id(story_id=story_id, s3_key=item.s3_key, user_prompt=item.user_prompt)
+
+    lease_owner = None if is_request_processing(request_id) else await claim_request(request_id)
+    if lease_owner is None:
+        logger.warning(f"[배치 중복 항목] index={index}, Request ID: {request_id}")
+        return BatchImageItemResult(
+            index=index,
+            success=False,
+            s3_key=item.s3_key,
+            status_code=409,
+            error=f"동일한 요청이 이미 처리 중입니다. Request ID: {request_id}"
+        )
 
-            # 프롬프트 개선
+    async def process_item():
+        # 프롬프트 개선 + 이미지 생성은 동시 실행 수를 제한하고,
+        # 업로드는 슬롯을 반납한 뒤 진행하여 다음 항목의 생성과 겹치도록 함
+        # 전체 생성 슬롯도 스토리별 공정 순서로 획득 (다른 스토리의 요청이 배치 뒤에 밀리지 않도록)
+        async with generation_slots, generation_slot(request_id, story_id):
             enhanced_prompt = await generate_enhanced_prompt(
-                request.user_prompt,
+                item.user_prompt,
                 novel_style,
-                request.context_text
+                item.context_text
             )
-
-            logger.debug(f"   개선된 프롬프트: {enhanced_prompt[:100]}...")
-
-            # 이미지 생성 및 S3 업로드
-            image_url = await generate_and_upload_image(
+            generated = await generate_image_for_upload(
                 enhanced_prompt,
-                s3_url=request.s3_url,
-                s3_bucket=request.s3_bucket,
-                s3_key=request.s3_key
+                s3_url=item.s3_url,
+                s3_bucket=item.s3_bucket,
+                s3_key=item.s3_key,
+                image_format=image_format,
+                image_quality=image_quality,
+                derivatives=derivatives,
+                use_cache=use_cache
             )
 
-            logger.info(f"[처리 완료] Request ID: {request_id} - 이미지 URL: {image_url}")
-
-            return ImageGenerationResponse(
-                image_url=image_url,
-                enhanced_prompt=enhanced_prompt,
-                story_id=request.story_id,
-                s3_key=request.s3_key
-            )
-        except HTTPException:
-            raise
-        except ValueError as e:
-            logger.error(f"[처리 실패] Request ID: {request_id} - ValueError: {e}")
-            raise HTTPException(status_code=400, detail=str(e))
-        except Exception as e:
-            logger.error(f"[처리 실패] Request ID: {request_id} - Exception: {e}", exc_info=True)
-            raise HTTPException(status_code=500, detail=f"이미지 생성 실패: {str(e)}")
+        await upload_generated_image(
+            generated,
+            s3_url=item.s3_url,
+            s3_bucket=item.s3_bucket,
+            s3_key=item.s3_key
+        )
+        return enhanced_prompt, generated
 
-    # 비동기 작업 생성 및 추적
-    task = asyncio.create_task(process_image_generation())
-    register_request(request_id, task, request.s3_key, request.story_id)
+    task = asyncio.create_task(process_item())
+    register_request(request_id, task, item.s3_key, story_id, lease_owner=lease_owner)
 
     try:
-        result = await task
-        return result
+        enhanced_prompt, generated = await task
+        logger.info(f"[배치 항목 완료] index={index}, Request ID: {request_id} - 이미지 URL: {generated.image_url}")
+        return BatchImageItemResult(
+            index=index,
+            success=True,
+            s3_key=generated.s3_key or item.s3_key,
+            image_url=generated.image_url,
+            enhanced_prompt=enhanced_prompt,
+            image_format=generated.image_format,
+            content_type=generated.content_type,
+            image_size_bytes=generated.size_bytes,
+            derivative_urls=generated.derivative_urls or None
+        )
+    except HTTPException as e:
+        logger.error(f"[배치 항목 실패] index={index}, Request ID: {request_id} - {e.detail}")
+        return BatchImageItemResult(
+            index=index, success=False, s3_key=item.s3_key, status_code=e.status_code, error=e.detail
+        )
+    except ValueError as e:
+        logger.error(f"[배치 항목 실패] index={index}, Request ID: {request_id} - ValueError: {e}")
+        return BatchImageItemResult(
+            index=index, success=False, s3_key=item.s3_key, status_code=400, error=str(e)
+        )
     except Exception as e:
-        # 에러 발생 시에도 요청 ID 제거
+        logger.error(f"[배치 항목 실패] index={index}, Request ID: {request_id} - Exception: {e}", exc_info=True)
+        return BatchImageItemResult(
+            index=index, success=False, s3_key=item.s3_key, status_code=500, error=f"이미지 생성 실패: {str(e)}"
+        )
+    finally:
         unregister_request(request_id)
-        raise
+
+
+@router.post("/generate-images", response_model=BatchImageGenerationResponse)
+async def generate_images(request: BatchImageGenerationRequest, http_request: Request = None):
+    """
+    스토리 단위 배치 이미지 생성 및 S3 업로드
+
+    스타일은 한 번만 로드하고, 항목별 프롬프트 개선/이미지 생성을 제한된 동시성으로 병렬 처리합니다.
+    업로드는 생성 슬롯을 반납한 뒤 진행되어 다음 항목의 생성과 겹쳐 실행됩니다.
+    항목별 실패는 전체 요청을 실패시키지 않고 results의 항목 결과로 반환됩니다.
+    """
+    client_ip = http_request.client.host if http_request else "unknown"
+    logger.info("[요청 수신] POST /api/v1/generate-images")
+    logger.info(f"   Client IP: {client_ip}")
+    logger.info(f"   Story ID: {request.story_id}")
+    logger.info(f"   항목 수: {len(request.items)}")
+
+    if not request.items:
+        raise HTTPException(status_code=400, detail="items가 비어 있습니다.")
+    if len(request.items) > config.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {config.BATCH_MAX_ITEMS}개 항목까지 요청할 수 있습니다. (요청: {len(request.items)}개)"
+        )
+
+    # 소설 스타일은 배치 전체에서 한 번만 로드
+    novel_style = load_novel_style(request.story_id)
+    if not novel_style:
+        logger.error(f"[스타일 정보 없음] Story ID: {request.story_id} - 먼저 /api/v1/learn-style 호출 필요")
+        raise HTTPException(
+            status_code=404,
+            detail=f"스토리 ID {request.story_id}의 스타일 정보가 없습니다. 먼저 스타일을 학습해주세요."
+        )
+
+    cleanup_old_requests()
+
+    concurrency = min(request.max_concurrency or config.BATCH_MAX_CONCURRENCY, config.BATCH_MAX_CONCURRENCY)
+    generation_slots = asyncio.Semaphore(max(1, concurrency))
+    logger.info(f"[배치 처리 시작] Story ID: {request.story_id}, 동시 생성 수: {concurrency}")
+
+    results = await asyncio.gather(*[
+        _process_batch_item(
+            index,
+            item,
+            request.story_id,
+            novel_style,
+            generation_slots,
+            image_format=request.image_format,
+            image_quality=request.image_quality,
+            derivatives=request.derivatives,
+            use_cache=request.use_cache
+        )
+        for index, item in enumerate(request.items)
+    ])
+
+    succeeded = sum(1 for result in results if result.success)
+    logger.info(f"[배치 처리 완료] Story ID: {request.story_id} - 성공 {succeeded}/{len(results)}")
+
+    return BatchImageGenerationResponse(
+        story_id=request.story_id,
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results
+    )
 
 
 @router.delete("/style/{story_id}")
 async def delete_novel_style(story_id: str):
     """소설 스타일 삭제"""
-    style_file = get_style_file_path(story_id)
-    if style_file.exists():
-        style_file.unlink()
+    if remove_novel_style(story_id):
         return {"message": f"스토리 ID {story_id}의 스타일이 삭제되었습니다."}
     else:
         raise HTTPException(status_code=404, detail=f"스토리 ID {story_id}의 스타일 정보를 찾을 수 없습니다.")
@@ -2,48 +2,144 @@
 서비스 패키지
 비즈니스 로직을 담당하는 서비스 모듈들
 """
-from .gemini_service import get_model, initialize_vertex_ai
+from .gemini_service import (
+    get_model,
+    get_imagen_model,
+    warm_up_models,
+    warm_up_async_client,
+    initialize_vertex_ai,
+    generate_content_async,
+    get_gemini_rate_limiter,
+    get_imagen_rate_limiter,
+    get_rate_limiter_stats,
+)
 from .s3_service import (
     get_s3_client,
+    init_s3_client,
+    shutdown_s3_executor,
+    init_http_client,
+    close_http_client,
+    get_http_client,
     download_text_from_s3,
     upload_image_to_s3,
     upload_image_to_s3_presigned_url,
+    copy_object_in_s3,
+    get_s3_object_url,
 )
 from .prompt_service import sanitize_prompt_for_imagen
 from .style_service import (
     get_style_file_path,
     save_novel_style,
     load_novel_style,
+    delete_novel_style,
+    get_style_cache_stats,
     analyze_novel_style,
     generate_thumbnail_prompt,
     generate_enhanced_prompt,
+    get_style_version,
+    get_enhanced_prompt_cache_stats,
 )
+from utils.image_processing import resize_image_to_target
 from .image_service import (
-    resize_image_to_target,
     generate_image_with_api,
+    generate_encoded_image_with_api,
     generate_and_upload_image,
+    generate_image_for_upload,
+    upload_generated_image,
+    GeneratedImage,
+    shutdown_generation_executor,
+    start_postprocess_executor,
+    postprocess_image,
+    get_postprocess_stats,
+    get_image_cache_key,
+    get_image_cache_stats,
+    get_image_encoding_stats,
+)
+from .sensitive_word_service import (
+    reload_sensitive_words,
+    start_sensitive_word_reloader,
+    stop_sensitive_word_reloader,
+    get_sensitive_word_stats,
+)
+from .job_service import (
+    start_job_workers,
+    stop_job_workers,
+    submit_job,
+    get_job_queue_stats,
+    JobQueueFullError,
+)
+from .admission_service import (
+    admit_generation,
+    attach_generation,
+    generation_slot,
+    get_admission_stats,
 )
 
 __all__ = [
     # gemini_service
     "get_model",
+    "get_imagen_model",
+    "warm_up_models",
+    "warm_up_async_client",
     "initialize_vertex_ai",
+    "generate_content_async",
+    "get_gemini_rate_limiter",
+    "get_imagen_rate_limiter",
+    "get_rate_limiter_stats",
     # s3_service
     "get_s3_client",
+    "init_s3_client",
+    "shutdown_s3_executor",
+    "init_http_client",
+    "close_http_client",
+    "get_http_client",
     "download_text_from_s3",
     "upload_image_to_s3",
     "upload_image_to_s3_presigned_url",
+    "copy_object_in_s3",
+    "get_s3_object_url",
     # prompt_service
     "sanitize_prompt_for_imagen",
     # style_service
     "get_style_file_path",
     "save_novel_style",
     "load_novel_style",
+    "delete_novel_style",
+    "get_style_cache_stats",
     "analyze_novel_style",
     "generate_thumbnail_prompt",
     "generate_enhanced_prompt",
+    "get_style_version",
+    "get_enhanced_prompt_cache_stats",
     # image_service
     "resize_image_to_target",
     "generate_image_with_api",
+    "generate_encoded_image_with_api",
     "generate_and_upload_image",
+    "generate_image_for_upload",
+    "upload_generated_image",
+    "GeneratedImage",
+    "shutdown_generation_executor",
+    "start_postprocess_executor",
+    "postprocess_image",
+    "get_postprocess_stats",
+    "get_image_cache_key",
+    "get_image_cache_stats",
+    "get_image_encoding_stats",
+    # sensitive_word_service
+    "reload_sensitive_words",
+    "start_sensitive_word_reloader",
+    "stop_sensitive_word_reloader",
+    "get_sensitive_word_stats",
+    # job_service
+    "start_job_workers",
+    "stop_job_workers",
+    "submit_job",
+    "get_job_queue_stats",
+    "JobQueueFullError",
+    # admission_service
+    "admit_generation",
+    "attach_generation",
+    "generation_slot",
+    "get_admission_stats",
 ]
@@ -0,0 +1,102 @@
+"""
+수락 제어 서비스 모듈
+이미지 생성/스타일 학습 요청의 전체 동시 처리 수를 제한하고, 초과 시 429와 Retry-After로 거부
+대기 중인 요청은 스토리별 대기열에서 공정한 순서로 처리
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict
+
+from fastapi import HTTPException
+
+from config import config
+from logger import setup_logger
+from utils.admission_controller import AdmissionController, AdmissionRejectedError
+
+logger = setup_logger()
+
+
+def parse_story_weights(spec: str) -> Dict[str, float]:
+    """
+    스토리별 가중치 설정 파싱
+
+    형식: "story_id:가중치,story_id:가중치" (예: "story_123:2,story_456:0.5")
+
+    Raises:
+        ValueError: 형식이 올바르지 않은 경우
+    """
+    weights = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        story_id, _, weight = entry.rpartition(":")
+        if not story_id or not weight:
+            raise ValueError(f"잘못된 스토리 가중치 설정입니다: {entry} (형식: story_id:가중치)")
+        weights[story_id] = float(weight)
+    return weights
+
+
+# /generate-image, /learn-style, /generate-images 공용 수락 제어 (같은 Vertex AI 할당량을 사용)
+_generation_admission = AdmissionController(
+    name="generation",
+    max_concurrency=config.ADMISSION_MAX_CONCURRENCY,
+    max_queue=config.ADMISSION_QUEUE_SIZE,
+    queue_timeout=config.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    max_queue_per_key=config.ADMISSION_QUEUE_SIZE_PER_STORY,
+    weights=parse_story_weights(config.ADMISSION_STORY_WEIGHTS)
+)
+
+
+async def admit_generation(request_id: str, story_id: str) -> None:
+    """
+    생성 작업 슬롯 획득 (필요하면 스토리별 대기열에서 대기)
+
+    Raises:
+        HTTPException: 대기열이 가득 찼거나 대기 시간이 초과된 경우 (429, Retry-After 헤더 포함)
+    """
+    if not config.ADMISSION_CONTROL_ENABLED:
+        return
+
+    try:
+        await _generation_admission.acquire(story_id)
+    except AdmissionRejectedError as e:
+        logger.warning(
+            f"[요청 수락 거부] Request ID: {request_id}, Story ID: {story_id} - {e} (Retry-After: {e.retry_after}s)"
+        )
+        raise HTTPException(
+            status_code=429,
+            detail={
+                "code": "SERVER_BUSY" if e.reason == "queue_full" else "QUEUE_TIMEOUT",
+                "message": "처리 중인 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+                "action": "RETRY",
+                "retry_after": e.retry_after,
+            },
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
+def attach_generation(task: asyncio.Future) -> None:
+    """admit_generation으로 받은 슬롯을 작업이 끝날 때 반납"""
+    if config.ADMISSION_CONTROL_ENABLED:
+        _generation_admission.attach(task)
+
+
+@asynccontextmanager
+async def generation_slot(request_id: str, story_id: str):
+    """블록 안에서만 생성 작업 슬롯 사용 (배치 항목처럼 생성 후 업로드를 슬롯 밖에서 하는 경우)"""
+    await admit_generation(request_id, story_id)
+    started_at = time.monotonic()
+    try:
+        yield
+    finally:
+        if config.ADMISSION_CONTROL_ENABLED:
+            _generation_admission.release(time.monotonic() - started_at)
+
+
+def get_admission_stats() -> dict:
+    """수락 제어 상태와 스토리별 대기열 깊이/대기 시간 반환"""
+    return {
+        "enabled": config.ADMISSION_CONTROL_ENABLED,
+        **_generation_admission.stats(),
+        "stories": _generation_admission.key_stats(),
+    }
@@ -3,7 +3,11 @@ Gemini 서비스 모듈
 GCP Vertex AI Gemini 모델 초기화 및 관리
 """
 
+import asyncio
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
 
 try:
     from vertexai.preview.generative_models import GenerativeModel
@@ -15,15 +19,36 @@ except ImportError:
             "vertexai 패키지를 설치해주세요: pip install google-cloud-aiplatform"
         )
 
+try:
+    from vertexai.preview.vision_models import ImageGenerationModel
+except ImportError:
+    ImageGenerationModel = None
+
 from google.cloud import aiplatform
 
 from config import config
 from logger import setup_logger
+from utils.rate_limiter import AdaptiveTokenBucket, is_quota_exceeded_error
 
 logger = setup_logger()
 
-# Gemini 모델 인스턴스 (지연 초기화)
-_model_instance = None
+# Gemini 모델 인스턴스 (지연 초기화, 모델 이름별)
+_model_instances: Dict[str, GenerativeModel] = {}
+
+# Imagen 모델 인스턴스 (지연 초기화, 모델 이름별)
+_imagen_model_instances: Dict[str, Any] = {}
+
+# 모델 생성 잠금 (워커 스레드와 시작 시 워밍업에서 동시에 생성하지 않도록)
+_model_lock = threading.Lock()
+
+# 모델별 동시 호출 제한 세마포어 (이벤트 루프에서 지연 생성)
+_model_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+# 네이티브 async API가 없는 SDK 버전용 전용 스레드 풀
+_gemini_executor: Optional[ThreadPoolExecutor] = None
+
+# 모델별 호출 속도 제한 (분당 할당량, 모든 호출 위치에서 공유)
+_rate_limiters: Dict[str, AdaptiveTokenBucket] = {}
 
 
 def initialize_vertex_ai():
@@ -43,10 +68,201 @@ def initialize_vertex_ai():
         logger.info("ADC(Application Default Credentials)를 사용합니다.")
 
 
-def get_model():
+def get_model(model_name: Optional[str] = None):
     """모델 인스턴스 반환 (지연 초기화)"""
-    global _model_instance
-    if _model_instance is None:
-        _model_instance = GenerativeModel(config.GEMINI_MODEL_NAME)
-        logger.info(f"Gemini 모델 초기화 완료: {config.GEMINI_MODEL_NAME}")
-    return _model_instance
+    model_name = model_name or config.GEMINI_MODEL_NAME
+    model_instance = _model_instances.get(model_name)
+    if model_instance is None:
+        with _model_lock:
+            model_instance = _model_instances.get(model_name)
+            if model_instance is None:
+                model_instance = GenerativeModel(model_name)
+                _model_instances[model_name] = model_instance
+                logger.info(f"Gemini 모델 초기화 완료: {model_name}")
+    return model_instance
+
+
+def get_imagen_model(model_name: Optional[str] = None):
+    """
+    Imagen 모델 인스턴스 반환 (지연 초기화)
+
+    from_pretrained는 모델 메타데이터 조회를 위한 네트워크 호출을 포함하므로
+    프로세스당 한 번만 생성하여 재사용합니다.
+
+    Raises:
+        ImportError: vertexai 비전 모델 패키지를 사용할 수 없는 경우
+    """
+    if ImageGenerationModel is None:
+        raise ImportError("vertexai.preview.vision_models를 사용할 수 없습니다.")
+
+    model_name = model_name or config.IMAGEN_MODEL_NAME
+    imagen_model = _imagen_model_instances.get(model_name)
+    if imagen_model is None:
+        with _model_lock:
+            imagen_model = _imagen_model_instances.get(model_name)
+            if imagen_model is None:
+                imagen_model = ImageGenerationModel.from_pretrained(model_name)
+                _imagen_model_instances[model_name] = imagen_model
+                logger.info(f"Imagen 모델 초기화 완료: {model_name}")
+    return imagen_model
+
+
+def warm_up_models() -> None:
+    """
+    Gemini/Imagen 모델 핸들을 미리 생성하고 인증 토큰과 gRPC 채널을 워밍업
+
+    블로킹 호출이므로 서버 시작 시 스레드에서 실행합니다.
+    워밍업 실패는 경고만 남기고, 첫 요청에서 다시 지연 초기화됩니다.
+    """
+    try:
+        gemini_model = get_model()
+        # 토큰이 거의 들지 않는 호출로 인증 토큰 발급과 채널 연결을 미리 수행
+        gemini_model.count_tokens("warm-up")
+        logger.info("Gemini 모델 워밍업 완료")
+    except Exception as e:
+        logger.warning(f"Gemini 모델 워밍업 실패: {e}")
+
+    try:
+        get_imagen_model()
+        logger.info("Imagen 모델 워밍업 완료")
+    except Exception as e:
+        logger.warning(f"Imagen 모델 워밍업 실패: {e}")
+
+
+async def warm_up_async_client() -> None:
+    """
+    generate_content_async가 사용하는 비동기 채널 워밍업
+
+    동기 채널과 별도로 이벤트 루프에 묶인 채널을 사용하므로 루프 안에서 한 번 호출합니다.
+    """
+    try:
+        gemini_model = get_model()
+        if hasattr(gemini_model, "count_tokens_async"):
+            await asyncio.wait_for(
+                gemini_model.count_tokens_async("warm-up"),
+                timeout=config.GEMINI_TIMEOUT_SECONDS
+            )
+            logger.info("Gemini 비동기 채널 워밍업 완료")
+    except Exception as e:
+        logger.warning(f"Gemini 비동기 채널 워밍업 실패: {e}")
+
+
+def _get_model_semaphore(model_name: str) -> asyncio.Semaphore:
+    """모델별 동시 호출 제한 세마포어 반환"""
+    semaphore = _model_semaphores.get(model_name)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, config.GEMINI_MAX_CONCURRENCY))
+        _model_semaphores[model_name] = semaphore
+    return semaphore
+
+
+def _get_rate_limiter(model_name: str, rate_per_minute: float, burst: int) -> Optional[AdaptiveTokenBucket]:
+    """모델별 속도 제한기 반환 (지연 생성, 비활성화 시 None)"""
+    if not config.RATE_LIMIT_ENABLED or rate_per_minute <= 0:
+        return None
+    limiter = _rate_limiters.get(model_name)
+    if limiter is None:
+        limiter = AdaptiveTokenBucket(
+            name=model_name,
+            rate_per_minute=rate_per_minute,
+            burst=burst,
+            max_wait=config.RATE_LIMIT_MAX_WAIT_SECONDS
+        )
+        _rate_limiters[model_name] = limiter
+    return limiter
+
+
+def get_gemini_rate_limiter(model_name: Optional[str] = None) -> Optional[AdaptiveTokenBucket]:
+    """Gemini 모델 속도 제한기 (GEMINI_RATE_LIMIT_PER_MINUTE)"""
+    return _get_rate_limiter(
+        model_name or config.GEMINI_MODEL_NAME,
+        config.GEMINI_RATE_LIMIT_PER_MINUTE,
+        config.GEMINI_RATE_LIMIT_BURST
+    )
+
+
+def get_imagen_rate_limiter(model_name: Optional[str] = None) -> Optional[AdaptiveTokenBucket]:
+    """Imagen 모델 속도 제한기 (IMAGEN_RATE_LIMIT_PER_MINUTE)"""
+    return _get_rate_limiter(
+        model_name or config.IMAGEN_MODEL_NAME,
+        config.IMAGEN_RATE_LIMIT_PER_MINUTE,
+        config.IMAGEN_RATE_LIMIT_BURST
+    )
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict]:
+    """모델별 속도 제한 상태 반환"""
+    return {model_name: limiter.stats() for model_name, limiter in _rate_limiters.items()}
+
+
+def _get_gemini_executor() -> ThreadPoolExecutor:
+    """동기 SDK 호출용 전용 스레드 풀 반환 (지연 초기화)"""
+    global _gemini_executor
+    if _gemini_executor is None:
+        _gemini_executor = ThreadPoolExecutor(
+            max_workers=max(1, config.GEMINI_MAX_CONCURRENCY),
+            thread_name_prefix="gemini"
+        )
+    return _gemini_executor
+
+
+async def generate_content_async(
+    prompt: str,
+    model_name: Optional[str] = None,
+    timeout: Optional[float] = None
+):
+    """
+    이벤트 루프를 막지 않고 Gemini 콘텐츠 생성
+
+    SDK의 네이티브 async API(generate_content_async)를 우선 사용하고,
+    없으면 전용 스레드 풀에서 동기 API를 실행합니다.
+    모델별 동시 호출 수는 GEMINI_MAX_CONCURRENCY로, 호출 속도는 GEMINI_RATE_LIMIT_PER_MINUTE로 제한되며
+    할당량 초과 오류가 나면 호출 속도를 낮춥니다.
+
+    Args:
+        prompt: Gemini 프롬프트
+        model_name: 모델 이름 (기본값: config.GEMINI_MODEL_NAME)
+        timeout: 호출 타임아웃 (초, 기본값: config.GEMINI_TIMEOUT_SECONDS)
+
+    Returns:
+        Gemini 응답 객체
+
+    Raises:
+        asyncio.TimeoutError: 타임아웃 초과 시
+        RateLimitExceededError: 호출 차례를 RATE_LIMIT_MAX_WAIT_SECONDS 안에 받을 수 없는 경우
+    """
+    model_name = model_name or config.GEMINI_MODEL_NAME
+    timeout = timeout if timeout is not None else config.GEMINI_TIMEOUT_SECONDS
+    model_instance = get_model(model_name)
+
+    # 동시 호출 슬롯을 잡기 전에 호출 차례를 받아, 대기 중에 슬롯을 점유하지 않도록 함
+    rate_limiter = get_gemini_rate_limiter(model_name)
+    if rate_limiter is not None:
+        await rate_limiter.acquire()
+
+    async with _get_model_semaphore(model_name):
+        if hasattr(model_instance, "generate_content_async"):
+            call = model_instance.generate_content_async(prompt)
+        else:
+            loop = asyncio.get_running_loop()
+            call = loop.run_in_executor(
+                _get_gemini_executor(), model_instance.generate_content, prompt
+            )
+
+        try:
+            response = await asyncio.wait_for(call, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Gemini 호출 타임아웃: model={model_name}, timeout={timeout}s")
+            raise
+        except Exception as e:
+            if rate_limiter is not None and is_quota_exceeded_error(e):
+                rate_limiter.on_quota_exceeded()
+                logger.warning(
+                    f"Gemini 할당량 초과: model={model_name}, "
+                    f"호출 속도 {rate_limiter.rate * 60:.1f}/min으로 낮춤 - {e}"
+                )
+            raise
+
+    if rate_limiter is not None:
+        rate_limiter.on_success()
+    return response
@@ -3,96 +3,368 @@
 이미지 생성 및 처리 관련 기능
 """
 
-from typing import Optional
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
 
 from fastapi import HTTPException
 
 from config import config
 from logger import setup_logger
+from services.gemini_service import get_imagen_model, get_imagen_rate_limiter
 from services.prompt_service import sanitize_prompt_for_imagen
-from services.s3_service import upload_image_to_s3
+from services.s3_service import upload_image_to_s3, copy_object_in_s3
+from utils.bounded_executor import BoundedExecutor, ExecutorQueueFullError
+from utils.image_processing import (
+    DerivativeSpec,
+    EncodedImage,
+    SOURCE_IMAGE_FORMAT,
+    derivative_key,
+    get_content_type,
+    get_image_extension,
+    init_worker_logging,
+    parse_derivative_specs,
+    process_image,
+    resolve_output_format,
+    resolve_output_quality,
+    with_image_extension,
+    warm_up_worker,
+)
+from utils.progress import ProgressCallback, emit_progress
+from utils.rate_limiter import RateLimitExceededError, is_quota_exceeded_error
+from utils.ttl_cache import TTLCache
 from utils.sensitive_filter import is_imagen_safety_block_error
 
 logger = setup_logger()
 
-# PIL import (이미지 리사이즈용)
-try:
-    from PIL import Image
-    import io
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
+# Imagen 호출 전용 워커 풀 (동기 SDK 호출을 이벤트 루프 밖에서 병렬 실행)
+_imagen_executor = BoundedExecutor(
+    name="imagen",
+    max_workers=config.IMAGEN_MAX_WORKERS,
+    queue_size=config.IMAGEN_QUEUE_SIZE,
+    timeout=config.IMAGEN_TIMEOUT_SECONDS
+)
+
+# 이미지 후처리 전용 프로세스 풀 (리사이즈/인코딩을 여러 코어에서 실행, 가득 차면 자리가 날 때까지 대기)
+_postprocess_executor = BoundedExecutor(
+    name="image-postprocess",
+    max_workers=config.IMAGE_POSTPROCESS_WORKERS,
+    queue_size=config.IMAGE_POSTPROCESS_QUEUE_SIZE,
+    timeout=config.IMAGE_POSTPROCESS_TIMEOUT_SECONDS,
+    use_processes=True,
+    start_method=config.IMAGE_POSTPROCESS_START_METHOD,
+    wait_when_full=True,
+    initializer=init_worker_logging
+) if config.IMAGE_POSTPROCESS_WORKERS > 0 else None
+
+# Imagen 생성 파라미터 (16:9 비율로 720p에 적합)
+IMAGEN_GENERATION_PARAMS = {
+    "number_of_images": 1,
+    "aspect_ratio": "16:9",
+    "safety_filter_level": "block_some",
+    "person_generation": "allow_adult",
+}
+
+# 요청에서 이름으로 선택할 수 있는 파생 이미지 규격 (config.IMAGE_DERIVATIVES)
+IMAGE_DERIVATIVE_SPECS: Dict[str, DerivativeSpec] = {
+    spec[0]: spec for spec in parse_derivative_specs(config.IMAGE_DERIVATIVES)
+}
+
+# 생성 이미지 캐시 (콘텐츠 주소 -> 캐시 원본 S3 위치 {"bucket", "key", "format", "derivatives"})
+# 원본은 요청의 대상 키가 아닌 콘텐츠 주소 키(IMAGE_CACHE_S3_PREFIX)에 따로 저장하므로,
+# 대상 키가 다른 이미지로 덮어쓰여도 캐시 히트가 잘못된 이미지를 복사하지 않음
+_generated_image_cache = TTLCache(
+    name="generated_image",
+    max_entries=config.IMAGE_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.IMAGE_CACHE_TTL_SECONDS,
+    disk_dir=Path(config.IMAGE_CACHE_DIR) if config.IMAGE_CACHE_DIR else None
+) if config.IMAGE_CACHE_ENABLED else None
+
+
+def _generate_images_sync(enhanced_prompt: str):
+    """이미지 생성 (워커 스레드에서 실행되는 동기 호출)"""
+    # 캐시된 Imagen 4 Fast 모델 사용 (서버 시작 시 워밍업됨)
+    imagen_model = get_imagen_model()
+
+    return imagen_model.generate_images(prompt=enhanced_prompt, **IMAGEN_GENERATION_PARAMS)
+
+
+# 출력 형식별 인코딩 결과 통계 (구조: {형식: {"count": 횟수, "total_bytes": 누적 용량}})
+_encoding_stats: Dict[str, Dict[str, int]] = {}
+
+
+def get_image_cache_key(
+    sanitized_prompt: str,
+    image_format: str = SOURCE_IMAGE_FORMAT,
+    image_quality: Optional[int] = None,
+    derivatives: List[DerivativeSpec] = ()
+) -> str:
+    """
+    생성 이미지 캐시 키 (콘텐츠 주소) 생성
+
+    최종 정제 프롬프트 + 모델 + 생성 파라미터 + 출력 해상도/형식/품질 + 파생 이미지 규격이 같으면
+    같은 이미지로 간주합니다.
+    """
+    raw_key = json.dumps(
+        {
+            "prompt": sanitized_prompt,
+            "model": config.IMAGEN_MODEL_NAME,
+            "params": IMAGEN_GENERATION_PARAMS,
+            "size": [config.IMAGE_WIDTH, config.IMAGE_HEIGHT],
+            "format": image_format,
+            "quality": image_quality,
+            "derivatives": sorted(list(spec) for spec in derivatives),
+        },
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+
+# 캐시 항목별로 기억할 대상 위치 수 (같은 대상의 재생성 요청 판별용)
+MAX_CACHE_TARGETS = 32
+
+
+def get_cache_object_key(cache_key: str, image_format: str) -> str:
+    """캐시 원본 S3 키 (콘텐츠 주소이므로 한 번 쓰면 다른 이미지로 덮어쓰이지 않음)"""
+    return f"{config.IMAGE_CACHE_S3_PREFIX}{cache_key}.{get_image_extension(image_format)}"
 
 
-def resize_image_to_target(image_bytes: bytes, target_width: int, target_height: int) -> bytes:
+def get_image_cache_stats() -> Optional[Dict]:
+    """생성 이미지 캐시 통계 반환 (캐시 비활성화 시 None)"""
+    return _generated_image_cache.stats() if _generated_image_cache else None
+
+
+def resolve_derivatives(names: Optional[List[str]]) -> List[DerivativeSpec]:
     """
-    이미지를 목표 해상도로 리사이즈
+    요청된 파생 이미지 이름을 규격으로 변환
 
-    Args:
-        image_bytes: 원본 이미지 바이너리 데이터
-        target_width: 목표 너비 (기본값: config.IMAGE_WIDTH)
-        target_height: 목표 높이 (기본값: config.IMAGE_HEIGHT)
+    Raises:
+        ValueError: 설정(IMAGE_DERIVATIVES)에 없는 이름인 경우
+    """
+    if not names:
+        return []
+    unknown = [name for name in names if name not in IMAGE_DERIVATIVE_SPECS]
+    if unknown:
+        raise ValueError(
+            f"알 수 없는 파생 이미지입니다: {', '.join(unknown)} "
+            f"(사용 가능: {', '.join(IMAGE_DERIVATIVE_SPECS) or '없음'})"
+        )
+    return [IMAGE_DERIVATIVE_SPECS[name] for name in dict.fromkeys(names)]
+
+
+def _record_encoding(encoded: EncodedImage) -> None:
+    """출력 형식별 인코딩 용량 기록"""
+    stats = _encoding_stats.setdefault(encoded.image_format, {"count": 0, "total_bytes": 0})
+    stats["count"] += 1
+    stats["total_bytes"] += len(encoded.data)
+
+
+def get_image_encoding_stats() -> Dict[str, Dict]:
+    """출력 형식별 인코딩 횟수와 평균 용량 반환"""
+    return {
+        image_format: {
+            "count": stats["count"],
+            "total_bytes": stats["total_bytes"],
+            "avg_bytes": stats["total_bytes"] // stats["count"] if stats["count"] else 0,
+        }
+        for image_format, stats in _encoding_stats.items()
+    }
+
+
+def _is_cached_target(cached: Dict, s3_bucket: str, s3_key: str) -> bool:
+    """캐시된 이미지가 이미 배치된 대상인지 확인 (같은 대상을 다시 생성하는 요청)"""
+    target_key = with_image_extension(s3_key, cached.get("format", SOURCE_IMAGE_FORMAT))
+    return [s3_bucket, target_key] in cached.get("targets", [])
+
+
+async def _copy_cached_image(
+    cache_key: str,
+    cached: Dict,
+    s3_bucket: str,
+    s3_key: str
+) -> Optional["GeneratedImage"]:
+    """
+    캐시 원본(콘텐츠 주소 키)을 S3 서버 측 복사로 대상 키에 배치
+
+    대상 키의 확장자는 캐시된 이미지의 형식에 맞춰 조정되고, 파생 이미지도 함께 복사됩니다.
+    복사한 대상은 캐시 항목에 기록하여, 이후 같은 대상의 재생성 요청은 캐시를 쓰지 않게 합니다.
 
     Returns:
-        리사이즈된 이미지의 바이너리 데이터 (PNG)
+        복사 결과 (원본이 유효하지 않거나 복사 실패 시 None)
     """
-    if not PIL_AVAILABLE:
-        logger.warning("PIL이 설치되지 않아 리사이즈를 건너뜁니다.")
-        return image_bytes
+    source_bucket, source_key = cached["bucket"], cached["key"]
+    image_format = cached.get("format", SOURCE_IMAGE_FORMAT)
+    if source_key != get_cache_object_key(cache_key, image_format):
+        # 요청의 대상 키를 가리키던 이전 형식의 항목: 덮어쓰였을 수 있으므로 사용하지 않음
+        await _generated_image_cache.adelete(cache_key)
+        return None
+
+    target_key = with_image_extension(s3_key, image_format)
+    cached_image = GeneratedImage(
+        sanitized_prompt="",
+        cache_key=cache_key,
+        image_format=image_format,
+        s3_key=target_key,
+        size_bytes=cached.get("size_bytes"),
+        derivative_keys={
+            name: derivative_key(target_key, name) for name in cached.get("derivatives", {})
+        }
+    )
+
+    try:
+        copies = [(source_key, target_key)] + [
+            (cached["derivatives"][name], key) for name, key in cached_image.derivative_keys.items()
+        ]
+        urls = await asyncio.gather(*(
+            copy_object_in_s3(source_bucket, copy_source, s3_bucket, copy_target, content_type=cached_image.content_type)
+            for copy_source, copy_target in copies
+        ))
+        cached_image.image_url = urls[0]
+        cached_image.derivative_urls = dict(zip(cached_image.derivative_keys, urls[1:]))
+        targets = cached.get("targets", []) + [[s3_bucket, target_key]]
+        await _generated_image_cache.aset(cache_key, {**cached, "targets": targets[-MAX_CACHE_TARGETS:]})
+        logger.info(
+            f"생성 이미지 캐시 히트: s3://{source_bucket}/{source_key} -> s3://{s3_bucket}/{target_key} 복사 완료"
+            f" (파생 이미지 {len(cached_image.derivative_keys)}개)"
+        )
+        return cached_image
+    except Exception as e:
+        # 원본이 삭제되었거나 권한이 없는 경우: 캐시 항목 제거 후 새로 생성
+        logger.warning(f"캐시된 이미지 복사 실패, 새로 생성합니다: {e}")
+        await _generated_image_cache.adelete(cache_key)
+        return None
+
+
+def shutdown_generation_executor(wait: bool = True) -> None:
+    """이미지 생성 및 후처리 워커 풀 종료"""
+    _imagen_executor.shutdown(wait=wait)
+    if _postprocess_executor is not None:
+        _postprocess_executor.shutdown(wait=wait)
 
+
+async def start_postprocess_executor() -> None:
+    """후처리 프로세스 풀 워커를 미리 띄움 (첫 요청의 프로세스 생성 지연 방지)"""
+    if _postprocess_executor is None:
+        return
     try:
-        # 바이트 데이터를 이미지로 변환
-        img = Image.open(io.BytesIO(image_bytes))
-        original_size = img.size
+        await asyncio.gather(*(
+            _postprocess_executor.run(warm_up_worker)
+            for _ in range(_postprocess_executor.max_workers)
+        ))
+        logger.info(f"이미지 후처리 프로세스 풀 준비 완료: workers={_postprocess_executor.max_workers}")
+    except Exception as e:
+        logger.warning(f"이미지 후처리 프로세스 풀 워밍업 실패: {e}")
 
-        # 목표 크기로 리사이즈 (고품질 리샘플링)
-        img_resized = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
 
-        # PNG 형식으로 바이트 변환
-        output_buffer = io.BytesIO()
-        img_resized.save(output_buffer, format='PNG', optimize=True)
-        resized_bytes = output_buffer.getvalue()
+def get_postprocess_stats() -> Optional[Dict]:
+    """후처리 프로세스 풀 상태 반환 (비활성화 시 None)"""
+    return _postprocess_executor.stats() if _postprocess_executor is not None else None
 
-        logger.info(f"이미지 리사이즈 완료: {original_size} -> ({target_width}, {target_height})")
-        logger.info(f"   용량 변화: {len(image_bytes):,} bytes -> {len(resized_bytes):,} bytes")
 
-        return resized_bytes
+async def postprocess_image(
+    image_bytes: bytes,
+    target_width: int,
+    target_height: int,
+    image_format: str = SOURCE_IMAGE_FORMAT,
+    image_quality: Optional[int] = None,
+    derivatives: List[DerivativeSpec] = ()
+) -> EncodedImage:
+    """
+    이미지 후처리 (리사이즈/인코딩, 파생 이미지 생성)를 이벤트 루프 밖에서 실행
+
+    프로세스 풀이 비활성화(IMAGE_POSTPROCESS_WORKERS=0)되어 있으면 스레드에서 실행합니다.
+    후처리 실패/타임아웃 시 원본 이미지(PNG)를 그대로 반환합니다 (파생 이미지 없음).
+    """
+    args = (
+        image_bytes,
+        target_width,
+        target_height,
+        image_format,
+        image_quality,
+        tuple(derivatives),
+        config.IMAGE_ENCODE_LATENCY_BUDGET_MS
+    )
+    try:
+        if _postprocess_executor is None:
+            encoded = await asyncio.to_thread(process_image, *args)
+        else:
+            encoded = await _postprocess_executor.run(process_image, *args)
+    except asyncio.TimeoutError:
+        logger.warning(f"이미지 후처리 타임아웃: {config.IMAGE_POSTPROCESS_TIMEOUT_SECONDS}s, 원본 이미지를 사용합니다.")
+        encoded = EncodedImage(data=image_bytes, image_format=SOURCE_IMAGE_FORMAT)
     except Exception as e:
-        logger.warning(f"이미지 리사이즈 실패: {e}")
-        return image_bytes
+        # 워커 프로세스 비정상 종료(BrokenProcessPool) 등
+        logger.warning(f"이미지 후처리 실패, 원본 이미지를 사용합니다: {e}")
+        encoded = EncodedImage(data=image_bytes, image_format=SOURCE_IMAGE_FORMAT)
 
+    _record_encoding(encoded)
+    return encoded
 
-async def generate_image_with_api(enhanced_prompt: str) -> bytes:
+
+async def generate_image_with_api(
+    enhanced_prompt: str,
+    on_progress: Optional[ProgressCallback] = None
+) -> bytes:
     """
     이미지 생성 API를 사용하여 이미지 생성
 
     Args:
         enhanced_prompt: 개선된 프롬프트
+        on_progress: 단계별 진행 콜백 (image_generated, resized)
 
     Returns:
-        생성된 이미지의 바이너리 데이터 (bytes)
+        생성된 이미지의 바이너리 데이터 (bytes, config.IMAGE_OUTPUT_FORMAT 형식)
     """
+    image_format = resolve_output_format(config.IMAGE_OUTPUT_FORMAT)
+    encoded = await generate_encoded_image_with_api(
+        enhanced_prompt,
+        image_format=image_format,
+        image_quality=resolve_output_quality(image_format, None, config.IMAGE_OUTPUT_QUALITY),
+        on_progress=on_progress
+    )
+    return encoded.data
+
+
+async def generate_encoded_image_with_api(
+    enhanced_prompt: str,
+    image_format: str = SOURCE_IMAGE_FORMAT,
+    image_quality: Optional[int] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    derivatives: List[DerivativeSpec] = ()
+) -> EncodedImage:
+    """
+    이미지 생성 API를 사용하여 이미지 생성 후 출력 형식으로 인코딩
+
+    Args:
+        enhanced_prompt: 개선된 프롬프트
+        image_format: 출력 형식 (resolve_output_format으로 정규화된 값)
+        image_quality: 손실 압축 품질 (무손실 형식은 None)
+        on_progress: 단계별 진행 콜백 (image_generated, resized)
+        derivatives: 한 번의 디코딩으로 함께 만들 파생 이미지 규격
+
+    Returns:
+        인코딩된 이미지 (데이터와 실제 적용된 형식)
+    """
+    # 모든 호출 위치가 공유하는 Imagen 분당 할당량 (할당량 초과 시 속도를 낮춤)
+    rate_limiter = get_imagen_rate_limiter()
     try:
         logger.info(f"이미지 생성 시작: {enhanced_prompt[:50]}...")
 
         # Google Imagen API를 사용한 이미지 생성
         try:
-            from vertexai.preview.vision_models import ImageGenerationModel
-
-            # Imagen 4 Fast 모델 초기화 (더 빠른 생성 속도)
-            imagen_model = ImageGenerationModel.from_pretrained("imagen-4.0-fast-generate-001")
-
             logger.info("Imagen 4 Fast API로 이미지 생성 중...")
 
-            # 이미지 생성 (16:9 비율로 720p에 적합)
-            logger.debug(f"Imagen API 호출 파라미터: aspect_ratio=16:9, safety_filter=block_some, person_generation=allow_adult")
-            response = imagen_model.generate_images(
-                prompt=enhanced_prompt,
-                number_of_images=1,
-                aspect_ratio="16:9",
-                safety_filter_level="block_some",
-                person_generation="allow_adult",
-            )
+            # 이미지 생성 (16:9 비율로 720p에 적합) - 워커 풀에서 실행하여 이벤트 루프 비차단
+            logger.debug(f"Imagen API 호출 파라미터: {IMAGEN_GENERATION_PARAMS}")
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            response = await _imagen_executor.run(_generate_images_sync, enhanced_prompt)
+            if rate_limiter is not None:
+                rate_limiter.on_success()
 
             # 생성된 이미지(들) 가져오기
             logger.debug(f"Imagen API 응답 타입: {type(response)}")
@@ -158,16 +430,66 @@ async def generate_image_with_api(enhanced_prompt: str) -> bytes:
 
             logger.info("이미지 생성 성공")
             logger.info(f"원본 이미지 데이터 크기: {len(image_bytes)} bytes")
+            await emit_progress(on_progress, "image_generated", size_bytes=len(image_bytes))
 
-            # 720p로 리사이즈 (config에서 설정값 사용)
-            resized_image_bytes = resize_image_to_target(
+            # 720p로 리사이즈 및 출력 형식 인코딩 (config에서 설정값 사용) - 후처리 프로세스 풀에서 실행
+            encoded = await postprocess_image(
                 bytes(image_bytes),
                 config.IMAGE_WIDTH,
-                config.IMAGE_HEIGHT
+                config.IMAGE_HEIGHT,
+                image_format=image_format,
+                image_quality=image_quality,
+                derivatives=derivatives
+            )
+            await emit_progress(
+                on_progress,
+                "resized",
+                width=config.IMAGE_WIDTH,
+                height=config.IMAGE_HEIGHT,
+                image_format=encoded.image_format,
+                size_bytes=len(encoded.data),
+                derivatives={name: len(data) for name, data in encoded.derivatives.items()}
             )
 
-            return resized_image_bytes
+            return encoded
 
+        except HTTPException:
+            raise
+        except RateLimitExceededError as e:
+            logger.warning(f"Imagen 호출 한도 초과: {e} (Retry-After: {e.retry_after}s)")
+            raise HTTPException(
+                status_code=429,
+                detail={
+                    "code": "IMAGEN_RATE_LIMITED",
+                    "message": "이미지 생성 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                    "action": "RETRY",
+                    "provider": "imagen",
+                    "retry_after": e.retry_after,
+                },
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        except ExecutorQueueFullError as e:
+            logger.warning(f"이미지 생성 대기열 포화: {e}")
+            raise HTTPException(
+                status_code=503,
+                detail={
+                    "code": "IMAGEN_BUSY",
+                    "message": "이미지 생성 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                    "action": "RETRY",
+                    "provider": "imagen",
+                },
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Imagen API 호출 타임아웃: {config.IMAGEN_TIMEOUT_SECONDS}s")
+            raise HTTPException(
+                status_code=504,
+                detail={
+                    "code": "IMAGEN_TIMEOUT",
+                    "message": "이미지 생성 시간이 초과되었습니다. 사용자가 직접 이미지를 업로드해주세요.",
+                    "action": "UPLOAD_IMAGE",
+                    "provider": "imagen",
+                },
+            )
         except ImportError:
             logger.warning("Imagen API를 사용할 수 없습니다.")
             raise HTTPException(
@@ -184,8 +506,26 @@ async def generate_image_with_api(enhanced_prompt: str) -> bytes:
             logger.error(f"   예외 타입: {type(e).__name__}")
             logger.error(f"   예외 메시지: {str(e)}")
             logger.error(f"   프롬프트: {enhanced_prompt[:200]}")
-            logger.error(f"   요청 파라미터: aspect_ratio=16:9, safety_filter=block_some, person_generation=allow_adult")
-
+            logger.error(f"   요청 파라미터: {IMAGEN_GENERATION_PARAMS}")
+
+            if rate_limiter is not None and is_quota_exceeded_error(e):
+                rate_limiter.on_quota_exceeded()
+                retry_after = rate_limiter.retry_after()
+                logger.warning(
+                    f"Imagen 할당량 초과: 호출 속도 {rate_limiter.rate * 60:.1f}/min으로 낮춤 "
+                    f"(Retry-After: {retry_after}s)"
+                )
+                raise HTTPException(
+                    status_code=429,
+                    detail={
+                        "code": "IMAGEN_QUOTA_EXCEEDED",
+                        "message": "이미지 생성 할당량을 초과했습니다. 잠시 후 다시 시도해주세요.",
+                        "action": "RETRY",
+                        "provider": "imagen",
+                        "retry_after": retry_after,
+                    },
+                    headers={"Retry-After": str(retry_after)}
+                )
             if is_imagen_safety_block_error(e):
                 raise HTTPException(
                     status_code=422,
@@ -210,12 +550,211 @@ async def generate_image_with_api(enhanced_prompt: str) -> bytes:
         raise
 
 
-async def generate_and_upload_image(
+@dataclass
+class GeneratedImage:
+    """
+    생성 단계 결과 (업로드 전)
+
+    캐시 히트로 서버 측 복사가 끝난 경우 image_url이 채워지고 image_data는 None입니다.
+    s3_key는 출력 형식에 맞게 확장자가 조정된 실제 업로드 키이며,
+    파생 이미지는 {파생 이름: 데이터/키/URL}로 보관합니다.
+    """
+    sanitized_prompt: str
+    image_data: Optional[bytes] = None
+    cache_key: Optional[str] = None
+    image_url: Optional[str] = None
+    image_format: str = SOURCE_IMAGE_FORMAT
+    s3_key: Optional[str] = None
+    size_bytes: Optional[int] = None
+    derivative_data: Dict[str, bytes] = field(default_factory=dict)
+    derivative_keys: Dict[str, str] = field(default_factory=dict)
+    derivative_urls: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def content_type(self) -> str:
+        return get_content_type(self.image_format)
+
+
+async def generate_image_for_upload(
     enhanced_prompt: str,
     s3_url: Optional[str] = None,
     s3_bucket: Optional[str] = None,
-    s3_key: Optional[str] = None
+    s3_key: Optional[str] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    image_format: Optional[str] = None,
+    image_quality: Optional[int] = None,
+    derivatives: Optional[List[str]] = None,
+    use_cache: bool = True
+) -> GeneratedImage:
+    """
+    업로드 전 단계: 프롬프트 정제 -> 생성 이미지 캐시 확인 -> 이미지 생성
+
+    같은 정제 프롬프트로 이미 생성된 이미지가 있고 대상이 (s3_bucket, s3_key)이면
+    Imagen 호출 없이 S3 서버 측 복사(CopyObject)로 대체합니다.
+    캐시된 이미지가 이미 배치된 대상을 다시 생성하는 요청이나 use_cache=False이면 캐시를 쓰지 않고 새로 생성합니다.
+    업로드를 분리해 두어 배치 처리 시 업로드가 다음 생성과 겹쳐 진행될 수 있습니다.
+
+    image_format/image_quality를 지정하지 않으면 config.IMAGE_OUTPUT_FORMAT/IMAGE_OUTPUT_QUALITY를 사용합니다.
+    derivatives는 config.IMAGE_DERIVATIVES에 정의된 파생 이미지 이름 목록입니다.
+    """
+    logger.info(f"이미지 생성 시작: {enhanced_prompt[:50]}...")
+
+    # 출력 형식/파생 이미지 결정 (지원하지 않는 값이면 ValueError -> 400)
+    # presigned URL은 image/png로 서명되므로 PNG만 업로드 가능 (형식 미지정 시 서버 설정 대신 PNG 사용)
+    output_format = resolve_output_format(
+        image_format,
+        SOURCE_IMAGE_FORMAT if s3_url else config.IMAGE_OUTPUT_FORMAT
+    )
+    if s3_url and output_format != SOURCE_IMAGE_FORMAT:
+        raise ValueError(
+            "presigned URL 업로드는 PNG 형식만 지원됩니다. 다른 형식은 (s3_bucket, s3_key) 업로드로 요청해주세요."
+        )
+    output_quality = resolve_output_quality(output_format, image_quality, config.IMAGE_OUTPUT_QUALITY)
+    derivative_specs = resolve_derivatives(derivatives)
+    if derivative_specs and s3_url:
+        raise ValueError("파생 이미지는 presigned URL이 아닌 (s3_bucket, s3_key) 업로드에서만 지원됩니다.")
+
+    # 프롬프트 정제 (정책 우회 및 안전성 확보)
+    sanitized_prompt = await sanitize_prompt_for_imagen(enhanced_prompt)
+    logger.info("정제된 프롬프트로 이미지 생성 시도")
+    await emit_progress(on_progress, "sanitized", sanitized_prompt=sanitized_prompt)
+
+    # S3에 업로드 (필수) - 생성 비용을 쓰기 전에 확인
+    if not s3_url and not (s3_bucket and s3_key):
+        raise ValueError("S3 업로드 정보가 필요합니다. s3_url 또는 (s3_bucket, s3_key)를 제공해주세요.")
+
+    # 생성 이미지 캐시 확인 (presigned URL 대상은 서버 측 복사가 불가능하므로 제외)
+    cache_key = (
+        get_image_cache_key(sanitized_prompt, output_format, output_quality, derivative_specs)
+        if _generated_image_cache is not None and use_cache else None
+    )
+    if cache_key and not s3_url:
+        cached = await _generated_image_cache.aget(cache_key)
+        if cached and _is_cached_target(cached, s3_bucket, s3_key):
+            # 같은 대상을 다시 생성하는 요청: 새로 생성하고, 다른 대상용 캐시 원본은 그대로 둠
+            logger.info(f"같은 대상의 재생성 요청이므로 생성 이미지 캐시를 사용하지 않습니다: {s3_key}")
+            cache_key = None
+        elif cached:
+            cached_image = await _copy_cached_image(cache_key, cached, s3_bucket, s3_key)
+            if cached_image:
+                cached_image.sanitized_prompt = sanitized_prompt
+                await emit_progress(on_progress, "cache_hit", image_url=cached_image.image_url)
+                return cached_image
+
+    # 이미지 생성
+    encoded = await generate_encoded_image_with_api(
+        sanitized_prompt,
+        image_format=output_format,
+        image_quality=output_quality,
+        on_progress=on_progress,
+        derivatives=derivative_specs
+    )
+    logger.info(f"생성된 이미지 데이터 크기: {len(encoded.data)} bytes ({encoded.image_format})")
+
+    # 후처리 실패로 요청한 결과와 달라진 경우 캐시에 등록하지 않음
+    if encoded.image_format != output_format or len(encoded.derivatives) != len(derivative_specs):
+        cache_key = None
+
+    target_key = with_image_extension(s3_key, encoded.image_format) if s3_key else None
+    return GeneratedImage(
+        sanitized_prompt=sanitized_prompt,
+        image_data=encoded.data,
+        cache_key=cache_key,
+        image_format=encoded.image_format,
+        s3_key=target_key,
+        size_bytes=len(encoded.data),
+        derivative_data=encoded.derivatives,
+        derivative_keys={name: derivative_key(target_key, name) for name in encoded.derivatives} if target_key else {}
+    )
+
+
+async def upload_generated_image(
+    generated: GeneratedImage,
+    s3_url: Optional[str] = None,
+    s3_bucket: Optional[str] = None,
+    s3_key: Optional[str] = None,
+    on_progress: Optional[ProgressCallback] = None
 ) -> str:
+    """
+    업로드 단계: 생성된 이미지와 파생 이미지를 동시에 S3에 업로드하고 생성 이미지 캐시에 등록
+
+    버킷/키로 업로드하는 경우 generated.s3_key(형식에 맞게 확장자가 조정된 키)를 사용하며,
+    캐시 대상이면 같은 데이터를 캐시 원본 키(get_cache_object_key)에도 함께 업로드합니다.
+
+    Returns:
+        S3에 업로드된 이미지 URL (캐시 히트로 이미 복사된 경우 그 URL)
+    """
+    if generated.image_url:
+        return generated.image_url
+
+    target_key = generated.s3_key or s3_key
+    logger.info(f"S3 업로드 시작... (파생 이미지 {len(generated.derivative_keys)}개)")
+    uploads = [(generated.image_data, target_key)] + [
+        (generated.derivative_data[name], key) for name, key in generated.derivative_keys.items()
+    ]
+
+    # 버킷/키로 업로드한 경우에만 캐시 원본 저장 (서버 측 복사 원본으로 사용)
+    cache_object_key = None
+    cache_derivative_keys: Dict[str, str] = {}
+    if generated.cache_key and not s3_url:
+        cache_object_key = get_cache_object_key(generated.cache_key, generated.image_format)
+        cache_derivative_keys = {
+            name: derivative_key(cache_object_key, name) for name in generated.derivative_keys
+        }
+        uploads += [(generated.image_data, cache_object_key)] + [
+            (generated.derivative_data[name], key) for name, key in cache_derivative_keys.items()
+        ]
+
+    urls = await asyncio.gather(*(
+        upload_image_to_s3(
+            data,
+            s3_url=s3_url,
+            s3_bucket=s3_bucket,
+            s3_key=key,
+            content_type=generated.content_type
+        )
+        for data, key in uploads
+    ))
+    image_url = urls[0]
+    generated.derivative_urls = dict(zip(generated.derivative_keys, urls[1:1 + len(generated.derivative_keys)]))
+
+    if cache_object_key:
+        await _generated_image_cache.aset(
+            generated.cache_key,
+            {
+                "bucket": s3_bucket,
+                "key": cache_object_key,
+                "format": generated.image_format,
+                "size_bytes": generated.size_bytes,
+                "derivatives": cache_derivative_keys,
+                # 이 이미지가 배치된 대상 (같은 대상의 재생성 요청은 캐시를 쓰지 않음)
+                "targets": [[s3_bucket, target_key]],
+            }
+        )
+
+    generated.image_url = image_url
+    await emit_progress(
+        on_progress,
+        "uploaded",
+        image_url=image_url,
+        image_format=generated.image_format,
+        size_bytes=generated.size_bytes,
+        derivative_urls=generated.derivative_urls
+    )
+    return image_url
+
+
+async def generate_and_upload_image(
+    enhanced_prompt: str,
+    s3_url: Optional[str] = None,
+    s3_bucket: Optional[str] = None,
+    s3_key: Optional[str] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    image_format: Optional[str] = None,
+    image_quality: Optional[int] = None,
+    derivatives: Optional[List[str]] = None,
+    use_cache: bool = True
+) -> GeneratedImage:
     """
     이미지 생성 후 S3에 업로드
 
@@ -224,36 +763,37 @@ async def generate_and_upload_image(
         s3_url: S3 presigned URL (업로드용)
         s3_bucket: S3 버킷 (s3_url이 없을 경우)
         s3_key: S3 키/경로 (s3_url이 없을 경우)
+        on_progress: 단계별 진행 콜백 (sanitized, image_generated, resized, uploaded)
+        image_format: 출력 형식 (png, jpeg, webp, avif - 미지정 시 config.IMAGE_OUTPUT_FORMAT)
+        image_quality: 손실 압축 품질 (1-100, 미지정 시 설정값 또는 형식별 프리셋)
+        derivatives: 함께 만들 파생 이미지 이름 (config.IMAGE_DERIVATIVES에 정의된 것)
+        use_cache: 생성 이미지 캐시 사용 여부 (False면 항상 새로 생성하고 캐시에 등록하지 않음)
 
     Returns:
-        S3에 업로드된 이미지 URL
+        업로드 결과 (image_url, 실제 s3_key, 출력 형식, 용량, 파생 이미지 URL)
     """
     try:
-        logger.info(f"이미지 생성 시작: {enhanced_prompt[:50]}...")
-
-        # 프롬프트 정제 (정책 우회 및 안전성 확보)
-        sanitized_prompt = await sanitize_prompt_for_imagen(enhanced_prompt)
-        logger.info("정제된 프롬프트로 이미지 생성 시도")
-
-        # 이미지 생성
-        image_data = await generate_image_with_api(sanitized_prompt)
-
-        logger.info(f"생성된 이미지 데이터 크기: {len(image_data)} bytes")
-
-        # S3에 업로드 (필수)
-        if not s3_url and not (s3_bucket and s3_key):
-            raise ValueError("S3 업로드 정보가 필요합니다. s3_url 또는 (s3_bucket, s3_key)를 제공해주세요.")
-
-        logger.info("S3 업로드 시작...")
-        image_url = await upload_image_to_s3(
-            image_data,
+        generated = await generate_image_for_upload(
+            enhanced_prompt,
+            s3_url=s3_url,
+            s3_bucket=s3_bucket,
+            s3_key=s3_key,
+            on_progress=on_progress,
+            image_format=image_format,
+            image_quality=image_quality,
+            derivatives=derivatives,
+            use_cache=use_cache
+        )
+        image_url = await upload_generated_image(
+            generated,
             s3_url=s3_url,
             s3_bucket=s3_bucket,
-            s3_key=s3_key
+            s3_key=s3_key,
+            on_progress=on_progress
         )
 
         logger.info(f"이미지 생성 및 S3 업로드 완료: {image_url}")
-        return image_url
+        return generated
 
     except Exception as e:
         logger.error(f"이미지 생성/업로드 오류: {e}")
@@ -0,0 +1,151 @@
+"""
+작업 서비스 모듈
+비동기 모드 요청을 스토리별 대기열에 넣고 워커 풀에서 스토리 간 round-robin 순서로 처리
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Deque, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from config import config
+from logger import setup_logger
+from utils.request_tracker import mark_job_running, mark_job_finished
+
+logger = setup_logger()
+
+JobEntry = Tuple[str, Callable[[], Awaitable], asyncio.Future]
+
+# 스토리별 작업 대기열 (삽입 순서 = round-robin 순서, 서버 시작 시 생성)
+# 한 스토리가 많은 작업을 넣어도 워커는 스토리를 돌아가며 하나씩 꺼냄
+_job_queues: Optional["OrderedDict[str, Deque[JobEntry]]"] = None
+_queued_count = 0
+# 대기 중인 작업 수만큼 워커를 깨우는 신호
+_job_available: Optional[asyncio.Semaphore] = None
+_job_workers: List[asyncio.Task] = []
+
+
+class JobQueueFullError(RuntimeError):
+    """작업 대기열이 가득 찬 경우 발생"""
+
+
+def _pop_next_job() -> JobEntry:
+    """다음 차례 스토리의 가장 오래된 작업을 꺼내고, 남은 작업이 있으면 그 스토리를 맨 뒤로 보냄"""
+    global _queued_count
+    story_id, queue = next(iter(_job_queues.items()))
+    entry = queue.popleft()
+    if queue:
+        _job_queues.move_to_end(story_id)
+    else:
+        del _job_queues[story_id]
+    _queued_count -= 1
+    return entry
+
+
+async def _job_worker(worker_index: int):
+    """대기열에서 작업을 꺼내 처리하는 워커"""
+    while True:
+        await _job_available.acquire()
+        job_id, job_factory, done_future = _pop_next_job()
+        mark_job_running(job_id)
+        logger.info(f"[작업 시작] Job ID: {job_id} (worker={worker_index})")
+
+        try:
+            result = await job_factory()
+            payload = result.model_dump() if hasattr(result, "model_dump") else result
+            mark_job_finished(job_id, result=payload, status_code=200)
+            logger.info(f"[작업 완료] Job ID: {job_id}")
+        except HTTPException as e:
+            mark_job_finished(job_id, status_code=e.status_code, error=e.detail)
+            logger.error(f"[작업 실패] Job ID: {job_id} - {e.status_code}: {e.detail}")
+        except asyncio.CancelledError:
+            mark_job_finished(job_id, status_code=503, error="서버 종료로 작업이 취소되었습니다.")
+            raise
+        except Exception as e:
+            mark_job_finished(job_id, status_code=500, error=str(e))
+            logger.error(f"[작업 실패] Job ID: {job_id} - Exception: {e}", exc_info=True)
+        finally:
+            if not done_future.done():
+                done_future.set_result(None)
+
+
+async def start_job_workers():
+    """작업 대기열과 워커 풀 시작"""
+    global _job_queues, _job_available
+    if _job_queues is not None:
+        return
+
+    _job_queues = OrderedDict()
+    _job_available = asyncio.Semaphore(0)
+    for worker_index in range(max(1, config.JOB_WORKERS)):
+        _job_workers.append(asyncio.create_task(_job_worker(worker_index)))
+    logger.info(
+        f"작업 워커 시작: workers={config.JOB_WORKERS}, queue={config.JOB_QUEUE_SIZE}, "
+        f"queue_per_story={config.JOB_QUEUE_SIZE_PER_STORY}"
+    )
+
+
+async def stop_job_workers():
+    """작업 워커 풀 종료 (처리 중인 작업은 취소)"""
+    global _job_queues, _job_available, _queued_count
+    for worker in _job_workers:
+        worker.cancel()
+    await asyncio.gather(*_job_workers, return_exceptions=True)
+    _job_workers.clear()
+
+    # 시작되지 못한 작업은 실패로 기록
+    for queue in (_job_queues or {}).values():
+        for job_id, _job_factory, done_future in queue:
+            mark_job_finished(job_id, status_code=503, error="서버 종료로 작업이 취소되었습니다.")
+            if not done_future.done():
+                done_future.set_result(None)
+    _job_queues = None
+    _job_available = None
+    _queued_count = 0
+    logger.info("작업 워커 종료")
+
+
+def submit_job(job_id: str, job_factory: Callable[[], Awaitable], story_id: str = "") -> asyncio.Future:
+    """
+    작업을 스토리별 대기열에 추가
+
+    Args:
+        job_id: 작업 ID (request_tracker.create_job으로 생성)
+        job_factory: 실행할 코루틴을 만드는 함수
+        story_id: 소설 ID (같은 스토리의 작업끼리 대기열을 공유)
+
+    Returns:
+        작업이 끝나면 완료되는 Future (중복 요청 추적용)
+
+    Raises:
+        JobQueueFullError: 전체 또는 스토리별 대기열이 가득 찬 경우
+    """
+    global _queued_count
+    if _job_queues is None:
+        raise RuntimeError("작업 워커가 시작되지 않았습니다.")
+
+    if _queued_count >= max(1, config.JOB_QUEUE_SIZE):
+        raise JobQueueFullError(f"작업 대기열이 가득 찼습니다. (size={config.JOB_QUEUE_SIZE})")
+    queue = _job_queues.setdefault(story_id, deque())
+    if 0 < config.JOB_QUEUE_SIZE_PER_STORY <= len(queue):
+        raise JobQueueFullError(
+            f"스토리별 작업 대기열이 가득 찼습니다. (story_id={story_id}, size={config.JOB_QUEUE_SIZE_PER_STORY})"
+        )
+
+    done_future = asyncio.get_running_loop().create_future()
+    queue.append((job_id, job_factory, done_future))
+    _queued_count += 1
+    _job_available.release()
+    return done_future
+
+
+def get_job_queue_stats() -> dict:
+    """작업 대기열 상태 반환"""
+    return {
+        "workers": len(_job_workers),
+        "queued": _queued_count,
+        "queue_size": config.JOB_QUEUE_SIZE if _job_queues is not None else 0,
+        "queue_size_per_story": config.JOB_QUEUE_SIZE_PER_STORY,
+        "stories": {story_id: len(queue) for story_id, queue in (_job_queues or {}).items()},
+    }
@@ -3,7 +3,8 @@ S3 서비스 모듈
 AWS S3 파일 업로드/다운로드 기능
 """
 
-from typing import Optional
+import threading
+from typing import Optional, Tuple
 from datetime import datetime
 
 from fastapi import HTTPException
@@ -11,21 +12,99 @@ import httpx
 
 from config import config
 from logger import setup_logger
+from utils.bounded_executor import BoundedExecutor
+from utils.text_decoding import IncrementalTextDecoder, decode_text, get_charset
 
 logger = setup_logger()
 
 # boto3 import
 try:
     import boto3
+    from botocore.config import Config as BotoConfig
     from botocore.exceptions import ClientError, NoCredentialsError
     S3_AVAILABLE = True
 except ImportError:
     S3_AVAILABLE = False
     logger.warning("boto3가 설치되지 않았습니다. S3 기능을 사용할 수 없습니다.")
 
+# HTTP/2 지원 여부 (h2 패키지가 있을 때만 활성화)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 부분 다운로드 시 문자당 최대 바이트 수 (UTF-8 최대 4바이트) 와 스트리밍 청크 크기
+MAX_BYTES_PER_CHAR = 4
+DOWNLOAD_CHUNK_SIZE = 16 * 1024
+
+# presigned URL 전송용 공유 HTTP 클라이언트 (앱 수명 동안 유지, keep-alive 연결 재사용)
+_http_client: Optional[httpx.AsyncClient] = None
+
+# 프로세스 전역 S3 클라이언트 (boto3 클라이언트는 스레드 안전하므로 공유)
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+# boto3 동기 호출 전용 워커 풀 (연결 풀 크기만큼 동시에 실행)
+_s3_executor = BoundedExecutor(
+    name="s3",
+    max_workers=config.S3_MAX_POOL_CONNECTIONS,
+    queue_size=config.S3_IO_QUEUE_SIZE,
+    timeout=config.S3_IO_TIMEOUT_SECONDS
+)
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY_SECONDS
+        ),
+        timeout=httpx.Timeout(config.S3_DOWNLOAD_TIMEOUT_SECONDS, connect=config.HTTP_CONNECT_TIMEOUT_SECONDS)
+    )
+
+
+async def init_http_client():
+    """공유 HTTP 클라이언트 생성 (서버 시작 시)"""
+    global _http_client
+    if _http_client is None:
+        _http_client = _create_http_client()
+        logger.info(
+            f"공유 HTTP 클라이언트 생성 완료 (http2={HTTP2_AVAILABLE}, "
+            f"max_connections={config.HTTP_MAX_CONNECTIONS}, keepalive={config.HTTP_MAX_KEEPALIVE_CONNECTIONS})"
+        )
+
+
+async def close_http_client():
+    """공유 HTTP 클라이언트 종료 (서버 종료 시)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("공유 HTTP 클라이언트 종료")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """공유 HTTP 클라이언트 반환 (lifespan 밖에서 호출되면 지연 생성)"""
+    global _http_client
+    if _http_client is None:
+        _http_client = _create_http_client()
+    return _http_client
+
+
+def _operation_timeout(total_seconds: float) -> httpx.Timeout:
+    """작업별 타임아웃 (연결 타임아웃은 공통)"""
+    return httpx.Timeout(total_seconds, connect=config.HTTP_CONNECT_TIMEOUT_SECONDS)
+
 
 def get_s3_client():
-    """S3 클라이언트 생성 및 반환"""
+    """S3 클라이언트 반환 (최초 호출 시 한 번만 생성)"""
+    global _s3_client
+    if _s3_client is not None:
+        return _s3_client
+
     if not S3_AVAILABLE:
         raise HTTPException(
             status_code=503,
@@ -39,13 +118,21 @@ def get_s3_client():
         )
 
     try:
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
-            region_name=config.AWS_REGION
-        )
-        return s3_client
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client(
+                    's3',
+                    aws_access_key_id=config.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
+                    region_name=config.AWS_REGION,
+                    config=BotoConfig(
+                        max_pool_connections=config.S3_MAX_POOL_CONNECTIONS,
+                        retries={"max_attempts": 3, "mode": "standard"},
+                        tcp_keepalive=True
+                    )
+                )
+                logger.info(f"S3 클라이언트 생성 완료 (max_pool_connections={config.S3_MAX_POOL_CONNECTIONS})")
+        return _s3_client
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -53,10 +140,153 @@ def get_s3_client():
         )
 
 
+def init_s3_client():
+    """서버 시작 시 S3 클라이언트 미리 생성 (자격 증명이 없으면 건너뜀)"""
+    if not S3_AVAILABLE or not config.AWS_ACCESS_KEY_ID or not config.AWS_SECRET_ACCESS_KEY:
+        logger.info("S3 자격 증명이 없어 S3 클라이언트 사전 생성을 건너뜁니다.")
+        return
+    try:
+        get_s3_client()
+    except HTTPException as e:
+        logger.warning(f"S3 클라이언트 사전 생성 실패: {e.detail}")
+
+
+def shutdown_s3_executor(wait: bool = True):
+    """boto3 호출 워커 풀 종료"""
+    _s3_executor.shutdown(wait=wait)
+
+
+def _get_object_bytes(s3_bucket: str, s3_key: str, max_bytes: Optional[int] = None) -> bytes:
+    """객체 본문 다운로드 (워커 스레드에서 실행되는 동기 호출, max_bytes 지정 시 앞부분만 Range 요청)"""
+    params = {"Bucket": s3_bucket, "Key": s3_key}
+    if max_bytes:
+        params["Range"] = f"bytes=0-{max_bytes - 1}"
+    try:
+        response = get_s3_client().get_object(**params)
+    except ClientError as e:
+        # 빈 객체에 대한 Range 요청은 InvalidRange(416)로 실패하므로 빈 본문으로 처리
+        if max_bytes and _is_invalid_range_error(e):
+            return b""
+        raise
+    return response['Body'].read()
+
+
+def _is_invalid_range_error(error: Exception) -> bool:
+    """Range 요청이 객체 크기를 벗어난 경우인지 확인 (botocore ClientError, 빈 객체)"""
+    response = getattr(error, "response", None) or {}
+    return (
+        response.get("Error", {}).get("Code") == "InvalidRange"
+        or response.get("ResponseMetadata", {}).get("HTTPStatusCode") == 416
+    )
+
+
+def _get_object_if_changed(s3_bucket: str, s3_key: str, etag: Optional[str]) -> Optional[Tuple[bytes, str]]:
+    """ETag가 바뀐 경우에만 객체 본문 다운로드 (워커 스레드에서 실행되는 동기 호출)"""
+    params = {"Bucket": s3_bucket, "Key": s3_key}
+    if etag:
+        params["IfNoneMatch"] = etag
+    try:
+        response = get_s3_client().get_object(**params)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+            return None
+        raise
+    return response['Body'].read(), response.get('ETag', '')
+
+
+async def download_object_if_changed(
+    s3_bucket: str,
+    s3_key: str,
+    etag: Optional[str] = None
+) -> Optional[Tuple[bytes, str]]:
+    """
+    S3 객체가 바뀐 경우에만 다운로드 (조건부 GET, If-None-Match)
+
+    Returns:
+        (본문, 새 ETag) 또는 변경이 없으면 None
+    """
+    get_s3_client()  # 자격 증명 확인 (없으면 HTTPException)
+    return await _s3_executor.run(_get_object_if_changed, s3_bucket, s3_key, etag)
+
+
+def get_s3_object_url(s3_bucket: str, s3_key: str) -> str:
+    """버킷/키로 S3 객체 URL 생성"""
+    if s3_key.startswith('https://') or s3_key.startswith('http://'):
+        return s3_key
+    return f"https://{s3_bucket}.s3.{config.AWS_REGION}.amazonaws.com/{s3_key}"
+
+
+async def copy_object_in_s3(
+    source_bucket: str,
+    source_key: str,
+    dest_bucket: str,
+    dest_key: str,
+    content_type: str = "image/png"
+) -> str:
+    """
+    S3 서버 측 복사 (CopyObject) - 바이트를 내려받거나 다시 업로드하지 않음
+
+    Args:
+        source_bucket: 원본 버킷
+        source_key: 원본 키
+        dest_bucket: 대상 버킷
+        dest_key: 대상 키
+        content_type: 대상 객체의 MIME 타입
+
+    Returns:
+        복사된 객체의 URL
+    """
+    try:
+        s3_client = get_s3_client()
+        await _s3_executor.run(
+            s3_client.copy_object,
+            CopySource={"Bucket": source_bucket, "Key": source_key},
+            Bucket=dest_bucket,
+            Key=dest_key,
+            ContentType=content_type,
+            MetadataDirective="REPLACE"
+        )
+        return get_s3_object_url(dest_bucket, dest_key)
+    except Exception as e:
+        raise Exception(f"S3 복사 실패: {str(e)}")
+
+
+async def _stream_text_from_url(s3_url: str, max_chars: int) -> str:
+    """presigned URL에서 앞부분만 Range 요청으로 스트리밍하며 필요한 글자 수만큼 디코딩"""
+    max_bytes = max_chars * MAX_BYTES_PER_CHAR
+    client = get_http_client()
+    async with client.stream(
+        "GET",
+        s3_url,
+        headers={"Range": f"bytes=0-{max_bytes - 1}"},
+        timeout=_operation_timeout(config.S3_DOWNLOAD_TIMEOUT_SECONDS)
+    ) as response:
+        # 빈 객체에 대한 Range 요청은 416 (Range Not Satisfiable)
+        if response.status_code == 416:
+            logger.info("소설 텍스트 부분 다운로드: 빈 파일 (status=416)")
+            return ""
+        response.raise_for_status()
+        decoder = IncrementalTextDecoder(get_charset(response.headers.get('content-type')))
+        complete = True
+        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+            decoder.feed(chunk)
+            # Range를 무시하고 전체를 보내는 서버도 있으므로 필요한 만큼 받으면 중단
+            if decoder.chars >= max_chars or decoder.bytes_read >= max_bytes:
+                complete = False
+                break
+
+    # 206 응답의 끝은 원본의 끝이 아닐 수 있음 (잘린 멀티바이트 문자는 버림)
+    if response.status_code == 206 and decoder.bytes_read >= max_bytes:
+        complete = False
+    logger.info(f"소설 텍스트 부분 다운로드: {decoder.bytes_read:,} bytes ({decoder.encoding}, status={response.status_code})")
+    return decoder.finish(complete)[:max_chars]
+
+
 async def download_text_from_s3(
     s3_url: Optional[str] = None,
     s3_bucket: Optional[str] = None,
-    s3_key: Optional[str] = None
+    s3_key: Optional[str] = None,
+    max_chars: Optional[int] = None
 ) -> str:
     """
     S3에서 텍스트 파일을 다운로드
@@ -65,50 +295,40 @@ async def download_text_from_s3(
         s3_url: S3 presigned URL (다운로드용)
         s3_bucket: S3 버킷 이름 (s3_url이 없을 경우)
         s3_key: S3 키/경로 (s3_url이 없을 경우)
+        max_chars: 지정 시 앞에서부터 이 글자 수만큼만 다운로드 (HTTP Range / get_object Range)
 
     Returns:
-        다운로드한 텍스트 내용
+        다운로드한 텍스트 내용 (UTF-8 실패 시 cp949로 디코딩)
     """
     if s3_url:
         # Presigned URL을 사용한 다운로드
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(s3_url, timeout=30.0)
-                response.raise_for_status()
-
-                # 텍스트 인코딩 처리
-                content_type = response.headers.get('content-type', '')
-                if 'charset' in content_type:
-                    encoding = content_type.split('charset=')[1].split(';')[0].strip()
-                    try:
-                        text = response.content.decode(encoding)
-                    except:
-                        # 지정된 인코딩 실패 시 UTF-8 시도
-                        text = response.content.decode('utf-8', errors='ignore')
-                else:
-                    # 기본적으로 UTF-8 시도, 실패하면 cp949 시도
-                    try:
-                        text = response.content.decode('utf-8')
-                    except UnicodeDecodeError:
-                        text = response.content.decode('cp949', errors='ignore')
-
-                return text
+            if max_chars:
+                return await _stream_text_from_url(s3_url, max_chars)
+
+            client = get_http_client()
+            response = await client.get(s3_url, timeout=_operation_timeout(config.S3_DOWNLOAD_TIMEOUT_SECONDS))
+            response.raise_for_status()
+
+            # 텍스트 인코딩 처리 (charset 헤더 -> UTF-8 -> cp949)
+            return decode_text(response.content, get_charset(response.headers.get('content-type')))
         except Exception as e:
             raise Exception(f"S3 presigned URL 다운로드 실패: {str(e)}")
 
     elif s3_bucket and s3_key:
         # boto3를 사용한 직접 다운로드
         try:
-            s3_client = get_s3_client()
-            response = s3_client.get_object(Bucket=s3_bucket, Key=s3_key)
-
-            # 텍스트 인코딩 처리
-            content = response['Body'].read()
-            try:
-                text = content.decode('utf-8')
-            except UnicodeDecodeError:
-                text = content.decode('cp949', errors='ignore')
-
+            get_s3_client()  # 자격 증명 확인 (없으면 HTTPException)
+            max_bytes = max_chars * MAX_BYTES_PER_CHAR if max_chars else None
+            content = await _s3_executor.run(_get_object_bytes, s3_bucket, s3_key, max_bytes)
+
+            # 텍스트 인코딩 처리 (요청한 범위를 다 채웠으면 원본이 더 남아 있을 수 있음)
+            decoder = IncrementalTextDecoder()
+            decoder.feed(content)
+            text = decoder.finish(complete=not max_bytes or len(content) < max_bytes)
+            if max_chars:
+                logger.info(f"소설 텍스트 부분 다운로드: {len(content):,} bytes ({decoder.encoding})")
+                text = text[:max_chars]
             return text
         except Exception as e:
             raise Exception(f"S3 다운로드 실패: {str(e)}")
@@ -121,7 +341,8 @@ async def upload_image_to_s3(
     image_data: bytes,
     s3_url: Optional[str] = None,
     s3_bucket: Optional[str] = None,
-    s3_key: Optional[str] = None
+    s3_key: Optional[str] = None,
+    content_type: str = "image/png"
 ) -> str:
     """
     이미지를 S3에 업로드
@@ -131,6 +352,7 @@ async def upload_image_to_s3(
         s3_url: S3 presigned URL (이 경우 PUT 요청으로 업로드)
         s3_bucket: S3 버킷 이름 (s3_url이 없을 경우)
         s3_key: S3 키/경로 (s3_url이 없을 경우)
+        content_type: 이미지 Content-Type (presigned URL은 image/png로 서명되므로 호출부에서 PNG만 전달)
 
     Returns:
         업로드된 이미지의 URL
@@ -138,13 +360,14 @@ async def upload_image_to_s3(
     if s3_url:
         # Presigned URL을 사용한 업로드
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    s3_url,
-                    content=image_data,
-                    headers={"Content-Type": "image/png"}
-                )
-                response.raise_for_status()
+            client = get_http_client()
+            response = await client.put(
+                s3_url,
+                content=image_data,
+                headers={"Content-Type": content_type},
+                timeout=_operation_timeout(config.S3_UPLOAD_TIMEOUT_SECONDS)
+            )
+            response.raise_for_status()
 
             # Presigned URL에서 실제 URL 추출 (쿼리 파라미터 제거)
             actual_url = s3_url.split('?')[0]
@@ -156,18 +379,16 @@ async def upload_image_to_s3(
         # boto3를 사용한 직접 업로드
         try:
             s3_client = get_s3_client()
-            s3_client.put_object(
+            await _s3_executor.run(
+                s3_client.put_object,
                 Bucket=s3_bucket,
                 Key=s3_key,
                 Body=image_data,
-                ContentType='image/png'
+                ContentType=content_type
             )
 
             # S3 URL 생성
-            if s3_key.startswith('https://') or s3_key.startswith('http://'):
-                return s3_key
-            else:
-                return f"https://{s3_bucket}.s3.{config.AWS_REGION}.amazonaws.com/{s3_key}"
+            return get_s3_object_url(s3_bucket, s3_key)
         except Exception as e:
             raise Exception(f"S3 업로드 실패: {str(e)}")
 
@@ -176,9 +397,15 @@ async def upload_image_to_s3(
         if not s3_key:
             # 자동 키 생성
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            s3_key = f"generated-images/{timestamp}_{hash(str(image_data)) % 10000}.png"
-
-        return await upload_image_to_s3(image_data, s3_bucket=config.S3_BUCKET_NAME, s3_key=s3_key)
+            extension = content_type.split("/")[-1].replace("jpeg", "jpg")
+            s3_key = f"generated-images/{timestamp}_{hash(str(image_data)) % 10000}.{extension}"
+
+        return await upload_image_to_s3(
+            image_data,
+            s3_bucket=config.S3_BUCKET_NAME,
+            s3_key=s3_key,
+            content_type=content_type
+        )
 
     else:
         raise ValueError("S3 업로드를 위해 s3_url 또는 (s3_bucket, s3_key) 또는 S3_BUCKET_NAME 환경 변수가 필요합니다.")
@@ -204,23 +431,23 @@ async def upload_image_to_s3_presigned_url(
         logger.info(f"S3 presigned URL로 이미지 업로드 시작... ({len(image_bytes)} bytes)")
 
         # presigned URL로 PUT 요청
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                presigned_url,
-                content=image_bytes,
-                headers={
-                    "Content-Type": content_type,
-                    "Content-Length": str(len(image_bytes))
-                },
-                timeout=60.0
-            )
+        client = get_http_client()
+        response = await client.put(
+            presigned_url,
+            content=image_bytes,
+            headers={
+                "Content-Type": content_type,
+                "Content-Length": str(len(image_bytes))
+            },
+            timeout=_operation_timeout(config.S3_UPLOAD_TIMEOUT_SECONDS)
+        )
 
-            if response.status_code in [200, 204]:
-                logger.info(f"S3 업로드 성공: {response.status_code}")
-                return True
-            else:
-                logger.error(f"S3 업로드 실패: {response.status_code} - {response.text}")
-                return False
+        if response.status_code in [200, 204]:
+            logger.info(f"S3 업로드 성공: {response.status_code}")
+            return True
+        else:
+            logger.error(f"S3 업로드 실패: {response.status_code} - {response.text}")
+            return False
 
     except Exception as e:
         logger.error(f"S3 업로드 중 오류 발생: {str(e)}", exc_info=True)
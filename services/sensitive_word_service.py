@@ -0,0 +1,160 @@
+"""
+민감 단어 사전 서비스 모듈
+파일 또는 S3 객체에서 민감 단어 사전을 읽고, 변경되면 백그라운드에서 다시 컴파일해 교체
+"""
+
+import asyncio
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+from config import config
+from logger import setup_logger
+from services.s3_service import download_object_if_changed
+from utils.sensitive_filter import (
+    SensitiveWordMatcher,
+    get_sensitive_word_matcher,
+    set_sensitive_word_matcher,
+)
+
+logger = setup_logger()
+
+# 마지막으로 적용한 사전 버전 (파일: (mtime_ns, size), S3: ETag)
+_loaded_version = None
+
+# 백그라운드 재적재 작업 (서버 시작 시 생성)
+_reloader_task: Optional[asyncio.Task] = None
+
+# 재적재 통계
+_reload_stats = {"checks": 0, "reloads": 0, "failures": 0, "last_error": None, "last_checked_at": None}
+
+
+def _get_dictionary_source() -> Optional[str]:
+    """설정된 사전 위치 (없으면 None: 내장 사전 사용)"""
+    if config.SENSITIVE_WORDS_PATH:
+        return config.SENSITIVE_WORDS_PATH
+    if config.SENSITIVE_WORDS_S3_BUCKET and config.SENSITIVE_WORDS_S3_KEY:
+        return f"s3://{config.SENSITIVE_WORDS_S3_BUCKET}/{config.SENSITIVE_WORDS_S3_KEY}"
+    return None
+
+
+def parse_sensitive_words(content: bytes) -> Dict[str, str]:
+    """
+    사전 파일 파싱
+
+    형식: {"민감한 단어": "대체어", ...} (UTF-8 JSON 객체)
+
+    Raises:
+        ValueError: 형식이 올바르지 않은 경우
+    """
+    data = json.loads(content.decode("utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError("민감 단어 사전은 JSON 객체여야 합니다.")
+
+    replacements = {}
+    for word, safe_word in data.items():
+        if not isinstance(word, str) or not isinstance(safe_word, str) or not word.strip():
+            raise ValueError(f"잘못된 사전 항목: {word!r}: {safe_word!r}")
+        replacements[word.strip()] = safe_word
+    return replacements
+
+
+def _read_file_if_changed(path: str, version) -> Optional[tuple]:
+    """파일이 바뀐 경우에만 읽기 (워커 스레드에서 실행)"""
+    stat = os.stat(path)
+    file_version = (stat.st_mtime_ns, stat.st_size)
+    if file_version == version:
+        return None
+    with open(path, 'rb') as f:
+        return f.read(), file_version
+
+
+async def reload_sensitive_words(force: bool = False) -> bool:
+    """
+    사전이 바뀌었으면 다시 읽어 새 치환기를 만들고 교체
+
+    파싱/컴파일은 이벤트 루프 밖(워커 스레드)에서 수행합니다.
+    읽기나 파싱에 실패하면 기존 치환기를 유지합니다.
+
+    Returns:
+        치환기를 교체했으면 True
+    """
+    global _loaded_version
+    source = _get_dictionary_source()
+    if source is None:
+        return False
+
+    _reload_stats["checks"] += 1
+    _reload_stats["last_checked_at"] = datetime.now().isoformat()
+    version = None if force else _loaded_version
+
+    try:
+        if config.SENSITIVE_WORDS_PATH:
+            changed = await asyncio.to_thread(_read_file_if_changed, config.SENSITIVE_WORDS_PATH, version)
+        else:
+            changed = await download_object_if_changed(
+                config.SENSITIVE_WORDS_S3_BUCKET,
+                config.SENSITIVE_WORDS_S3_KEY,
+                version
+            )
+        if changed is None:
+            return False
+
+        content, new_version = changed
+        replacements = await asyncio.to_thread(parse_sensitive_words, content)
+        matcher = await asyncio.to_thread(SensitiveWordMatcher, replacements, source)
+    except Exception as e:
+        _reload_stats["failures"] += 1
+        _reload_stats["last_error"] = str(e)
+        logger.warning(f"민감 단어 사전 적재 실패 (기존 사전 유지): {source} - {e}")
+        return False
+
+    set_sensitive_word_matcher(matcher)
+    _loaded_version = new_version
+    _reload_stats["reloads"] += 1
+    _reload_stats["last_error"] = None
+    return True
+
+
+async def _reloader_loop(interval: float):
+    """주기적으로 사전 변경 확인"""
+    while True:
+        await asyncio.sleep(interval)
+        await reload_sensitive_words()
+
+
+async def start_sensitive_word_reloader():
+    """서버 시작 시 사전 적재 후 백그라운드 재적재 시작 (사전 위치가 설정된 경우)"""
+    global _reloader_task
+    if _get_dictionary_source() is None or _reloader_task is not None:
+        return
+
+    await reload_sensitive_words(force=True)
+    interval = config.SENSITIVE_WORDS_RELOAD_INTERVAL_SECONDS
+    if interval > 0:
+        _reloader_task = asyncio.create_task(_reloader_loop(interval))
+        logger.info(f"민감 단어 사전 재적재 시작: {_get_dictionary_source()} (interval={interval}s)")
+
+
+async def stop_sensitive_word_reloader():
+    """백그라운드 재적재 종료"""
+    global _reloader_task
+    if _reloader_task is None:
+        return
+    _reloader_task.cancel()
+    await asyncio.gather(_reloader_task, return_exceptions=True)
+    _reloader_task = None
+    logger.info("민감 단어 사전 재적재 종료")
+
+
+def get_sensitive_word_stats() -> dict:
+    """현재 사전과 재적재 상태 반환"""
+    matcher = get_sensitive_word_matcher()
+    return {
+        "source": matcher.source,
+        "entries": len(matcher),
+        "loaded_at": matcher.loaded_at,
+        "reloader_running": _reloader_task is not None,
+        **_reload_stats,
+    }
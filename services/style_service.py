@@ -3,43 +3,129 @@
 소설 스타일 분석, 저장, 로드 및 프롬프트 생성
 """
 
+import copy
+import hashlib
 import json
+import os
 from typing import Optional, Dict
 from pathlib import Path
 from datetime import datetime
 
+from fastapi import HTTPException
+
 from config import config
 from logger import setup_logger
-from services.gemini_service import get_model
+from services.gemini_service import generate_content_async
+from utils.rate_limiter import RateLimitExceededError
+from utils.ttl_cache import TTLCache
 
 logger = setup_logger()
 
+# 스타일 메모리 캐시 (구조: {story_id: ((mtime_ns, size), style_data)})
+_style_cache = TTLCache(name="novel_style", max_entries=config.STYLE_CACHE_MAX_ENTRIES)
+
+# 개선 프롬프트 캐시 (스타일 버전 + user_prompt + context_text 기준)
+_enhanced_prompt_cache = TTLCache(
+    name="enhanced_prompt",
+    max_entries=config.PROMPT_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.PROMPT_CACHE_TTL_SECONDS,
+    disk_dir=Path(config.PROMPT_CACHE_DIR) if config.PROMPT_CACHE_DIR else None,
+    disk_max_entries=config.PROMPT_CACHE_DISK_MAX_ENTRIES
+) if config.PROMPT_CACHE_ENABLED else None
+
 
 def get_style_file_path(story_id: str) -> Path:
     """스타일 파일 경로 반환"""
     return config.STYLES_DIR / f"{story_id}.json"
 
 
+def _get_file_version(style_file: Path):
+    """파일 버전 (mtime_ns, size) 반환 - 다른 프로세스의 변경 감지용"""
+    stat = style_file.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
 def save_novel_style(story_id: str, style_data: Dict):
-    """소설 스타일을 파일로 저장"""
+    """소설 스타일을 파일로 저장 (메모리 캐시에도 함께 기록)"""
     style_file = get_style_file_path(story_id)
     style_data['story_id'] = story_id
     style_data['updated_at'] = datetime.now().isoformat()
 
-    with open(style_file, 'w', encoding='utf-8') as f:
+    # 임시 파일에 쓴 뒤 교체하여 다른 프로세스가 쓰다 만 파일을 읽지 않도록 함
+    tmp_file = style_file.with_suffix(f".json.{os.getpid()}.tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
         json.dump(style_data, f, ensure_ascii=False, indent=2)
+    tmp_file.replace(style_file)
+
+    _style_cache.set(story_id, (_get_file_version(style_file), copy.deepcopy(style_data)))
 
     return style_file
 
 
 def load_novel_style(story_id: str) -> Optional[Dict]:
-    """소설 스타일 로드"""
+    """
+    소설 스타일 로드
+
+    메모리 캐시를 우선 사용하고, 파일의 mtime/크기가 바뀐 경우에만 다시 읽습니다.
+    반환값은 캐시와 분리된 사본입니다.
+    """
     style_file = get_style_file_path(story_id)
-    if not style_file.exists():
+    try:
+        file_version = _get_file_version(style_file)
+    except FileNotFoundError:
+        _style_cache.delete(story_id)
         return None
 
+    cached = _style_cache.get(story_id)
+    if cached and cached[0] == file_version:
+        return copy.deepcopy(cached[1])
+
     with open(style_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        style_data = json.load(f)
+
+    _style_cache.set(story_id, (file_version, style_data))
+    return copy.deepcopy(style_data)
+
+
+def delete_novel_style(story_id: str) -> bool:
+    """
+    소설 스타일 삭제 (파일 + 메모리 캐시)
+
+    Returns:
+        삭제 여부 (스타일 파일이 없으면 False)
+    """
+    _style_cache.delete(story_id)
+    style_file = get_style_file_path(story_id)
+    try:
+        style_file.unlink()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def get_style_cache_stats() -> Dict:
+    """스타일 메모리 캐시 통계 반환"""
+    return _style_cache.stats()
+
+
+# 스타일 분석에 사용하는 소설 앞부분 글자 수 (S3 부분 다운로드 범위도 이 값 기준)
+STYLE_ANALYSIS_SAMPLE_CHARS = 5000
+
+
+def _gemini_rate_limited(e: RateLimitExceededError) -> HTTPException:
+    """Gemini 호출 한도 초과를 429로 변환 (기본값/원본 프롬프트로 조용히 대체하지 않도록)"""
+    logger.warning(f"Gemini 호출 한도 초과: {e} (Retry-After: {e.retry_after}s)")
+    return HTTPException(
+        status_code=429,
+        detail={
+            "code": "GEMINI_RATE_LIMITED",
+            "message": "요청이 많아 프롬프트를 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            "action": "RETRY",
+            "provider": "gemini",
+            "retry_after": e.retry_after,
+        },
+        headers={"Retry-After": str(e.retry_after)}
+    )
 
 
 async def analyze_novel_style(novel_text: str, title: Optional[str] = None) -> Dict:
@@ -50,7 +136,7 @@ async def analyze_novel_style(novel_text: str, title: Optional[str] = None) -> D
         분석된 스타일 정보 (분위기, 시각적 스타일, 이미지 생성용 키워드 등)
     """
     # 소설 텍스트의 일부만 사용 (너무 길면 토큰 제한)
-    text_sample = novel_text[:5000] if len(novel_text) > 5000 else novel_text
+    text_sample = novel_text[:STYLE_ANALYSIS_SAMPLE_CHARS]
 
     prompt = f"""Analyze the style and atmosphere of the following novel for image generation purposes.
 
@@ -80,9 +166,8 @@ IMPORTANT for visual_keywords:
 Respond ONLY with valid JSON, no additional text or markdown."""
 
     try:
-        # Vertex AI GenerativeModel 사용
-        model_instance = get_model()
-        response = model_instance.generate_content(prompt)
+        # Vertex AI GenerativeModel 비동기 호출 (이벤트 루프 비차단)
+        response = await generate_content_async(prompt)
 
         # 응답 텍스트 추출
         if hasattr(response, 'text'):
@@ -108,6 +193,8 @@ Respond ONLY with valid JSON, no additional text or markdown."""
             style_data['visual_keywords'] = []
 
         return style_data
+    except RateLimitExceededError as e:
+        raise _gemini_rate_limited(e) from e
     except json.JSONDecodeError as e:
         logger.error(f"JSON 파싱 오류: {e}")
         logger.debug(f"응답 텍스트: {response_text[:200]}")
@@ -199,8 +286,7 @@ OUTPUT: Write ONLY the prompt. No explanations, no quotes.
 THUMBNAIL PROMPT:"""
 
     try:
-        model_instance = get_model()
-        response = model_instance.generate_content(prompt)
+        response = await generate_content_async(prompt)
 
         if hasattr(response, 'text'):
             thumbnail_prompt = response.text.strip()
@@ -216,12 +302,37 @@ THUMBNAIL PROMPT:"""
             thumbnail_prompt = thumbnail_prompt[1:-1]
 
         return thumbnail_prompt
+    except RateLimitExceededError as e:
+        raise _gemini_rate_limited(e) from e
     except Exception as e:
         logger.error(f"썸네일 프롬프트 생성 오류: {e}", exc_info=True)
         # 기본 프롬프트 반환
         return f"Book cover illustration for '{title or 'a novel'}', {novel_style.get('visual_style', 'realistic style')}, {novel_style.get('atmosphere', 'atmospheric')} mood, {novel_style.get('color_palette', 'natural colors')}, professional artwork, highly detailed, cinematic lighting, dramatic composition"
 
 
+def get_style_version(novel_style: Dict) -> str:
+    """스타일 버전 식별자 반환 (스타일이 다시 학습되면 updated_at이 바뀜)"""
+    return f"{novel_style.get('story_id', '')}@{novel_style.get('updated_at', '')}"
+
+
+def _get_enhanced_prompt_cache_key(
+    user_prompt: str,
+    novel_style: Dict,
+    context_text: Optional[str]
+) -> str:
+    """개선 프롬프트 캐시 키 생성"""
+    raw_key = json.dumps(
+        [get_style_version(novel_style), user_prompt, context_text or ""],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+
+def get_enhanced_prompt_cache_stats() -> Optional[Dict]:
+    """개선 프롬프트 캐시 통계 반환 (캐시 비활성화 시 None)"""
+    return _enhanced_prompt_cache.stats() if _enhanced_prompt_cache else None
+
+
 async def generate_enhanced_prompt(
     user_prompt: str,
     novel_style: Dict,
@@ -229,7 +340,17 @@ async def generate_enhanced_prompt(
 ) -> str:
     """
     사용자 프롬프트와 소설 스타일을 결합하여 최종 이미지 생성 프롬프트 생성
+
+    같은 스타일 버전 + user_prompt + context_text 조합은 캐시된 결과를 재사용하여 Gemini 호출을 생략합니다.
     """
+    cache_key = None
+    if _enhanced_prompt_cache is not None:
+        cache_key = _get_enhanced_prompt_cache_key(user_prompt, novel_style, context_text)
+        cached_prompt = await _enhanced_prompt_cache.aget(cache_key)
+        if cached_prompt:
+            logger.info("개선 프롬프트 캐시 히트 (Gemini 호출 생략)")
+            return cached_prompt
+
     # 스타일 정보에서 시각적 키워드 추출
     visual_keywords = novel_style.get('visual_keywords', [])
     visual_keywords_str = ", ".join(visual_keywords) if visual_keywords else ""
@@ -279,9 +400,8 @@ OUTPUT: Write ONLY the enhanced prompt. No explanations, no quotes, no prefixes.
 ENHANCED PROMPT:"""
 
     try:
-        # Vertex AI GenerativeModel 사용
-        model_instance = get_model()
-        response = model_instance.generate_content(prompt)
+        # Vertex AI GenerativeModel 비동기 호출 (이벤트 루프 비차단)
+        response = await generate_content_async(prompt)
 
         # 응답 텍스트 추출
         if hasattr(response, 'text'):
@@ -297,7 +417,13 @@ ENHANCED PROMPT:"""
         if enhanced_prompt.startswith("'") and enhanced_prompt.endswith("'"):
             enhanced_prompt = enhanced_prompt[1:-1]
 
+        # Gemini 응답이 정상일 때만 캐시 (오류 시 대체 프롬프트는 캐시하지 않음)
+        if cache_key and enhanced_prompt:
+            await _enhanced_prompt_cache.aset(cache_key, enhanced_prompt)
+
         return enhanced_prompt
+    except RateLimitExceededError as e:
+        raise _gemini_rate_limited(e) from e
     except Exception as e:
         logger.error(f"프롬프트 개선 오류: {e}", exc_info=True)
         # 오류 발생 시 사용자 프롬프트 그대로 반환
@@ -1,22 +1,53 @@
 """
 유틸리티 패키지
+
+하위 모듈은 처음 사용할 때 import합니다.
+(이미지 후처리 워커 프로세스가 utils.image_processing만 가볍게 import할 수 있도록)
 """
-from .sensitive_filter import (
-    SENSITIVE_WORD_REPLACEMENTS,
-    pre_filter_sensitive_words,
-    is_imagen_safety_block_error,
-)
-from .request_tracker import (
-    get_request_id,
-    cleanup_old_requests,
-    get_processing_requests,
-)
+import importlib
+
+# 공개 이름 -> 정의된 하위 모듈
+_EXPORTS = {
+    "SENSITIVE_WORD_REPLACEMENTS": "sensitive_filter",
+    "pre_filter_sensitive_words": "sensitive_filter",
+    "is_imagen_safety_block_error": "sensitive_filter",
+    "SensitiveWordMatcher": "sensitive_filter",
+    "get_sensitive_word_matcher": "sensitive_filter",
+    "set_sensitive_word_matcher": "sensitive_filter",
+    "get_request_id": "request_tracker",
+    "cleanup_old_requests": "request_tracker",
+    "get_processing_requests": "request_tracker",
+    "get_request_tracker_stats": "request_tracker",
+    "TrackedRequest": "request_tracker",
+    "claim_request": "request_tracker",
+    "release_claim": "request_tracker",
+    "RequestRegistry": "request_registry",
+    "MemoryRequestRegistry": "request_registry",
+    "SQLiteRequestRegistry": "request_registry",
+    "RedisRequestRegistry": "request_registry",
+    "create_request_registry": "request_registry",
+    "BoundedExecutor": "bounded_executor",
+    "ExecutorQueueFullError": "bounded_executor",
+    "TTLCache": "ttl_cache",
+    "AdmissionController": "admission_controller",
+    "AdmissionRejectedError": "admission_controller",
+    "AdaptiveTokenBucket": "rate_limiter",
+    "RateLimitExceededError": "rate_limiter",
+    "is_quota_exceeded_error": "rate_limiter",
+    "ProgressCallback": "progress",
+    "emit_progress": "progress",
+    "format_sse_event": "progress",
+    "IncrementalTextDecoder": "text_decoding",
+    "decode_text": "text_decoding",
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    "SENSITIVE_WORD_REPLACEMENTS",
-    "pre_filter_sensitive_words",
-    "is_imagen_safety_block_error",
-    "get_request_id",
-    "cleanup_old_requests",
-    "get_processing_requests",
-]
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
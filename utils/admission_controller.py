@@ -0,0 +1,279 @@
+"""
+요청 수락 제어 모듈
+동시에 처리하는 요청 수를 제한하고, 초과분은 키(스토리)별 대기열에서 공정한 순서로 기다리게 함
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional, Tuple
+
+
+class AdmissionRejectedError(RuntimeError):
+    """
+    요청을 수락할 수 없는 경우 발생
+
+    Attributes:
+        reason: "queue_full" (대기열 포화) 또는 "queue_timeout" (대기 시간 초과)
+        retry_after: 다시 시도할 때까지 권장 대기 시간 (초)
+    """
+
+    def __init__(self, message: str, reason: str, retry_after: int):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    동시 처리 수 제한 + 키(스토리)별 대기열 공정 스케줄링
+
+    - 처리 중인 요청이 max_concurrency 미만이고 대기자가 없으면 바로 수락
+    - 그 외에는 키별 대기열에서 기다림 (전체 max_queue개, 키당 max_queue_per_key개까지)
+    - 슬롯이 비면 대기 중인 키들을 가중 deficit round-robin으로 돌며 다음 대기자를 선택
+      (노드 200개짜리 스토리가 대기열을 채워도 다른 스토리의 요청이 다음 차례에 처리됨)
+    - queue_timeout 초과 또는 대기열 포화 시 거부
+    거부 시 최근 처리 시간(지수 이동 평균)과 앞선 대기 수로 Retry-After를 계산합니다.
+    """
+
+    # 처리 시간 이동 평균 가중치와 Retry-After 범위 (초)
+    SERVICE_TIME_SMOOTHING = 0.2
+    MIN_RETRY_AFTER = 1
+    MAX_RETRY_AFTER = 300
+
+    # 키별 통계를 보관할 최대 키 수 (오래 사용되지 않은 키부터 제거)
+    MAX_TRACKED_KEYS = 256
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: Optional[float] = None,
+        initial_service_seconds: float = 10.0,
+        max_queue_per_key: Optional[int] = None,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.max_queue_per_key = max_queue_per_key if max_queue_per_key and max_queue_per_key > 0 else self.max_queue
+        self.queue_timeout = queue_timeout if queue_timeout and queue_timeout > 0 else None
+        self.weights: Dict[str, float] = dict(weights or {})
+
+        self._in_flight = 0
+        # 키별 대기열: {key: deque[(waiter, 대기 시작 시각)]}, 대기자가 있는 키만 보관
+        self._queues: Dict[str, Deque[Tuple[asyncio.Future, float]]] = {}
+        # 순서를 돌 키 목록 (맨 앞이 현재 차례)과 키별 남은 처리 몫 (deficit)
+        self._active_keys: Deque[str] = deque()
+        self._deficits: Dict[str, float] = {}
+        self._waiting = 0
+        self._avg_service_seconds = initial_service_seconds
+
+        # 키별 통계: {key: {"admitted", "total_wait_seconds", "max_wait_seconds", "rejected"}}
+        self._key_stats: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    def _weight(self, key: str) -> float:
+        return max(0.01, self.weights.get(key, 1.0))
+
+    def _stats_for(self, key: str) -> Dict[str, float]:
+        stats = self._key_stats.get(key)
+        if stats is None:
+            stats = {"admitted": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0, "rejected": 0}
+            self._key_stats[key] = stats
+            while len(self._key_stats) > self.MAX_TRACKED_KEYS:
+                self._key_stats.popitem(last=False)
+        else:
+            self._key_stats.move_to_end(key)
+        return stats
+
+    def _record_admitted(self, key: str, waited: float) -> None:
+        self.admitted += 1
+        stats = self._stats_for(key)
+        stats["admitted"] += 1
+        stats["total_wait_seconds"] += waited
+        stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+
+    def _reject(self, key: str, message: str, reason: str) -> AdmissionRejectedError:
+        self._stats_for(key)["rejected"] += 1
+        if reason == "queue_full":
+            self.rejected_queue_full += 1
+        else:
+            self.rejected_timeout += 1
+        return AdmissionRejectedError(message, reason=reason, retry_after=self.retry_after(key))
+
+    def retry_after(self, key: Optional[str] = None) -> int:
+        """지금 대기열 끝에 선다면 순서가 올 때까지 예상 시간 (초)"""
+        # 공정 스케줄링에서는 같은 키의 대기자 수와 대기 중인 키 수가 순서를 결정
+        # (대기 중인 키마다 한 바퀴에 한 건씩 처리되므로, 같은 키 대기자 수만큼 바퀴를 기다림)
+        if key is not None and key in self._queues:
+            ahead = min(self._waiting + 1, (len(self._queues[key]) + 1) * len(self._queues))
+        else:
+            ahead = min(self._waiting, len(self._queues)) + 1
+        estimate = self._avg_service_seconds * ahead / self.max_concurrency
+        return int(min(self.MAX_RETRY_AFTER, max(self.MIN_RETRY_AFTER, math.ceil(estimate))))
+
+    async def acquire(self, key: str = "") -> None:
+        """
+        처리 슬롯 획득 (필요하면 키별 대기열에서 대기)
+
+        Args:
+            key: 공정 스케줄링 단위 (스토리 ID)
+
+        Raises:
+            AdmissionRejectedError: 대기열이 가득 찼거나 대기 시간이 초과된 경우
+        """
+        if self._in_flight < self.max_concurrency and not self._waiting:
+            self._in_flight += 1
+            self._record_admitted(key, 0.0)
+            return
+
+        queue = self._queues.get(key)
+        if self._waiting >= self.max_queue or (queue is not None and len(queue) >= self.max_queue_per_key):
+            raise self._reject(
+                key,
+                f"[{self.name}] 대기열이 가득 찼습니다. "
+                f"(in_flight={self._in_flight}, queued={self._waiting}, key_queued={len(queue) if queue else 0})",
+                reason="queue_full"
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        enqueued_at = time.monotonic()
+        if queue is None:
+            queue = self._queues[key] = deque()
+            self._active_keys.append(key)
+            self._deficits[key] = 0.0
+        queue.append((waiter, enqueued_at))
+        self._waiting += 1
+        self.queued += 1
+        try:
+            # wait_for와 달리 시간 초과 시 waiter를 취소하지 않으므로, 슬롯을 넘겨받았는지 직접 확인
+            await asyncio.wait({waiter}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 슬롯을 넘겨받은 직후 취소됨: 다음 대기자에게 넘김
+                self.release()
+            else:
+                self._discard_waiter(key, waiter)
+            raise
+
+        if not waiter.done():
+            self._discard_waiter(key, waiter)
+            raise self._reject(
+                key,
+                f"[{self.name}] 대기 시간이 초과되었습니다. (timeout={self.queue_timeout}s)",
+                reason="queue_timeout"
+            )
+        self._record_admitted(key, time.monotonic() - enqueued_at)
+
+    def _remove_key(self, key: str) -> None:
+        """대기자가 없는 키를 순서에서 제거"""
+        del self._queues[key]
+        del self._deficits[key]
+        self._active_keys.remove(key)
+
+    def _discard_waiter(self, key: str, waiter: asyncio.Future) -> None:
+        waiter.cancel()
+        queue = self._queues.get(key)
+        if queue is None:
+            return
+        for index, (queued_waiter, _) in enumerate(queue):
+            if queued_waiter is waiter:
+                del queue[index]
+                self._waiting -= 1
+                break
+        if not queue:
+            self._remove_key(key)
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """가중 deficit round-robin으로 다음 대기자 선택"""
+        while self._active_keys:
+            key = self._active_keys[0]
+            if self._deficits[key] < 1:
+                # 차례가 온 키에 가중치만큼 처리 몫 추가 (가중치 < 1이면 여러 바퀴에 한 번 처리)
+                self._deficits[key] += self._weight(key)
+                if self._deficits[key] < 1:
+                    self._active_keys.rotate(-1)
+                    continue
+
+            queue = self._queues[key]
+            waiter, _ = queue.popleft()
+            self._waiting -= 1
+            self._deficits[key] -= 1
+            if not queue:
+                self._remove_key(key)
+            elif self._deficits[key] < 1:
+                self._active_keys.rotate(-1)
+            return waiter
+        return None
+
+    def release(self, service_seconds: Optional[float] = None) -> None:
+        """
+        슬롯 반납 (대기자가 있으면 공정 순서상 다음 대기자에게 넘김)
+
+        Args:
+            service_seconds: 슬롯을 사용한 시간 (Retry-After 계산용 처리 시간 평균에 반영)
+        """
+        if service_seconds is not None:
+            self._avg_service_seconds += self.SERVICE_TIME_SMOOTHING * (service_seconds - self._avg_service_seconds)
+        waiter = self._next_waiter()
+        if waiter is not None:
+            waiter.set_result(None)
+        else:
+            self._in_flight -= 1
+
+    def attach(self, task: asyncio.Future) -> None:
+        """작업이 끝나면 슬롯을 반납하고 처리 시간을 기록 (acquire 성공 후 호출)"""
+        started_at = time.monotonic()
+
+        def on_done(_):
+            self.release(time.monotonic() - started_at)
+
+        task.add_done_callback(on_done)
+
+    def key_stats(self, limit: int = 20) -> Dict[str, dict]:
+        """키별 대기열 깊이와 대기 시간 (대기 중인 키 우선, 최근 사용 순으로 최대 limit개)"""
+        now = time.monotonic()
+        keys = sorted(self._queues, key=lambda k: len(self._queues[k]), reverse=True)
+        keys += [key for key in reversed(self._key_stats) if key not in self._queues]
+
+        result = {}
+        for key in keys[:limit]:
+            stats = self._key_stats.get(key) or self._stats_for(key)
+            queue = self._queues.get(key)
+            admitted = stats["admitted"]
+            result[key] = {
+                "queued": len(queue) if queue else 0,
+                "oldest_wait_seconds": round(now - queue[0][1], 3) if queue else 0.0,
+                "admitted": admitted,
+                "rejected": stats["rejected"],
+                "avg_wait_seconds": round(stats["total_wait_seconds"] / admitted, 3) if admitted else 0.0,
+                "max_wait_seconds": round(stats["max_wait_seconds"], 3),
+                "weight": self._weight(key),
+            }
+        return result
+
+    def stats(self) -> dict:
+        """수락 제어 상태 반환"""
+        return {
+            "name": self.name,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "max_queue_per_key": self.max_queue_per_key,
+            "queue_timeout_seconds": self.queue_timeout,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "waiting_keys": len(self._queues),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "avg_service_seconds": round(self._avg_service_seconds, 3),
+            "retry_after_seconds": self.retry_after(),
+        }
@@ -0,0 +1,164 @@
+"""
+제한 실행기 모듈
+동기(블로킹) 작업을 이벤트 루프 밖의 워커 풀에서 실행하되,
+대기열 길이와 호출별 타임아웃을 제한
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from logger import setup_logger
+
+logger = setup_logger()
+
+
+class ExecutorQueueFullError(RuntimeError):
+    """실행기의 워커와 대기열이 모두 가득 찬 경우 발생"""
+
+
+class BoundedExecutor:
+    """
+    워커 수와 대기열 길이가 제한된 실행기
+
+    동시에 실행 가능한 작업 수는 max_workers, 추가로 대기 가능한 작업 수는 queue_size입니다.
+    둘 다 가득 차면 기본적으로 ExecutorQueueFullError를 즉시 발생시켜 호출 측이 빠르게 거부할 수 있게 하고,
+    wait_when_full=True이면 자리가 날 때까지 호출 측을 대기시킵니다 (배압).
+
+    use_processes=True이면 스레드 대신 프로세스 풀을 사용합니다 (GIL에 묶이는 CPU 작업용).
+    이 경우 실행할 함수와 인자는 pickle 가능해야 하며, initializer는 각 워커 프로세스 시작 시 한 번 실행됩니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        queue_size: int = 0,
+        timeout: Optional[float] = None,
+        use_processes: bool = False,
+        start_method: str = "spawn",
+        wait_when_full: bool = False,
+        initializer: Optional[Callable[[], None]] = None
+    ):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.queue_size = max(0, queue_size)
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.use_processes = use_processes
+        self.start_method = start_method
+        self.wait_when_full = wait_when_full
+        self.initializer = initializer
+        self._executor: Optional[Executor] = None
+        # 워커에 제출되었지만 아직 끝나지 않은 작업 수 (실행 중 + 대기 중)
+        self._in_flight = 0
+        # wait_when_full 모드의 자리 세마포어 (이벤트 루프에서 지연 생성)
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def capacity(self) -> int:
+        """동시에 수용 가능한 최대 작업 수 (실행 + 대기)"""
+        return self.max_workers + self.queue_size
+
+    @property
+    def in_flight(self) -> int:
+        """현재 실행 중이거나 대기 중인 작업 수"""
+        return self._in_flight
+
+    def _create_executor(self) -> Executor:
+        if self.use_processes:
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=self.initializer
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=self.name
+        )
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._create_executor()
+            logger.info(
+                f"실행기 초기화 완료: {self.name} "
+                f"({'processes' if self.use_processes else 'threads'}={self.max_workers}, "
+                f"queue={self.queue_size}, timeout={self.timeout})"
+            )
+        return self._executor
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        워커 풀에서 함수를 실행하고 결과를 반환
+
+        Args:
+            func: 실행할 동기 함수
+            *args, **kwargs: 함수 인자
+            timeout: 호출 타임아웃 (초, 기본값: 생성 시 지정한 timeout)
+
+        Raises:
+            ExecutorQueueFullError: 워커와 대기열이 모두 가득 찬 경우 (wait_when_full=False)
+            asyncio.TimeoutError: 타임아웃 초과 시
+        """
+        if self.wait_when_full:
+            if self._slots is None:
+                self._slots = asyncio.Semaphore(self.capacity)
+            await self._slots.acquire()
+        elif self._in_flight >= self.capacity:
+            raise ExecutorQueueFullError(
+                f"{self.name} 실행기가 가득 찼습니다. (in_flight={self._in_flight}, capacity={self.capacity})"
+            )
+
+        loop = asyncio.get_running_loop()
+        try:
+            concurrent_future = self._get_executor().submit(partial(func, *args, **kwargs))
+        except Exception:
+            if self._slots is not None:
+                self._slots.release()
+            raise
+        self._in_flight += 1
+        # 워커에서 실제로 끝났을 때 슬롯 반환 (타임아웃으로 포기한 작업도 끝날 때까지 자리를 차지)
+        def on_done(_future) -> None:
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료된 경우 (서버 종료 중)
+                pass
+
+        concurrent_future.add_done_callback(on_done)
+
+        timeout = timeout if timeout is not None else self.timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(concurrent_future), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"{self.name} 작업 타임아웃: {timeout}s")
+            raise
+
+    def shutdown(self, wait: bool = True) -> None:
+        """실행기 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info(f"실행기 종료: {self.name}")
+
+    def stats(self) -> dict:
+        """실행기 상태 반환"""
+        return {
+            "name": self.name,
+            "kind": "process" if self.use_processes else "thread",
+            "workers": self.max_workers,
+            "capacity": self.capacity,
+            "in_flight": self._in_flight,
+        }
@@ -0,0 +1,371 @@
+"""
+이미지 후처리 모듈
+리사이즈/인코딩 등 CPU 연산 (프로세스 풀 워커에서도 가볍게 import되도록 의존성 최소화)
+"""
+
+import io
+import logging
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 메인 프로세스에서는 setup_logger()가 설정한 같은 로거를 사용하고,
+# 워커 프로세스는 logger 모듈(로그 파일 핸들러)을 import하지 않고 init_worker_logging으로 stderr에만 기록
+logger = logging.getLogger("ai-image")
+
+# PIL import (이미지 리사이즈용)
+try:
+    from PIL import Image, features
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# 출력 형식별 (PIL 형식 이름, Content-Type, 파일 확장자)
+IMAGE_FORMATS = {
+    "png": ("PNG", "image/png", "png"),
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+    "webp": ("WEBP", "image/webp", "webp"),
+    "avif": ("AVIF", "image/avif", "avif"),
+}
+
+# 형식 이름 별칭
+IMAGE_FORMAT_ALIASES = {"jpg": "jpeg"}
+
+# 형식별 기본 품질 프리셋 (손실 압축 형식만 해당, 720p 일러스트 기준)
+IMAGE_QUALITY_PRESETS = {
+    "jpeg": 85,
+    "webp": 80,
+    "avif": 60,
+}
+
+# 인코딩 강도 (빠름 -> 느림, 느릴수록 용량이 작음)
+ENCODE_EFFORTS = ("fast", "balanced", "max")
+
+# 형식/강도별 인코더 옵션 ("max"는 기존 동작과 같은 최대 압축)
+ENCODE_EFFORT_OPTIONS = {
+    "png": {"fast": {"compress_level": 1}, "balanced": {"compress_level": 6}, "max": {"optimize": True}},
+    "jpeg": {"fast": {}, "balanced": {"optimize": True}, "max": {"optimize": True, "progressive": True}},
+    "webp": {"fast": {"method": 0}, "balanced": {"method": 4}, "max": {"method": 6}},
+    "avif": {"fast": {"speed": 10}, "balanced": {"speed": 8}, "max": {"speed": 6}},
+}
+
+# 형식/강도별 예상 인코딩 시간 (ms / 메가픽셀, bench_resize.py로 측정한 값을 반올림)
+ENCODE_COST_MS_PER_MEGAPIXEL = {
+    "png": {"fast": 110, "balanced": 340, "max": 2300},
+    "jpeg": {"fast": 5, "balanced": 10, "max": 27},
+    "webp": {"fast": 25, "balanced": 130, "max": 280},
+    "avif": {"fast": 85, "balanced": 110, "max": 490},
+}
+
+# 축소 비율이 이 값 이상이면 reducing_gap으로 정수배 축소 후 LANCZOS 적용
+REDUCING_GAP_MIN_SCALE = 2.0
+RESIZE_REDUCING_GAP = 3.0
+
+# Image.reduce를 사용할 수 있는 모드
+REDUCIBLE_MODES = ("L", "LA", "RGB", "RGBA")
+
+# 인코더가 없는 형식(AVIF/WebP)을 요청했을 때 대체 형식
+FALLBACK_IMAGE_FORMAT = "webp"
+
+# Imagen 원본 이미지 형식 (후처리 실패 시 원본을 그대로 사용)
+SOURCE_IMAGE_FORMAT = "png"
+
+
+# 파생 이미지 규격: (이름, 너비, 높이)
+DerivativeSpec = Tuple[str, int, int]
+
+
+@dataclass
+class EncodedImage:
+    """후처리 결과 (인코딩된 데이터와 실제 적용된 형식, 이름별 파생 이미지)"""
+    data: bytes
+    image_format: str
+    derivatives: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def content_type(self) -> str:
+        return get_content_type(self.image_format)
+
+    @property
+    def extension(self) -> str:
+        return get_image_extension(self.image_format)
+
+
+def is_format_supported(image_format: str) -> bool:
+    """현재 환경의 PIL로 해당 형식을 인코딩할 수 있는지 확인"""
+    if image_format in ("webp", "avif"):
+        # 선택적 코덱: PIL 빌드에 포함된 경우에만 사용 가능
+        return PIL_AVAILABLE and bool(features.check(image_format))
+    return image_format in IMAGE_FORMATS
+
+
+def resolve_output_format(image_format: Optional[str], default_format: str = SOURCE_IMAGE_FORMAT) -> str:
+    """
+    요청/설정된 출력 형식을 정규화
+
+    인코더가 없는 환경이면 FALLBACK_IMAGE_FORMAT(그것도 없으면 PNG)으로 대체합니다.
+
+    Raises:
+        ValueError: 지원하지 않는 형식인 경우
+    """
+    name = (image_format or default_format or SOURCE_IMAGE_FORMAT).strip().lower()
+    name = IMAGE_FORMAT_ALIASES.get(name, name)
+    if name not in IMAGE_FORMATS:
+        raise ValueError(
+            f"지원하지 않는 이미지 형식입니다: {image_format} (지원: {', '.join(IMAGE_FORMATS)})"
+        )
+    if not is_format_supported(name):
+        fallback = FALLBACK_IMAGE_FORMAT if is_format_supported(FALLBACK_IMAGE_FORMAT) else SOURCE_IMAGE_FORMAT
+        logger.warning(f"{name} 인코더를 사용할 수 없어 {fallback}로 대체합니다.")
+        return fallback
+    return name
+
+
+def resolve_output_quality(image_format: str, quality: Optional[int], default_quality: int = 0) -> Optional[int]:
+    """출력 품질 결정 (요청값 -> 설정값 -> 형식별 프리셋 순서, 무손실 형식은 None)"""
+    if image_format not in IMAGE_QUALITY_PRESETS:
+        return None
+    value = quality or default_quality or IMAGE_QUALITY_PRESETS[image_format]
+    return max(1, min(100, int(value)))
+
+
+def get_content_type(image_format: str) -> str:
+    """출력 형식의 Content-Type 반환"""
+    return IMAGE_FORMATS[image_format][1]
+
+
+def get_image_extension(image_format: str) -> str:
+    """출력 형식의 파일 확장자 반환"""
+    return IMAGE_FORMATS[image_format][2]
+
+
+def with_image_extension(key: str, image_format: str) -> str:
+    """
+    S3 키의 이미지 확장자를 출력 형식에 맞게 교체
+
+    알려진 이미지 확장자(.png, .jpg 등)로 끝나는 키만 교체하고, 그 외 키는 그대로 둡니다.
+    """
+    stem, dot, extension = key.rpartition(".")
+    known_extensions = {ext for _pil, _ctype, ext in IMAGE_FORMATS.values()} | {"jpeg"}
+    if not dot or "/" in extension or extension.lower() not in known_extensions:
+        return key
+    return f"{stem}.{get_image_extension(image_format)}"
+
+
+def parse_derivative_specs(spec: str) -> List[DerivativeSpec]:
+    """
+    파생 이미지 설정 문자열 파싱
+
+    형식: "이름:너비x높이,이름:너비x높이" (예: "preview:640x360,thumb:320x180")
+    잘못된 항목은 경고 후 건너뜁니다.
+    """
+    specs: List[DerivativeSpec] = []
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            name, size = entry.split(":", 1)
+            width, height = (int(value) for value in size.lower().split("x", 1))
+            if not name.strip() or width <= 0 or height <= 0:
+                raise ValueError(entry)
+            specs.append((name.strip(), width, height))
+        except ValueError:
+            logger.warning(f"잘못된 파생 이미지 설정을 건너뜁니다: {entry}")
+    return specs
+
+
+def derivative_key(key: str, name: str) -> str:
+    """파생 이미지 S3 키 생성 ({원본 이름}_{파생 이름}.{확장자})"""
+    stem, dot, extension = key.rpartition(".")
+    if not dot or "/" in extension:
+        return f"{key}_{name}"
+    return f"{stem}_{name}.{extension}"
+
+
+def choose_encode_effort(image_format: str, width: int, height: int, budget_ms: Optional[float]) -> str:
+    """
+    지연 예산 안에서 가능한 가장 높은 인코딩 강도 선택
+
+    예산이 없으면(None/0) 최대 압축("max"), 어떤 강도도 예산 안에 들지 않으면 "fast"를 사용합니다.
+    """
+    if not budget_ms or budget_ms <= 0:
+        return "max"
+    megapixels = width * height / 1_000_000
+    costs = ENCODE_COST_MS_PER_MEGAPIXEL[image_format]
+    for effort in reversed(ENCODE_EFFORTS):
+        if costs[effort] * megapixels <= budget_ms:
+            return effort
+    return "fast"
+
+
+def plan_resize(source_size: Tuple[int, int], target_size: Tuple[int, int], mode: str = "RGB") -> str:
+    """
+    리사이즈 방법 결정
+
+    Returns:
+        "none": 이미 목표 크기
+        "reduce": 정수배 축소 (Image.reduce, 박스 필터)
+        "reducing_gap": 큰 축소 (정수배 축소 후 LANCZOS)
+        "lanczos": 일반 LANCZOS 리사이즈
+    """
+    (source_width, source_height), (width, height) = source_size, target_size
+    if (source_width, source_height) == (width, height):
+        return "none"
+    if (
+        mode in REDUCIBLE_MODES
+        and source_width % width == 0
+        and source_height % height == 0
+        and source_width // width == source_height // height
+    ):
+        return "reduce"
+    if min(source_width / width, source_height / height) >= REDUCING_GAP_MIN_SCALE:
+        return "reducing_gap"
+    return "lanczos"
+
+
+def _resize(img, width: int, height: int):
+    """plan_resize 결과에 따라 리사이즈"""
+    plan = plan_resize(img.size, (width, height), img.mode)
+    if plan == "none":
+        return img
+    if plan == "reduce":
+        return img.reduce(img.width // width)
+    if plan == "reducing_gap":
+        return img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=RESIZE_REDUCING_GAP)
+    return img.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def _encode_image(img, image_format: str, quality: Optional[int], budget_ms: Optional[float] = None) -> bytes:
+    """PIL 이미지를 지정 형식으로 인코딩 (지연 예산에 맞춰 인코딩 강도 선택)"""
+    pil_format = IMAGE_FORMATS[image_format][0]
+    options = dict(ENCODE_EFFORT_OPTIONS[image_format][choose_encode_effort(image_format, *img.size, budget_ms)])
+    if quality is not None:
+        options["quality"] = quality
+    output_buffer = io.BytesIO()
+
+    # JPEG는 알파 채널을 지원하지 않음
+    if image_format == "jpeg" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    img.save(output_buffer, format=pil_format, **options)
+
+    return output_buffer.getvalue()
+
+
+def process_image(
+    image_bytes: bytes,
+    target_width: int,
+    target_height: int,
+    image_format: str = SOURCE_IMAGE_FORMAT,
+    quality: Optional[int] = None,
+    derivatives: Sequence[DerivativeSpec] = (),
+    encode_budget_ms: Optional[float] = None
+) -> EncodedImage:
+    """
+    이미지를 목표 해상도로 리사이즈하고 출력 형식으로 인코딩
+
+    리사이즈는 plan_resize로 방법을 정합니다: 이미 목표 크기면 생략하고, 정수배면 Image.reduce,
+    큰 축소는 reducing_gap을 사용합니다. JPEG 원본은 draft 모드로 축소 디코딩합니다.
+    목표 크기와 형식이 원본과 같은 PNG는 다시 인코딩하지 않고 원본 바이트를 그대로 사용합니다.
+
+    파생 이미지는 원본을 한 번만 디코딩한 뒤, 큰 크기부터 차례로 이미 줄여 둔 중간 결과를
+    다시 줄여 만듭니다 (매번 원본에서 리사이즈하지 않음).
+
+    Args:
+        image_bytes: 원본 이미지 바이너리 데이터
+        target_width: 목표 너비
+        target_height: 목표 높이
+        image_format: 출력 형식 (resolve_output_format으로 정규화된 값)
+        quality: 손실 압축 품질 (1-100, 무손실 형식은 무시)
+        derivatives: 함께 만들 파생 이미지 규격 목록
+        encode_budget_ms: 이미지당 인코딩 지연 예산 (None이면 최대 압축)
+
+    Returns:
+        인코딩 결과 (PIL이 없거나 실패하면 원본 이미지와 원본 형식, 파생 이미지 없음)
+    """
+    if not PIL_AVAILABLE:
+        logger.warning("PIL이 설치되지 않아 리사이즈를 건너뜁니다.")
+        return EncodedImage(data=image_bytes, image_format=SOURCE_IMAGE_FORMAT)
+
+    try:
+        # 바이트 데이터를 이미지로 변환 (헤더만 읽음, 디코딩은 필요할 때)
+        img = Image.open(io.BytesIO(image_bytes))
+        original_size = img.size
+        source_format = img.format
+
+        # JPEG 원본은 목표 크기 이상을 유지하는 범위에서 축소 디코딩
+        if source_format == "JPEG":
+            img.draft("RGB", (target_width, target_height))
+
+        # 목표 크기로 리사이즈 (리사이즈 계획에 따라)
+        img_resized = _resize(img, target_width, target_height)
+
+        # 출력 형식으로 바이트 변환 (크기/형식이 같은 PNG는 재인코딩 생략)
+        if img_resized is img and image_format == "png" and source_format == "PNG":
+            encoded_bytes = image_bytes
+        else:
+            encoded_bytes = _encode_image(img_resized, image_format, quality, encode_budget_ms)
+
+        # 파생 이미지: 큰 것부터 만들고, 충분히 큰 가장 작은 중간 결과를 원본으로 사용
+        reduced_images = [img_resized]
+        derivative_bytes: Dict[str, bytes] = {}
+        for name, width, height in sorted(derivatives, key=lambda spec: spec[1] * spec[2], reverse=True):
+            source = next(
+                (reduced for reduced in reversed(reduced_images) if reduced.width >= width and reduced.height >= height),
+                img
+            )
+            derivative = _resize(source, width, height)
+            reduced_images.append(derivative)
+            derivative_bytes[name] = _encode_image(derivative, image_format, quality, encode_budget_ms)
+            logger.debug(f"파생 이미지 생성: {name} {source.size} -> ({width}, {height}), {len(derivative_bytes[name]):,} bytes")
+
+        logger.info(f"이미지 리사이즈 완료: {original_size} -> ({target_width}, {target_height})")
+        logger.info(
+            f"   용량 변화: {len(image_bytes):,} bytes -> {len(encoded_bytes):,} bytes "
+            f"({image_format}, quality={quality})"
+        )
+
+        return EncodedImage(data=encoded_bytes, image_format=image_format, derivatives=derivative_bytes)
+    except Exception as e:
+        logger.warning(f"이미지 리사이즈 실패: {e}")
+        return EncodedImage(data=image_bytes, image_format=SOURCE_IMAGE_FORMAT)
+
+
+def resize_image_to_target(image_bytes: bytes, target_width: int, target_height: int) -> bytes:
+    """
+    이미지를 목표 해상도로 리사이즈
+
+    Args:
+        image_bytes: 원본 이미지 바이너리 데이터
+        target_width: 목표 너비 (기본값: config.IMAGE_WIDTH)
+        target_height: 목표 높이 (기본값: config.IMAGE_HEIGHT)
+
+    Returns:
+        리사이즈된 이미지의 바이너리 데이터 (PNG)
+    """
+    return process_image(image_bytes, target_width, target_height).data
+
+
+def init_worker_logging() -> None:
+    """
+    후처리 워커 프로세스 로깅 초기화 (프로세스 풀 initializer)
+
+    여러 프로세스가 같은 로그 파일을 회전시키지 않도록, fork로 물려받은 파일 핸들러를 버리고
+    stderr 핸들러만 사용합니다 (메인 프로세스가 로그를 파일로 모으려면 stderr를 수집).
+    """
+    worker_logger = logging.getLogger("ai-image")
+    for handler in list(worker_logger.handlers):
+        worker_logger.removeHandler(handler)
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(
+        fmt='%(asctime)s - %(levelname)s - [postprocess-worker %(process)d] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    worker_logger.addHandler(handler)
+    worker_logger.setLevel(logging.INFO)
+    worker_logger.propagate = False
+
+
+def warm_up_worker() -> bool:
+    """후처리 워커 프로세스 워밍업 (모듈/PIL import만 수행)"""
+    return PIL_AVAILABLE
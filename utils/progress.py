@@ -0,0 +1,34 @@
+"""
+진행 상황 알림 모듈
+파이프라인 단계별 진행 이벤트 전달 및 SSE(Server-Sent Events) 포맷
+"""
+
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from logger import setup_logger
+
+logger = setup_logger()
+
+# 진행 콜백 타입: (단계 이름, 단계 데이터) -> None
+ProgressCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+async def emit_progress(on_progress: Optional[ProgressCallback], stage: str, **data: Any) -> None:
+    """
+    진행 이벤트 전달 (콜백이 없으면 무시)
+
+    콜백 오류가 파이프라인을 실패시키지 않도록 경고만 남깁니다.
+    """
+    if on_progress is None:
+        return
+    try:
+        await on_progress(stage, data)
+    except Exception as e:
+        logger.warning(f"진행 이벤트 전달 실패: stage={stage}, error={e}")
+
+
+def format_sse_event(event: str, data: Any) -> str:
+    """SSE 이벤트 문자열 생성"""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
@@ -0,0 +1,167 @@
+"""
+호출 속도 제한 모듈
+모델별 분당 할당량에 맞춰 호출을 고르게 분산하는 적응형 토큰 버킷
+"""
+
+import asyncio
+import math
+import time
+from typing import Optional
+
+
+class RateLimitExceededError(RuntimeError):
+    """
+    허용 대기 시간 안에 호출 차례가 오지 않는 경우 발생
+
+    Attributes:
+        retry_after: 다시 시도할 때까지 권장 대기 시간 (초)
+    """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# 할당량 초과로 판단하는 예외 클래스 이름 (google.api_core.exceptions)과 메시지
+QUOTA_ERROR_NAMES = ("ResourceExhausted", "TooManyRequests")
+QUOTA_ERROR_MARKERS = ("resource exhausted", "resource_exhausted", "quota exceeded", "rate limit")
+
+
+def is_quota_exceeded_error(error: Exception) -> bool:
+    """할당량 초과(429 / RESOURCE_EXHAUSTED) 오류인지 확인"""
+    if any(cls.__name__ in QUOTA_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    if getattr(error, "code", None) == 429:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in QUOTA_ERROR_MARKERS)
+
+
+class AdaptiveTokenBucket:
+    """
+    적응형 토큰 버킷
+
+    - 분당 rate_per_minute개 속도로 토큰이 차고, 최대 burst개까지 모아 둘 수 있음
+    - 토큰이 없으면 먼저 온 순서대로 차례를 예약하고 그 시각까지 대기
+      (예상 대기 시간이 max_wait를 넘으면 예약하지 않고 바로 RateLimitExceededError)
+    - 할당량 초과 오류가 나면 속도를 decrease_factor배로 낮추고 (최소 min_rate_ratio),
+      recovery_interval 동안 오류가 없으면 원래 속도의 recovery_step만큼씩 다시 올림
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_minute: float,
+        burst: int,
+        max_wait: Optional[float] = None,
+        min_rate_ratio: float = 0.1,
+        decrease_factor: float = 0.5,
+        recovery_step: float = 0.1,
+        recovery_interval: float = 10.0
+    ):
+        self.name = name
+        self.base_rate = max(rate_per_minute, 0.001) / 60.0
+        self.rate = self.base_rate
+        self.burst = max(1, burst)
+        self.max_wait = max_wait if max_wait and max_wait > 0 else None
+        self.min_rate = self.base_rate * min_rate_ratio
+        self.decrease_factor = decrease_factor
+        self.recovery_step = recovery_step
+        self.recovery_interval = recovery_interval
+
+        # 음수이면 이미 예약된 차례 수 (대기 중인 호출)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._last_decrease_at: Optional[float] = None
+        self._last_increase_at = self._updated_at
+
+        self.acquired = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.quota_errors = 0
+        self.total_wait_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _wait_seconds(self) -> float:
+        """지금 예약하면 기다려야 하는 시간 (_refill 후 호출)"""
+        return max(0.0, (1.0 - self._tokens) / self.rate)
+
+    async def acquire(self) -> None:
+        """
+        호출 차례 획득 (필요하면 대기)
+
+        Raises:
+            RateLimitExceededError: 예상 대기 시간이 max_wait를 넘는 경우
+        """
+        now = time.monotonic()
+        self._refill(now)
+        wait = self._wait_seconds()
+        if self.max_wait is not None and wait > self.max_wait:
+            self.rejected += 1
+            raise RateLimitExceededError(
+                f"[{self.name}] 호출 한도 초과: 예상 대기 {wait:.1f}s > {self.max_wait}s "
+                f"(rate={self.rate * 60:.1f}/min)",
+                retry_after=max(1, math.ceil(wait - self.max_wait))
+            )
+
+        self._tokens -= 1.0
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # 대기 중 취소(클라이언트 연결 끊김 등): 예약한 차례를 돌려줌
+                self._refill(time.monotonic())
+                self._tokens = min(float(self.burst), self._tokens + 1.0)
+                raise
+            self.delayed += 1
+            self.total_wait_seconds += wait
+        self.acquired += 1
+
+    def on_success(self) -> None:
+        """호출 성공 기록 (할당량 오류가 멈춘 뒤 속도를 단계적으로 회복)"""
+        if self.rate >= self.base_rate:
+            return
+        now = time.monotonic()
+        if now - (self._last_decrease_at or 0.0) < self.recovery_interval:
+            return
+        if now - self._last_increase_at < self.recovery_interval:
+            return
+        self._refill(now)
+        self.rate = min(self.base_rate, self.rate + self.base_rate * self.recovery_step)
+        self._last_increase_at = now
+
+    def on_quota_exceeded(self) -> None:
+        """할당량 초과 기록 (속도를 낮추고 모아 둔 토큰을 비움)"""
+        now = time.monotonic()
+        self.quota_errors += 1
+        # 같은 순간 몰린 호출들의 오류로 여러 번 낮추지 않도록, 지금 속도로 토큰 한 개가 찰 시간 안에는 한 번만 낮춤
+        if self._last_decrease_at is not None and now - self._last_decrease_at < 1.0 / self.rate:
+            return
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self._tokens = min(self._tokens, 0.0)
+        self._last_decrease_at = now
+
+    def retry_after(self) -> int:
+        """지금 호출하면 차례가 올 때까지 예상 시간 (초)"""
+        self._refill(time.monotonic())
+        return max(1, math.ceil(self._wait_seconds()))
+
+    def stats(self) -> dict:
+        """속도 제한 상태 반환"""
+        self._refill(time.monotonic())
+        return {
+            "name": self.name,
+            "base_rate_per_minute": round(self.base_rate * 60, 2),
+            "rate_per_minute": round(self.rate * 60, 2),
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "rejected": self.rejected,
+            "quota_errors": self.quota_errors,
+            "avg_wait_seconds": round(self.total_wait_seconds / self.delayed, 3) if self.delayed else 0.0,
+        }
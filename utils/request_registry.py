@@ -0,0 +1,269 @@
+"""
+요청 임대(lease) 저장소 모듈
+여러 워커/파드가 같은 요청을 동시에 처리하지 않도록 요청 ID별 임대를 공유 저장소에 기록
+
+백엔드:
+- memory: 프로세스 내 딕셔너리 (기본값, 단일 워커)
+- sqlite: 같은 호스트(또는 공유 볼륨)의 SQLite 파일
+- redis: Redis 호환 서버 (redis 패키지 필요)
+
+임대는 TTL이 지나면 만료되므로, 워커가 비정상 종료되어도 다른 워커가 다시 처리할 수 있습니다.
+처리 중인 요청은 하트비트(renew)로 임대를 연장합니다.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from logger import setup_logger
+
+logger = setup_logger()
+
+# redis import (선택 사항: redis 백엔드 사용 시에만 필요)
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis_asyncio = None
+    REDIS_AVAILABLE = False
+
+# 지원하는 백엔드 이름
+REQUEST_REGISTRY_BACKENDS = ("memory", "sqlite", "redis")
+
+
+class RequestRegistry:
+    """요청 임대 저장소 인터페이스"""
+
+    backend = "base"
+
+    async def acquire(self, request_id: str, owner: str, ttl: float) -> bool:
+        """임대 획득 (다른 소유자의 유효한 임대가 있으면 False)"""
+        raise NotImplementedError
+
+    async def renew(self, leases: Dict[str, str], ttl: float) -> List[str]:
+        """
+        임대 연장
+
+        Args:
+            leases: {request_id: owner}
+
+        Returns:
+            연장하지 못한 (이미 만료되었거나 다른 소유자에게 넘어간) request_id 목록
+        """
+        raise NotImplementedError
+
+    async def release(self, request_id: str, owner: str) -> None:
+        """임대 반납 (소유자가 같을 때만)"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """연결 정리"""
+
+    def stats(self) -> dict:
+        return {"backend": self.backend}
+
+
+class MemoryRequestRegistry(RequestRegistry):
+    """프로세스 내 임대 저장소 (단일 워커 또는 테스트용)"""
+
+    backend = "memory"
+
+    def __init__(self):
+        # {request_id: (owner, 만료 시각(monotonic))}
+        self._leases: Dict[str, Tuple[str, float]] = {}
+
+    async def acquire(self, request_id: str, owner: str, ttl: float) -> bool:
+        now = time.monotonic()
+        lease = self._leases.get(request_id)
+        if lease is not None and lease[1] > now and lease[0] != owner:
+            return False
+        self._leases[request_id] = (owner, now + ttl)
+        return True
+
+    async def renew(self, leases: Dict[str, str], ttl: float) -> List[str]:
+        now = time.monotonic()
+        lost = []
+        for request_id, owner in leases.items():
+            lease = self._leases.get(request_id)
+            if lease is None or lease[0] != owner or lease[1] <= now:
+                lost.append(request_id)
+            else:
+                self._leases[request_id] = (owner, now + ttl)
+
+        # 만료된 임대 정리
+        for request_id in [rid for rid, (_, expires_at) in self._leases.items() if expires_at <= now]:
+            del self._leases[request_id]
+        return lost
+
+    async def release(self, request_id: str, owner: str) -> None:
+        lease = self._leases.get(request_id)
+        if lease is not None and lease[0] == owner:
+            del self._leases[request_id]
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "leases": len(self._leases)}
+
+
+class SQLiteRequestRegistry(RequestRegistry):
+    """
+    SQLite 파일 기반 임대 저장소
+
+    같은 파일을 여는 모든 워커 프로세스가 임대를 공유합니다.
+    만료 시각은 프로세스 간에 비교해야 하므로 벽시계 시간(time.time)을 사용합니다.
+    SQLite 호출은 블로킹이므로 워커 스레드에서 실행합니다.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS request_leases ("
+            "request_id TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _acquire(self, request_id: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO request_leases (request_id, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(request_id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE request_leases.expires_at <= ? OR request_leases.owner = excluded.owner",
+                (request_id, owner, now + ttl, now)
+            )
+            return cursor.rowcount == 1
+
+    def _renew(self, leases: Dict[str, str], ttl: float) -> List[str]:
+        now = time.time()
+        lost = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for request_id, owner in leases.items():
+                    cursor = self._conn.execute(
+                        "UPDATE request_leases SET expires_at = ? "
+                        "WHERE request_id = ? AND owner = ? AND expires_at > ?",
+                        (now + ttl, request_id, owner, now)
+                    )
+                    if cursor.rowcount != 1:
+                        lost.append(request_id)
+                # 만료된 임대 정리 (비정상 종료된 워커가 남긴 행)
+                self._conn.execute("DELETE FROM request_leases WHERE expires_at <= ?", (now,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return lost
+
+    def _release(self, request_id: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM request_leases WHERE request_id = ? AND owner = ?",
+                (request_id, owner)
+            )
+
+    async def acquire(self, request_id: str, owner: str, ttl: float) -> bool:
+        return await asyncio.to_thread(self._acquire, request_id, owner, ttl)
+
+    async def renew(self, leases: Dict[str, str], ttl: float) -> List[str]:
+        return await asyncio.to_thread(self._renew, leases, ttl)
+
+    async def release(self, request_id: str, owner: str) -> None:
+        await asyncio.to_thread(self._release, request_id, owner)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "path": self.path}
+
+
+class RedisRequestRegistry(RequestRegistry):
+    """
+    Redis 호환 서버 기반 임대 저장소
+
+    획득/연장/반납 모두 소유자를 확인하는 Lua 스크립트로 원자적으로 처리합니다.
+    client를 넘기면 해당 클라이언트(테스트용 대체 구현 포함)를 사용합니다.
+    """
+
+    backend = "redis"
+
+    # 비어 있거나 같은 소유자일 때만 획득 (다른 백엔드와 같이 같은 소유자의 재획득 허용)
+    ACQUIRE_SCRIPT = (
+        "local current = redis.call('get', KEYS[1]) "
+        "if current == false or current == ARGV[1] then "
+        "redis.call('set', KEYS[1], ARGV[1], 'PX', ARGV[2]) return 1 else return 0 end"
+    )
+    # 소유자가 같을 때만 만료 시간 연장 / 삭제
+    RENEW_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('pexpire', KEYS[1], ARGV[2]) else return 0 end"
+    )
+    RELEASE_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('del', KEYS[1]) else return 0 end"
+    )
+
+    def __init__(self, url: Optional[str] = None, client=None, key_prefix: str = "ai-image:request:"):
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise ImportError("redis 패키지를 설치해주세요: pip install redis")
+            client = redis_asyncio.from_url(url, decode_responses=True)
+        self.url = url
+        self.key_prefix = key_prefix
+        self._client = client
+        self._acquire_script = client.register_script(self.ACQUIRE_SCRIPT)
+        self._renew_script = client.register_script(self.RENEW_SCRIPT)
+        self._release_script = client.register_script(self.RELEASE_SCRIPT)
+
+    def _key(self, request_id: str) -> str:
+        return f"{self.key_prefix}{request_id}"
+
+    async def acquire(self, request_id: str, owner: str, ttl: float) -> bool:
+        return bool(await self._acquire_script(keys=[self._key(request_id)], args=[owner, int(ttl * 1000)]))
+
+    async def renew(self, leases: Dict[str, str], ttl: float) -> List[str]:
+        request_ids = list(leases)
+        results = await asyncio.gather(*[
+            self._renew_script(keys=[self._key(request_id)], args=[leases[request_id], int(ttl * 1000)])
+            for request_id in request_ids
+        ])
+        return [request_id for request_id, renewed in zip(request_ids, results) if not renewed]
+
+    async def release(self, request_id: str, owner: str) -> None:
+        await self._release_script(keys=[self._key(request_id)], args=[owner])
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "key_prefix": self.key_prefix}
+
+
+def create_request_registry(
+    backend: str,
+    sqlite_path: Optional[str] = None,
+    redis_url: Optional[str] = None
+) -> RequestRegistry:
+    """
+    설정 값으로 임대 저장소 생성
+
+    Raises:
+        ValueError: 지원하지 않는 백엔드인 경우
+    """
+    backend = (backend or "memory").lower()
+    if backend == "memory":
+        return MemoryRequestRegistry()
+    if backend == "sqlite":
+        return SQLiteRequestRegistry(sqlite_path)
+    if backend == "redis":
+        return RedisRequestRegistry(redis_url)
+    raise ValueError(
+        f"지원하지 않는 요청 저장소입니다: {backend} (사용 가능: {', '.join(REQUEST_REGISTRY_BACKENDS)})"
+    )
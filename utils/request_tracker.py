@@ -3,23 +3,112 @@
 동일한 요청이 동시에 처리되는 것을 방지
 """
 
+import asyncio
 import hashlib
+import heapq
+import itertools
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from logger import setup_logger
+from utils.request_registry import MemoryRequestRegistry, RequestRegistry
+from utils.ttl_cache import TTLCache
 
 logger = setup_logger()
 
+
+@dataclass(slots=True)
+class TrackedRequest:
+    """
+    진행 중인 요청 기록 (task: asyncio.Task 또는 Future)
+
+    kind/fingerprint는 합류(join_request) 가능 여부 확인용입니다.
+    request_id는 story_id + s3_key만으로 만들어지므로, 엔드포인트와 요청 본문이 같을 때만 같은 결과를 공유합니다.
+    """
+    task: Any
+    timestamp: datetime
+    s3_key: Optional[str]
+    story_id: str
+    sequence: int
+    lease_owner: Optional[str] = None
+    job_id: Optional[str] = None
+    kind: Optional[str] = None
+    fingerprint: Optional[str] = None
+
+    def is_processing(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+
 # 진행 중인 요청 추적 (중복 방지용)
-# 구조: {request_id: {"task": asyncio.Task, "timestamp": datetime, "s3_key": str}}
-_processing_requests: Dict[str, Dict] = {}
+# 구조: {request_id: TrackedRequest}
+# 작업이 끝나면 완료 콜백에서 바로 제거되고, 끝나지 않은 요청은 만료 힙으로 정리됩니다.
+_processing_requests: Dict[str, TrackedRequest] = {}
+
+# 비동기 작업(job) 상태 추적
+# 구조: {job_id: {"job_id", "request_id", "story_id", "s3_key", "status", "created_at",
+#                 "started_at", "finished_at", "result", "status_code", "error"}}
+_jobs: Dict[str, Dict] = {}
+
+# 작업 상태 값
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
 
 # 요청 정리 주기 (초) - 오래된 완료된 요청 자동 정리
 CLEANUP_INTERVAL = 300  # 5분
 
+# 완료된 작업 보관 시간 (초) - 이후 상태 조회 불가
+JOB_RETENTION_SECONDS = 3600  # 1시간
+
+# 만료 힙: (만료 시각(monotonic), 순번, 키)
+# 등록/완료 시 O(log n)으로 추가하고, 만료 시각이 지난 앞부분만 꺼내 정리합니다.
+# 이미 제거되었거나 다시 등록된 항목은 꺼낼 때 순번으로 확인 후 건너뜁니다.
+_request_expiry: List[Tuple[float, int, str]] = []
+_job_expiry: List[Tuple[float, int, str]] = []
+_expiry_sequence = itertools.count()
+
+# 백그라운드 만료 처리 작업 (서버 시작 시 생성)
+_expiry_task: Optional[asyncio.Task] = None
+
+# 힙 맨 앞이 바뀌면 만료 처리 작업을 깨워 대기 시간을 다시 계산하게 하는 신호
+# (요청 만료 간격이 작업 보관 시간보다 짧아 새 항목이 기존 대기 시각보다 먼저 만료될 수 있음)
+_expiry_wakeup: Optional[asyncio.Event] = None
+
+# 여러 워커/파드 간 중복 방지용 임대 저장소 (서버 시작 시 설정에 따라 교체)
+_registry: RequestRegistry = MemoryRequestRegistry()
+
+# 이 프로세스가 보유한 임대 {request_id: owner}
+_held_leases: Dict[str, str] = {}
 
-def get_processing_requests() -> Dict[str, Dict]:
+# 임대 유지 시간과 하트비트(연장) 주기 (초)
+_lease_ttl = 60.0
+_heartbeat_interval = 20.0
+
+# 백그라운드 하트비트 작업과 진행 중인 임대 반납 작업
+_heartbeat_task: Optional[asyncio.Task] = None
+_lease_release_tasks: Set[asyncio.Task] = set()
+
+# 임대 소유자 ID 접두사 (호스트:프로세스)
+_owner_prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+# 임대 통계
+_lease_stats = {"acquired": 0, "rejected": 0, "lost": 0, "errors": 0}
+
+# 처리 중인 동일 요청에 합류한 횟수 (single-flight)
+_coalesced_count = 0
+
+# 최근 완료된 요청의 응답 (재시도 시 재처리 없이 같은 응답 반환, None이면 비활성화)
+# 구조: {replay_key: {"fingerprint": 요청 본문 해시, "response": 응답 JSON}}
+_completed_results: Optional[TTLCache] = TTLCache(name="completed_request", max_entries=1024, ttl_seconds=600)
+
+
+def get_processing_requests() -> Dict[str, TrackedRequest]:
     """현재 처리 중인 요청 딕셔너리 반환"""
     return _processing_requests
 
@@ -55,49 +144,395 @@ def get_request_id(
     return hashlib.md5(key.encode()).hexdigest()[:16]
 
 
-def cleanup_old_requests():
-    """완료된 오래된 요청 정리"""
-    current_time = datetime.now()
-    to_remove = []
-
-    for request_id, request_info in _processing_requests.items():
-        task = request_info.get("task")
-        timestamp = request_info.get("timestamp")
-
-        # 완료된 작업이거나 5분 이상 지난 요청 제거
-        if task and task.done():
-            to_remove.append(request_id)
-        elif timestamp and (current_time - timestamp).total_seconds() > CLEANUP_INTERVAL:
-            to_remove.append(request_id)
-
-    for request_id in to_remove:
-        if request_id in _processing_requests:
+def _drain_expired(now: float) -> None:
+    """만료 시각이 지난 요청/작업 정리 (힙 앞부분만 확인)"""
+    while _request_expiry and _request_expiry[0][0] <= now:
+        _, sequence, request_id = heapq.heappop(_request_expiry)
+        # 그 사이 같은 request_id로 다시 등록된 요청은 유지
+        record = _processing_requests.get(request_id)
+        if record is not None and record.sequence == sequence:
             del _processing_requests[request_id]
+            _release_lease(request_id, record.lease_owner)
             logger.debug(f"오래된 요청 정리: Request ID {request_id}")
 
+    while _job_expiry and _job_expiry[0][0] <= now:
+        _, _, job_id = heapq.heappop(_job_expiry)
+        if _jobs.pop(job_id, None) is not None:
+            logger.debug(f"완료된 작업 정리: Job ID {job_id}")
+
+
+def cleanup_old_requests():
+    """
+    완료된 오래된 요청 정리
+
+    완료된 요청은 완료 콜백에서 이미 제거되므로, 만료 시각이 지난 항목만 꺼냅니다.
+    (백그라운드 만료 처리 작업이 주기적으로 같은 정리를 수행합니다)
+    """
+    _drain_expired(time.monotonic())
+
+
+def _next_expiry() -> Optional[float]:
+    """가장 이른 만료 시각 (없으면 None)"""
+    deadlines = [heap[0][0] for heap in (_request_expiry, _job_expiry) if heap]
+    return min(deadlines) if deadlines else None
+
+
+def _push_expiry(heap: List[Tuple[float, int, str]], deadline: float, sequence: int, key: str):
+    """만료 힙에 추가하고, 힙 맨 앞이 바뀌면 만료 처리 작업을 깨움"""
+    entry = (deadline, sequence, key)
+    heapq.heappush(heap, entry)
+    if heap[0] is entry and _expiry_wakeup is not None:
+        _expiry_wakeup.set()
+
+
+async def _expiry_loop():
+    """가장 이른 만료 시각까지 대기 후 정리 반복 (더 이른 항목이 추가되면 다시 계산)"""
+    while True:
+        _expiry_wakeup.clear()
+        next_expiry = _next_expiry()
+        # 비어 있으면 한 주기를 기다린 뒤 다시 확인
+        delay = CLEANUP_INTERVAL if next_expiry is None else max(0.0, next_expiry - time.monotonic())
+        try:
+            await asyncio.wait_for(_expiry_wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        _drain_expired(time.monotonic())
+
+
+async def claim_request(request_id: str) -> Optional[str]:
+    """
+    요청 처리 권한(임대) 획득
+
+    이 프로세스에서 처리 중인 요청은 호출 전에 is_request_processing으로 확인합니다.
+    임대 저장소 오류 시에는 요청을 막지 않고 프로세스 내 중복 방지만 적용합니다.
+    받은 소유자 토큰은 register_request에 넘기고, 등록 전에 실패하면 release_claim으로 반납합니다.
+
+    Returns:
+        임대 소유자 토큰 (다른 요청(다른 워커/파드 포함)이 처리 중이면 None)
+    """
+    if request_id in _held_leases:
+        _lease_stats["rejected"] += 1
+        return None
+
+    # 저장소 응답을 기다리는 동안 같은 프로세스의 동일 요청이 들어와도 차단되도록 먼저 기록
+    owner = f"{_owner_prefix}:{uuid.uuid4().hex[:8]}"
+    _held_leases[request_id] = owner
+    try:
+        acquired = await _registry.acquire(request_id, owner, _lease_ttl)
+    except Exception as e:
+        _lease_stats["errors"] += 1
+        logger.warning(f"요청 임대 획득 실패 (프로세스 내 중복 방지만 적용): Request ID {request_id} - {e}")
+        return owner
+
+    if not acquired:
+        if _held_leases.get(request_id) == owner:
+            del _held_leases[request_id]
+        _lease_stats["rejected"] += 1
+        return None
+
+    _lease_stats["acquired"] += 1
+    return owner
+
+
+def release_claim(request_id: str, owner: Optional[str]):
+    """claim_request로 획득했지만 등록하지 못한 임대 반납 (소유자 토큰이 같을 때만)"""
+    _release_lease(request_id, owner)
+
+
+async def _release_remote_lease(request_id: str, owner: str):
+    try:
+        await _registry.release(request_id, owner)
+    except Exception as e:
+        _lease_stats["errors"] += 1
+        logger.warning(f"요청 임대 반납 실패 (TTL 후 만료됨): Request ID {request_id} - {e}")
+
+
+def _release_lease(request_id: str, owner: Optional[str]):
+    """보유한 임대 반납 (저장소 반납은 백그라운드로 진행)"""
+    if owner is None or _held_leases.get(request_id) != owner:
+        return
+    del _held_leases[request_id]
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # 이벤트 루프 밖에서는 저장소 반납 없이 TTL 만료에 맡김
+        return
+    task = loop.create_task(_release_remote_lease(request_id, owner))
+    _lease_release_tasks.add(task)
+    task.add_done_callback(_lease_release_tasks.discard)
+
+
+async def _heartbeat_loop():
+    """보유한 임대를 주기적으로 연장 (연장 실패한 임대는 잃은 것으로 처리)"""
+    while True:
+        await asyncio.sleep(_heartbeat_interval)
+        if not _held_leases:
+            continue
+        leases = dict(_held_leases)
+        try:
+            lost = await _registry.renew(leases, _lease_ttl)
+        except Exception as e:
+            _lease_stats["errors"] += 1
+            logger.warning(f"요청 임대 연장 실패: {e}")
+            continue
+        for request_id in lost:
+            if _held_leases.get(request_id) == leases[request_id]:
+                del _held_leases[request_id]
+                _lease_stats["lost"] += 1
+                logger.warning(f"요청 임대 만료 (다른 워커가 처리할 수 있음): Request ID {request_id}")
 
-def register_request(request_id: str, task, s3_key: Optional[str], story_id: str):
-    """요청 등록"""
-    _processing_requests[request_id] = {
-        "task": task,
-        "timestamp": datetime.now(),
-        "s3_key": s3_key,
-        "story_id": story_id
-    }
+
+def get_request_fingerprint(payload: str) -> str:
+    """요청 본문 해시 (같은 요청의 재시도인지 확인용)"""
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_replay_key(scope: str, request_id: str, idempotency_key: Optional[str] = None) -> Optional[str]:
+    """
+    완료 결과 조회 키 (요청 ID + Idempotency-Key)
+
+    Idempotency-Key가 없으면 None (재사용하지 않음) - 본문이 같아도 키 없이 다시 호출하면
+    재생성 요청으로 보고 새로 처리합니다.
+    """
+    if not idempotency_key:
+        return None
+    return f"{scope}:{request_id}:{idempotency_key}"
+
+
+def get_completed_result(replay_key: Optional[str]) -> Optional[Dict]:
+    """최근 완료된 요청 결과 조회 ({"fingerprint", "response"}, 없으면 None)"""
+    if _completed_results is None or replay_key is None:
+        return None
+    return _completed_results.get(replay_key)
+
+
+def remember_completed_result(replay_key: Optional[str], fingerprint: str, response: Dict):
+    """완료된 요청 결과 저장 (응답 JSON만 보관, 작업 객체는 보관하지 않음 / 조회 키가 없으면 저장하지 않음)"""
+    if _completed_results is not None and replay_key is not None:
+        _completed_results.set(replay_key, {"fingerprint": fingerprint, "response": response})
+
+
+async def start_request_tracker(
+    registry: Optional[RequestRegistry] = None,
+    lease_ttl: Optional[float] = None,
+    heartbeat_interval: Optional[float] = None,
+    result_ttl: Optional[float] = None,
+    result_max_entries: Optional[int] = None
+):
+    """
+    서버 시작 시 임대 저장소 설정 및 백그라운드 만료 처리/하트비트 시작
+
+    Args:
+        registry: 임대 저장소 (None이면 프로세스 내 저장소 유지)
+        lease_ttl: 임대 유지 시간 (초)
+        heartbeat_interval: 임대 연장 주기 (초)
+        result_ttl: 완료 결과 보관 시간 (초, 0이면 완료 결과 재사용 비활성화)
+        result_max_entries: 완료 결과 최대 보관 개수
+    """
+    global _expiry_task, _expiry_wakeup, _heartbeat_task, _registry, _lease_ttl, _heartbeat_interval, _completed_results
+    if result_ttl is not None:
+        _completed_results = TTLCache(
+            name="completed_request",
+            max_entries=result_max_entries or 1024,
+            ttl_seconds=result_ttl
+        ) if result_ttl > 0 else None
+    if registry is not None:
+        _registry = registry
+    if lease_ttl:
+        _lease_ttl = lease_ttl
+    if heartbeat_interval:
+        _heartbeat_interval = heartbeat_interval
+
+    if _expiry_task is None:
+        _expiry_wakeup = asyncio.Event()
+        _expiry_task = asyncio.create_task(_expiry_loop())
+    if _heartbeat_task is None:
+        _heartbeat_task = asyncio.create_task(_heartbeat_loop())
+    logger.info(
+        f"요청 추적 시작: 임대 저장소={_registry.backend}, TTL={_lease_ttl}s, 하트비트={_heartbeat_interval}s"
+    )
+
+
+async def stop_request_tracker():
+    """백그라운드 만료 처리/하트비트 종료 및 임대 저장소 정리"""
+    global _expiry_task, _heartbeat_task
+    tasks = [task for task in (_expiry_task, _heartbeat_task) if task is not None]
+    if not tasks:
+        return
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _expiry_task = None
+    _heartbeat_task = None
+
+    # 보유한 임대를 반납해야 다른 워커가 TTL을 기다리지 않고 처리 가능
+    for request_id, owner in list(_held_leases.items()):
+        _release_lease(request_id, owner)
+    await asyncio.gather(*_lease_release_tasks, return_exceptions=True)
+    await _registry.close()
+
+
+def register_request(
+    request_id: str,
+    task,
+    s3_key: Optional[str],
+    story_id: str,
+    job_id: Optional[str] = None,
+    lease_owner: Optional[str] = None,
+    kind: Optional[str] = None,
+    fingerprint: Optional[str] = None
+):
+    """
+    요청 등록 (작업이 끝나면 자동으로 등록 해제)
+
+    Args:
+        job_id: 비동기 모드 작업 ID
+        lease_owner: claim_request로 받은 임대 소유자 토큰 (작업이 끝나면 반납)
+        kind: 요청 종류 (엔드포인트, 없으면 합류 불가)
+        fingerprint: 요청 본문 해시 (get_request_fingerprint)
+    """
+    sequence = next(_expiry_sequence)
+    record = TrackedRequest(
+        task=task,
+        timestamp=datetime.now(),
+        s3_key=s3_key,
+        story_id=story_id,
+        sequence=sequence,
+        lease_owner=lease_owner,
+        job_id=job_id,
+        kind=kind,
+        fingerprint=fingerprint
+    )
+    _processing_requests[request_id] = record
+    _push_expiry(_request_expiry, time.monotonic() + CLEANUP_INTERVAL, sequence, request_id)
+
+    if task is not None:
+        def on_done(_):
+            # 그 사이 같은 request_id로 다시 등록된 요청은 유지
+            if _processing_requests.get(request_id) is record:
+                del _processing_requests[request_id]
+            _release_lease(request_id, record.lease_owner)
+
+        task.add_done_callback(on_done)
 
 
 def unregister_request(request_id: str):
-    """요청 등록 해제"""
-    if request_id in _processing_requests:
+    """요청 등록 해제 (제거한 기록이 보유한 임대만 반납)"""
+    record = _processing_requests.pop(request_id, None)
+    if record is not None:
+        _release_lease(request_id, record.lease_owner)
+
+
+def discard_finished_request(request_id: str):
+    """
+    완료된 요청 기록만 제거 (처리 중인 요청과 임대는 건드리지 않음)
+
+    같은 프로세스에서 임대를 획득하고 아직 등록 전(수락 대기 중)인 요청의 임대를
+    중복 요청이 반납하지 않도록, 임대 반납 없이 기록만 정리합니다.
+    """
+    record = _processing_requests.get(request_id)
+    if record is not None and not record.is_processing():
         del _processing_requests[request_id]
 
 
 def is_request_processing(request_id: str) -> bool:
     """요청이 처리 중인지 확인"""
-    if request_id not in _processing_requests:
-        return False
+    record = _processing_requests.get(request_id)
+    return record is not None and record.is_processing()
+
+
+def join_request(
+    request_id: str,
+    kind: str,
+    fingerprint: str,
+    require_job: bool = False
+) -> Optional[TrackedRequest]:
+    """
+    처리 중인 동일 요청에 합류 (single-flight)
+
+    같은 종류(kind)이고 요청 본문 해시(fingerprint)가 같은 요청에만 합류합니다.
+    (같은 s3_key를 쓰는 다른 엔드포인트나 다른 프롬프트의 요청에는 합류하지 않음)
+
+    Args:
+        kind: 요청 종류 (register_request에 넘긴 값)
+        fingerprint: 요청 본문 해시
+        require_job: True이면 비동기 모드 작업으로 처리 중인 요청에만 합류
+
+    Returns:
+        합류할 요청 기록 (없으면 None, 호출자는 record.task를 asyncio.shield로 기다림)
+    """
+    global _coalesced_count
+    record = _processing_requests.get(request_id)
+    if record is None or not record.is_processing():
+        return None
+    if record.kind != kind or record.fingerprint != fingerprint:
+        return None
+    if require_job and record.job_id is None:
+        return None
+    _coalesced_count += 1
+    return record
+
+
+def get_request_tracker_stats() -> dict:
+    """요청/작업 추적 상태 반환"""
+    return {
+        "tracked_requests": len(_processing_requests),
+        "tracked_jobs": len(_jobs),
+        "pending_expiries": len(_request_expiry) + len(_job_expiry),
+        "expiry_task_running": _expiry_task is not None,
+        "registry": _registry.stats(),
+        "held_leases": len(_held_leases),
+        "lease_ttl_seconds": _lease_ttl,
+        "coalesced_requests": _coalesced_count,
+        "completed_results": _completed_results.stats() if _completed_results is not None else None,
+        **{f"leases_{key}": value for key, value in _lease_stats.items()},
+    }
+
+
+def create_job(request_id: str, story_id: str, s3_key: Optional[str]) -> Dict:
+    """비동기 작업 생성 (queued 상태)"""
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "request_id": request_id,
+        "story_id": story_id,
+        "s3_key": s3_key,
+        "status": JOB_QUEUED,
+        "created_at": datetime.now(),
+        "started_at": None,
+        "finished_at": None,
+        "result": None,
+        "status_code": None,
+        "error": None,
+    }
+    _jobs[job["job_id"]] = job
+    return job
+
+
+def get_job(job_id: str) -> Optional[Dict]:
+    """작업 조회"""
+    return _jobs.get(job_id)
+
+
+def mark_job_running(job_id: str):
+    """작업 시작 기록"""
+    job = _jobs.get(job_id)
+    if job:
+        job["status"] = JOB_RUNNING
+        job["started_at"] = datetime.now()
 
-    request_info = _processing_requests[request_id]
-    task = request_info.get("task")
 
-    return task and not task.done()
+def mark_job_finished(
+    job_id: str,
+    result: Optional[Any] = None,
+    status_code: Optional[int] = None,
+    error: Optional[Any] = None
+):
+    """작업 완료 기록 (error가 있으면 실패)"""
+    job = _jobs.get(job_id)
+    if job:
+        job["status"] = JOB_FAILED if error is not None else JOB_SUCCEEDED
+        job["finished_at"] = datetime.now()
+        job["result"] = result
+        job["status_code"] = status_code
+        job["error"] = error
+        _push_expiry(_job_expiry, time.monotonic() + JOB_RETENTION_SECONDS, next(_expiry_sequence), job_id)
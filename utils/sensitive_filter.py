@@ -4,6 +4,9 @@
 """
 
 import re
+from datetime import datetime
+from typing import Dict, Iterable
+
 from logger import setup_logger
 
 logger = setup_logger()
@@ -127,12 +130,90 @@ SENSITIVE_WORD_REPLACEMENTS = {
 }
 
 
+def _normalize_word(word: str) -> str:
+    """대소문자 구분 없는 비교용 정규화 (lower()와 달리 유니코드 대소문자 규칙을 따름, 예: "İ", "ß")"""
+    return word.casefold()
+
+
+def _trie_to_regex(node: Dict[str, Dict]) -> str:
+    """트라이 노드를 정규식으로 변환 (끝 표시 ""가 있으면 뒤 글자들은 선택 사항)"""
+    branches = [re.escape(char) + _trie_to_regex(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # 탐욕적 선택: 더 긴 단어를 먼저 시도하고 실패하면 여기서 끝난 단어로 매칭
+        return body + "?" if len(branches) == 1 and len(branches[0]) == 1 else "(?:" + body + ")?"
+    return body
+
+
+def _compile_sensitive_word_pattern(words: Iterable[str]) -> "re.Pattern":
+    """
+    민감 단어 전체를 트라이 형태의 정규식 하나로 컴파일
+
+    각 위치에서 첫 글자가 맞는 가지만 검사하므로 단어 수가 늘어도 비용이 거의 늘지 않고,
+    같은 위치에서는 가장 긴 단어가 선택됩니다 (예: "bloody"가 "blood" + "y"로 치환되지 않음).
+    영어는 대소문자를 무시합니다.
+    """
+    trie: Dict[str, Dict] = {}
+    for word in words:
+        node = trie
+        for char in _normalize_word(word):
+            node = node.setdefault(char, {})
+        node[""] = {}
+    # 단어가 없으면 아무것도 매칭하지 않는 패턴
+    return re.compile(_trie_to_regex(trie) or "(?!)", re.IGNORECASE)
+
+
+class SensitiveWordMatcher:
+    """
+    컴파일된 민감 단어 치환기 (생성 후 변경하지 않음)
+
+    사전이 바뀌면 새 인스턴스를 만들어 통째로 교체하므로 요청 처리 중에는 잠금이 필요 없습니다.
+    """
+
+    def __init__(self, replacements: Dict[str, str], source: str = "builtin"):
+        self.pattern = _compile_sensitive_word_pattern(replacements)
+        # 정규화된 단어 -> 대체어 (정규화 후 겹치는 단어는 처음 것을 사용)
+        self.lookup: Dict[str, str] = {}
+        for word, safe_word in replacements.items():
+            key = _normalize_word(word)
+            if key in self.lookup and self.lookup[key] != safe_word:
+                logger.warning(
+                    f"대소문자만 다른 민감 단어가 중복되어 건너뜁니다: {word!r} (사용: {key!r} -> {self.lookup[key]!r})"
+                )
+                continue
+            self.lookup.setdefault(key, safe_word)
+        self.source = source
+        self.loaded_at = datetime.now().isoformat()
+
+    def __len__(self) -> int:
+        return len(self.lookup)
+
+
+# 현재 사용 중인 치환기 (모듈 로드 시 내장 사전으로 한 번 컴파일, 이후 교체만 함)
+_matcher = SensitiveWordMatcher(SENSITIVE_WORD_REPLACEMENTS)
+
+
+def set_sensitive_word_matcher(matcher: SensitiveWordMatcher) -> None:
+    """치환기 교체 (참조 대입 한 번으로 원자적으로 교체)"""
+    global _matcher
+    _matcher = matcher
+    logger.info(f"민감 단어 사전 교체: {len(matcher)}개 단어 (source={matcher.source})")
+
+
+def get_sensitive_word_matcher() -> SensitiveWordMatcher:
+    """현재 치환기 반환"""
+    return _matcher
+
+
 def pre_filter_sensitive_words(text: str) -> str:
     """
     민감한 단어를 안전한 대체어로 사전 치환
 
     Gemini 호출 전에 알려진 민감한 단어들을 먼저 변환하여
     정책 위반 가능성을 사전에 제거합니다.
+    미리 컴파일된 정규식으로 텍스트를 한 번만 훑으며 치환합니다.
 
     Args:
         text: 원본 텍스트
@@ -140,28 +221,25 @@ def pre_filter_sensitive_words(text: str) -> str:
     Returns:
         민감한 단어가 치환된 텍스트
     """
-    result = text
-    replacements_made = []
-
-    # 대소문자 구분 없이 치환 (영어의 경우)
-    for sensitive_word, safe_word in SENSITIVE_WORD_REPLACEMENTS.items():
-        # 한국어는 그대로, 영어는 대소문자 무시하여 검색
-        if any(ord(c) > 127 for c in sensitive_word):
-            # 한국어 단어
-            if sensitive_word in result:
-                result = result.replace(sensitive_word, safe_word)
-                replacements_made.append(f"'{sensitive_word}' -> '{safe_word}'")
-        else:
-            # 영어 단어 - 단어 경계를 고려하여 치환
-            pattern = re.compile(re.escape(sensitive_word), re.IGNORECASE)
-            if pattern.search(result):
-                result = pattern.sub(safe_word, result)
-                replacements_made.append(f"'{sensitive_word}' -> '{safe_word}'")
+    # 처리 도중 사전이 교체되어도 같은 치환기를 사용하도록 한 번만 읽음
+    matcher = _matcher
+    replacements_made: Dict[str, str] = {}
+
+    def replace(match: "re.Match") -> str:
+        word = _normalize_word(match.group(0))
+        safe_word = matcher.lookup.get(word)
+        if safe_word is None:
+            # 정규식의 대소문자 무시 규칙과 정규화 결과가 다른 드문 경우: 원문 유지
+            return match.group(0)
+        replacements_made.setdefault(word, safe_word)
+        return safe_word
+
+    result = matcher.pattern.sub(replace, text)
 
     if replacements_made:
         logger.info(f"사전 필터링 적용: {len(replacements_made)}개 단어 치환")
-        for replacement in replacements_made[:5]:  # 최대 5개만 로그
-            logger.debug(f"   {replacement}")
+        for sensitive_word, safe_word in list(replacements_made.items())[:5]:  # 최대 5개만 로그
+            logger.debug(f"   '{sensitive_word}' -> '{safe_word}'")
         if len(replacements_made) > 5:
             logger.debug(f"   ... 외 {len(replacements_made) - 5}개")
 
@@ -0,0 +1,101 @@
+"""
+텍스트 디코딩 모듈
+청크 단위로 받은 바이트를 한 번만 디코딩 (UTF-8 실패 시 cp949로 전환)
+"""
+
+import codecs
+from typing import List, Optional
+
+from logger import setup_logger
+
+logger = setup_logger()
+
+# 기본 인코딩과 UTF-8 디코딩 실패 시 대체 인코딩 (한국어 텍스트)
+DEFAULT_TEXT_ENCODING = "utf-8"
+FALLBACK_TEXT_ENCODING = "cp949"
+
+
+def get_charset(content_type: Optional[str]) -> Optional[str]:
+    """Content-Type 헤더에서 charset 추출"""
+    if not content_type or "charset=" not in content_type:
+        return None
+    return content_type.split("charset=")[1].split(";")[0].strip().strip('"') or None
+
+
+class IncrementalTextDecoder:
+    """
+    청크 단위 텍스트 디코더
+
+    멀티바이트 문자가 청크 경계에서 잘려도 다음 청크와 이어서 디코딩합니다.
+    - charset이 지정된 경우: 해당 인코딩으로 디코딩, 실패 시 UTF-8(오류 무시)로 전환
+    - charset이 없는 경우: UTF-8로 디코딩, 실패 시 cp949(오류 무시)로 전환
+    전환 시에는 지금까지 받은 바이트만 다시 디코딩합니다.
+    """
+
+    def __init__(self, encoding: Optional[str] = None):
+        self._explicit = encoding is not None
+        self._raw: Optional[bytearray] = bytearray()
+        self._parts: List[str] = []
+        self.chars = 0
+        self.bytes_read = 0
+        try:
+            self.encoding = codecs.lookup(encoding or DEFAULT_TEXT_ENCODING).name
+            self._decoder = codecs.getincrementaldecoder(self.encoding)(errors="strict")
+        except LookupError:
+            logger.warning(f"알 수 없는 charset입니다: {encoding}, UTF-8로 디코딩합니다.")
+            self._switch_to_fallback(DEFAULT_TEXT_ENCODING)
+
+    def _append(self, text: str) -> None:
+        if text:
+            self._parts.append(text)
+            self.chars += len(text)
+
+    def _switch_to_fallback(self, encoding: str) -> None:
+        """대체 인코딩(오류 무시)으로 전환하고 지금까지 받은 바이트를 다시 디코딩"""
+        self.encoding = encoding
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
+        self._parts = []
+        self.chars = 0
+        raw, self._raw = self._raw, None
+        if raw:
+            self._append(self._decoder.decode(bytes(raw)))
+
+    def _fallback_encoding(self) -> str:
+        return DEFAULT_TEXT_ENCODING if self._explicit else FALLBACK_TEXT_ENCODING
+
+    def feed(self, chunk: bytes) -> None:
+        """청크 추가"""
+        self.bytes_read += len(chunk)
+        if self._raw is None:
+            # 이미 대체 인코딩으로 전환됨 (오류 무시 모드)
+            self._append(self._decoder.decode(chunk))
+            return
+
+        self._raw += chunk
+        try:
+            self._append(self._decoder.decode(chunk))
+        except UnicodeDecodeError:
+            logger.debug(f"{self.encoding} 디코딩 실패, {self._fallback_encoding()}로 전환합니다.")
+            self._switch_to_fallback(self._fallback_encoding())
+
+    def finish(self, complete: bool = True) -> str:
+        """
+        디코딩 결과 반환
+
+        Args:
+            complete: 원본 끝까지 받은 경우 True (False이면 끝에서 잘린 멀티바이트 문자를 버림)
+        """
+        if complete:
+            try:
+                self._append(self._decoder.decode(b"", final=True))
+            except UnicodeDecodeError:
+                self._switch_to_fallback(self._fallback_encoding())
+                self._append(self._decoder.decode(b"", final=True))
+        return "".join(self._parts)
+
+
+def decode_text(content: bytes, encoding: Optional[str] = None) -> str:
+    """바이트 전체를 디코딩 (IncrementalTextDecoder와 같은 대체 규칙)"""
+    decoder = IncrementalTextDecoder(encoding)
+    decoder.feed(content)
+    return decoder.finish()
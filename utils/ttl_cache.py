@@ -0,0 +1,250 @@
+"""
+TTL 캐시 모듈
+용량 제한(LRU 제거)과 만료 시간을 가진 메모리 캐시 + 선택적 디스크 계층
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from logger import setup_logger
+
+logger = setup_logger()
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    LRU 제거와 TTL 만료를 지원하는 캐시
+
+    - 메모리 계층: 최대 max_entries개, 가장 오래 사용되지 않은 항목부터 제거
+    - 디스크 계층 (disk_dir 지정 시): JSON 파일로 저장하여 재시작 후에도 유지
+      (값은 JSON 직렬화 가능해야 함, 최대 disk_max_entries개)
+      쓰기 후 DISK_PRUNE_INTERVAL마다 만료된 파일과 초과분(먼저 저장된 파일부터)을 정리
+      이벤트 루프에서는 aget/aset/adelete를 사용해 파일 I/O를 워커 스레드에서 실행
+    - 히트/미스 카운터 제공
+    """
+
+    # 디스크 계층 정리 주기 (초)
+    DISK_PRUNE_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl_seconds: Optional[float] = None,
+        disk_dir: Optional[Path] = None,
+        disk_max_entries: Optional[int] = None
+    ):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_entries = max(1, disk_max_entries) if disk_max_entries else self.max_entries * 4
+        if self.disk_dir:
+            self.disk_dir.mkdir(exist_ok=True, parents=True)
+        # 0이면 첫 쓰기 때 이전 실행이 남긴 파일부터 정리
+        self._last_prune_at = 0.0
+        self._prune_lock = threading.Lock()
+
+        # 구조: {key: (만료 시각(time.time) 또는 None, 값)}
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_pruned = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expires_at(self, ttl_seconds: Optional[float]) -> Optional[float]:
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        return time.time() + ttl if ttl else None
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def _store(self, key: str, expires_at: Optional[float], value: Any) -> None:
+        """메모리 계층에 저장하고 용량 초과 시 LRU 항목 제거 (잠금 보유 상태에서 호출)"""
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _read_disk(self, key: str) -> Any:
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return _MISSING
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"[{self.name}] 디스크 캐시 읽기 실패: {e}")
+            return _MISSING
+
+        expires_at = record.get("expires_at")
+        if record.get("key") != key or (expires_at and expires_at <= time.time()):
+            path.unlink(missing_ok=True)
+            return _MISSING
+
+        with self._lock:
+            self._store(key, expires_at, record.get("value"))
+        return record.get("value")
+
+    def _write_disk(self, key: str, expires_at: Optional[float], value: Any) -> None:
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"key": key, "expires_at": expires_at, "value": value}, f, ensure_ascii=False)
+            tmp_path.replace(path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"[{self.name}] 디스크 캐시 쓰기 실패: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        if time.monotonic() - self._last_prune_at >= self.DISK_PRUNE_INTERVAL:
+            self.prune_disk()
+
+    def prune_disk(self) -> int:
+        """
+        디스크 계층 정리 (만료된 파일 삭제 후, disk_max_entries 초과분은 먼저 저장된 파일부터 삭제)
+
+        Returns:
+            삭제한 파일 수
+        """
+        if not self.disk_dir or not self._prune_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._last_prune_at = time.monotonic()
+            now = time.time()
+            removed = 0
+            alive = []
+            for path in self.disk_dir.glob("*.json"):
+                try:
+                    mtime = path.stat().st_mtime
+                    with open(path, 'r', encoding='utf-8') as f:
+                        expires_at = json.load(f).get("expires_at")
+                except FileNotFoundError:
+                    continue
+                except (OSError, json.JSONDecodeError, AttributeError):
+                    expires_at = now
+                if expires_at and expires_at <= now:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+                else:
+                    alive.append((mtime, path))
+
+            if len(alive) > self.disk_max_entries:
+                alive.sort()
+                for _, path in alive[:len(alive) - self.disk_max_entries]:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+
+            if removed:
+                self.disk_pruned += removed
+                logger.info(f"[{self.name}] 디스크 캐시 정리: {removed}개 파일 삭제")
+            return removed
+        finally:
+            self._prune_lock.release()
+
+    def _get_memory(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+        return _MISSING
+
+    def _finish_get(self, value: Any, default: Any) -> Any:
+        """디스크 조회 결과 집계"""
+        if value is not _MISSING:
+            self.disk_hits += 1
+            return value
+        self.misses += 1
+        return default
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """캐시 조회 (메모리 -> 디스크 순서)"""
+        value = self._get_memory(key)
+        if value is not _MISSING:
+            return value
+        return self._finish_get(self._read_disk(key) if self.disk_dir else _MISSING, default)
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """캐시 조회 (디스크 조회는 워커 스레드에서 실행)"""
+        value = self._get_memory(key)
+        if value is not _MISSING:
+            return value
+        if self.disk_dir:
+            value = await asyncio.to_thread(self._read_disk, key)
+        return self._finish_get(value, default)
+
+    def _set_memory(self, key: str, value: Any, ttl_seconds: Optional[float]) -> Optional[float]:
+        expires_at = self._expires_at(ttl_seconds)
+        with self._lock:
+            self._store(key, expires_at, value)
+        return expires_at
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """캐시 저장 (디스크 계층이 있으면 함께 저장)"""
+        expires_at = self._set_memory(key, value, ttl_seconds)
+        if self.disk_dir:
+            self._write_disk(key, expires_at, value)
+
+    async def aset(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """캐시 저장 (디스크 쓰기와 정리는 워커 스레드에서 실행)"""
+        expires_at = self._set_memory(key, value, ttl_seconds)
+        if self.disk_dir:
+            await asyncio.to_thread(self._write_disk, key, expires_at, value)
+
+    def delete(self, key: str) -> None:
+        """캐시 항목 삭제"""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.disk_dir:
+            self._disk_path(key).unlink(missing_ok=True)
+
+    async def adelete(self, key: str) -> None:
+        """캐시 항목 삭제 (디스크 파일 삭제는 워커 스레드에서 실행)"""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.disk_dir:
+            await asyncio.to_thread(self._disk_path(key).unlink, missing_ok=True)
+
+    def clear(self) -> None:
+        """메모리 계층 전체 삭제 (디스크 계층은 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """히트/미스 통계 반환"""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "disk_enabled": self.disk_dir is not None,
+            "disk_max_entries": self.disk_max_entries if self.disk_dir else None,
+            "disk_pruned": self.disk_pruned,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }